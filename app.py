@@ -4,10 +4,12 @@ Edition: Final (Integrated ScaleDown, Gemini 2.5, and Interview Mode)
 """
 
 import streamlit as st
-import pdfplumber
-from google import genai
 import sys
 import os
+import time
+
+# pdfplumber and google-genai are imported on first use (google-genai through the
+# resource registry): they are only needed once the user asks a question.
 
 # ============================================================================
 # LOCAL IMPORT SETUP
@@ -15,14 +17,43 @@ import os
 
 sys.path.append(os.getcwd())
 
-try:
-    from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
-except ImportError:
-    try:
-        from scaledown.compressor import ScaleDownCompressor
-    except ImportError as e:
-        st.error(f"Import Error: Could not find 'ScaleDownCompressor'. Details: {e}")
-        st.stop()
+from assistant.resources import (
+    get_registry, GEMINI, SCALEDOWN, CONTEXT_CACHE, JD_CLEANER, SKILL_MATCHER,
+    ANSWER_CACHE, JD_INDEX, METRICS_SERVER
+)
+from assistant.common import JD_INSTRUCTION, RESUME_INSTRUCTION
+from assistant.prompts import PreparedTurn, build_prefix, build_turn, is_interview_mode
+from assistant.memory import ConversationMemory
+from assistant.budget import BudgetPlanner
+from assistant.pdf_extract import extract as extract_pdf
+from assistant.resume_sections import ResumeIndex
+from assistant.skills import is_gap_question
+from scaledown.graph import GraphPipeline, GraphStep
+from scaledown.exceptions import PipelineError
+from scaledown.monitoring import track, record_error
+from assistant.streaming import TurnStats, stream_text
+from assistant.ingestion import IngestedContext, fingerprint, get_ingestion_manager
+from scaledown.types.metrics import count_tokens
+
+# ============================================================================
+# PROMPT BUDGET
+# ============================================================================
+
+# Tokens for resume + JD together; conversation history has its own budget
+CONTEXT_TOKEN_BUDGET = 4000
+HISTORY_TOKEN_BUDGET = 1200
+CONTEXT_PRIORITIES = {"resume": 0.6, "jd": 0.4}
+# Stop reading the resume PDF once either limit is reached
+RESUME_MAX_PAGES = 10
+RESUME_MAX_TOKENS = 3 * CONTEXT_TOKEN_BUDGET
+# Cap for the resume sections sent with a specific question instead of the full resume
+RESUME_FOCUS_BUDGET = 600
+# How often the sidebar re-checks background ingestion while it is running
+INGEST_POLL_SECONDS = 0.5
+# Local posting index built with `python -m assistant.jd_index add ...`
+JD_INDEX_PATH = os.environ.get("JD_INDEX_PATH", "jd_index.sqlite")
+# Serve /metrics (Prometheus) and /metrics.json on this port when set
+METRICS_PORT = os.environ.get("METRICS_PORT")
 
 # ============================================================================
 # SESSION STATE
@@ -33,6 +64,10 @@ def init_session_state():
         st.session_state.messages = []
     if "resume_uploaded" not in st.session_state:
         st.session_state.resume_uploaded = False
+    if "ingest_key" not in st.session_state:
+        st.session_state.ingest_key = None
+    if "memory" not in st.session_state:
+        st.session_state.memory = ConversationMemory(token_budget=HISTORY_TOKEN_BUDGET, recent_messages=4)
 
 # ============================================================================
 # SIDEBAR
@@ -55,138 +90,400 @@ def render_sidebar():
             help="Upload your resume in PDF format"
         )
 
+        if resume_file and get_jd_index() is not None:
+            render_posting_matches(resume_file)
+
         job_description = st.text_area(
             "Job Description",
             placeholder="Paste the job description text here...",
-            height=200
+            height=200,
+            key="jd_text"
         )
 
         if resume_file and job_description.strip():
-            st.success("System Ready")
             st.session_state.resume_uploaded = True
+            # Start parsing/compression now so it overlaps with the user typing
+            future = start_ingestion(resume_file, job_description)
+            if future.done():
+                render_readiness(future)
+            else:
+                poll_readiness(future)
+            cache = get_answer_cache()
+            if cache.exact_hits + cache.similar_hits + cache.misses:
+                st.caption(f"Answer cache: {cache.hit_rate:.0%} hit rate "
+                           f"({cache.exact_hits} exact, {cache.similar_hits} similar, {cache.misses} misses)")
         else:
             st.session_state.resume_uploaded = False
+            release_context(st.session_state.ingest_key)
+            st.session_state.ingest_key = None
 
     return resume_file, job_description, mode
 
+def render_readiness(future):
+    if future.result().error:
+        st.warning(future.result().error)
+    else:
+        st.success("System Ready")
+
+@st.fragment(run_every=INGEST_POLL_SECONDS)
+def poll_readiness(future):
+    """Re-runs on its own every poll interval while ingestion is pending."""
+    if future.done():
+        # Full rerun: the sidebar then shows the final status and polling stops
+        st.rerun()
+    st.info("Preparing resume and job description...")
+
+def render_posting_matches(resume_file):
+    """Suggest indexed postings for the uploaded resume; picking one fills the JD box."""
+    with st.expander("Matching postings"):
+        if st.button("Find postings for this resume"):
+            resume_text = extract_text_from_pdf(resume_file)
+            st.session_state.posting_matches = get_jd_index().query(resume_text, k=5) if resume_text else []
+        for match in st.session_state.get("posting_matches", []):
+            st.button(f"{match.title or match.id} ({match.score:.1f})", key=f"posting-{match.id}",
+                      on_click=use_posting, args=(match.text,))
+
+def use_posting(text):
+    st.session_state.jd_text = text
+
 # ============================================================================
 # LOGIC: PDF & COMPRESSION
 # ============================================================================
 
+def read_pdf(source):
+    """
+    Page-level extraction report for a PDF (bytes or path), stopping at the
+    page/token limits. Raises on unreadable PDFs; safe off the main thread.
+    """
+    return extract_pdf(
+        source,
+        max_pages=RESUME_MAX_PAGES,
+        max_tokens=RESUME_MAX_TOKENS,
+        token_counter=lambda text: _count_tokens(text) or 0
+    )
+
+def read_pdf_text(file):
+    source = file if isinstance(file, (bytes, str)) else file.getvalue()
+    return read_pdf(source).text
+
 def extract_text_from_pdf(file):
     try:
-        with pdfplumber.open(file) as pdf:
-            text = "\n".join([p.extract_text() or "" for p in pdf.pages])
-            return text
+        return read_pdf_text(file)
     except Exception as e:
         st.error(f"PDF Error: {e}")
         return None
 
-def compress_jd(jd_text):
+def compress_text(text, instruction, api_key=None, max_tokens=None):
+    """Compress one prompt component to about `max_tokens`. Returns (text, status)."""
     try:
-        api_key = st.secrets.get("SCALEDOWN_API_KEY")
+        if api_key is None:
+            api_key = st.secrets.get("SCALEDOWN_API_KEY")
         if not api_key:
-            return jd_text, "Skipped (Missing SCALEDOWN_API_KEY)"
+            return text, "Skipped (Missing SCALEDOWN_API_KEY)"
 
-        compressor = ScaleDownCompressor(api_key=api_key)
+        # Shared across reruns and sessions so the HTTP connection pool is reused
+        compressor = get_registry().get(SCALEDOWN, api_key)
         
         result = compressor.compress(
-            context=jd_text,  
-            prompt="Extract key requirements, skills, and responsibilities.",
+            context=text,  
+            prompt=instruction,
             target_model="gemini-2.5-flash",
-            ratio=0.5
+            max_tokens=max_tokens
         )
         
         if hasattr(result, "content"):
-            return result.content, f"ScaleDown: {getattr(result, 'savings_percent', '50')}% saved"
+            return result.content, f"{getattr(result, 'savings_percent', 0):.0f}% saved"
         elif isinstance(result, str):
-            return result, "ScaleDown: Compression Active"
+            return result, "Compression Active"
         else:
-            return str(result), "ScaleDown: Active"
+            return str(result), "Active"
 
     except TypeError as e:
         print(f"ScaleDown Arguments Error: {e}")
-        return jd_text, f"Compression Error: Arguments mismatch"
+        record_error("compression", e)
+        return text, f"Compression Error: Arguments mismatch"
     except Exception as e:
         print(f"Compression Warning: {e}")
-        return jd_text, "ScaleDown Skipped (Check Logs)"
+        record_error("compression", e)
+        return text, "Skipped (Check Logs)"
+
+def compress_jd(jd_text, api_key=None, max_tokens=None):
+    content, status = compress_text(jd_text, JD_INSTRUCTION, api_key=api_key, max_tokens=max_tokens)
+    return content, f"ScaleDown: {status}"
+
+# ============================================================================
+# BACKGROUND INGESTION
+# ============================================================================
+
+def _count_tokens(text):
+    try:
+        return count_tokens(text, model="gemini-2.5-flash")
+    except Exception as e:
+        print(f"Token Count Warning: {e}")
+        record_error("token_count", e)
+        return None
+
+def fit_context(resume_text, jd_text, scaledown_key):
+    """
+    Fit resume and JD into CONTEXT_TOKEN_BUDGET, compressing only what is over
+    its share. Returns (resume_text, jd_text, status).
+    """
+    planner = BudgetPlanner(CONTEXT_TOKEN_BUDGET, CONTEXT_PRIORITIES, model="gemini-2.5-flash")
+    instructions = {"resume": RESUME_INSTRUCTION, "jd": JD_INSTRUCTION}
+    labels = {"resume": "resume", "jd": "JD"}
+    statuses = []
+
+    def compress(name, text, budget):
+        content, status = compress_text(text, instructions[name], api_key=scaledown_key, max_tokens=budget)
+        statuses.append(f"{labels[name]} {status}")
+        return content
+
+    try:
+        # Resume and JD compressions are independent requests
+        fitted, plan = planner.fit({"resume": resume_text, "jd": jd_text}, compress, max_workers=2)
+    except Exception as e:
+        # Token counting unavailable: fall back to always compressing the JD
+        print(f"Budget Planner Warning: {e}")
+        record_error("budget_planner", e)
+        compressed_jd, status_msg = compress_jd(jd_text, api_key=scaledown_key)
+        return resume_text, compressed_jd, status_msg
+
+    if plan.fits:
+        return resume_text, jd_text, f"ScaleDown: not needed ({plan.total_tokens} tokens within budget)"
+    return fitted["resume"], fitted["jd"], "ScaleDown: " + ", ".join(statuses)
+
+def get_jd_cleaner():
+    """Local boilerplate/near-duplicate remover, built once per process."""
+    return get_registry().get(JD_CLEANER)
+
+def clean_jd(jd_text, cleaner):
+    """Strip EEO/benefits boilerplate and repeated bullets before any API call."""
+    try:
+        cleaned = cleaner.optimize(jd_text).content
+        return cleaned or jd_text
+    except Exception as e:
+        print(f"Boilerplate Removal Warning: {e}")
+        record_error("boilerplate", e)
+        return jd_text
+
+def start_metrics_server():
+    """Process-wide metrics endpoint, started once per process."""
+    return get_registry().get(METRICS_SERVER, METRICS_PORT) if METRICS_PORT else None
+
+def get_jd_index():
+    """Posting index, or None while no index has been built."""
+    try:
+        return get_registry().get(JD_INDEX, JD_INDEX_PATH)
+    except FileNotFoundError:
+        return None
+
+def get_answer_cache():
+    """Answers shared by every session asking about the same resume/JD pair."""
+    return get_registry().get(ANSWER_CACHE)
+
+def answer_scope(turn, mode):
+    """Cache scope for a turn, or None where answers must vary (mock interviews)."""
+    if is_interview_mode(mode) or not turn.source_key:
+        return None
+    return (turn.source_key, mode)
+
+def get_skill_matcher():
+    """Aho-Corasick skill matcher over the built-in taxonomy, built once per process."""
+    return get_registry().get(SKILL_MATCHER)
+
+def ingest(resume_bytes, jd_text, scaledown_key, jd_cleaner=None, skill_matcher=None):
+    """
+    Worker-side ingestion: no Streamlit calls, everything is passed in.
+
+    Resume extraction and JD cleaning run as independent branches; budget
+    fitting, section indexing and skill matching then run concurrently.
+    """
+    start = time.perf_counter()
+    counter = lambda text: _count_tokens(text) or 0
+    steps = [
+        GraphStep("resume", read_pdf, inputs=["resume_bytes"]),
+        GraphStep("jd", lambda text: clean_jd(text, jd_cleaner) if jd_cleaner is not None else text,
+                  inputs=["jd_text"]),
+        GraphStep("fitted", lambda report, jd: fit_context(report.text, jd, scaledown_key),
+                  inputs=["resume", "jd"]),
+        GraphStep("index", lambda report: ResumeIndex(report.text, token_counter=counter),
+                  inputs=["resume"]),
+        GraphStep("skills", lambda report, jd: skill_matcher.compare(report.text, jd) if skill_matcher else None,
+                  inputs=["resume", "jd"]),
+        GraphStep("context", lambda report, fitted, index, skills: IngestedContext(
+            resume_text=fitted[0],
+            compressed_jd=fitted[1],
+            status=fitted[2],
+            resume_tokens=_count_tokens(fitted[0]),
+            jd_tokens=_count_tokens(fitted[1]),
+            page_timings_ms=[round(p.elapsed_ms, 1) for p in report.pages],
+            resume_index=index,
+            skill_gaps=skills
+        ), inputs=["resume", "fitted", "index", "skills"]),
+    ]
+    try:
+        result = GraphPipeline(steps, token_counter=counter).run(
+            {"resume_bytes": resume_bytes, "jd_text": jd_text}
+        )
+    except PipelineError as e:
+        label = "PDF Error" if getattr(e, "step", None) == "resume" else "Ingestion Error"
+        return IngestedContext(None, jd_text, "", error=f"{label}: {e.__cause__ or e}")
+    context = result.final_content
+    context.elapsed_ms = (time.perf_counter() - start) * 1000
+    context.critical_path = result.critical_path
+    return context
+
+def start_ingestion(resume, jd):
+    """Submit (or find the already running) ingestion job for this resume and JD."""
+    resume_bytes = resume.getvalue() if hasattr(resume, "getvalue") else resume.read()
+    key = fingerprint(resume_bytes, jd)
+    if st.session_state.ingest_key not in (None, key):
+        release_context(st.session_state.ingest_key)
+    st.session_state.ingest_key = key
+    scaledown_key = st.secrets.get("SCALEDOWN_API_KEY") or ""
+    return get_ingestion_manager().submit(key, ingest, resume_bytes, jd, scaledown_key,
+                                          jd_cleaner=get_jd_cleaner(),
+                                          skill_matcher=get_skill_matcher())
 
 # ============================================================================
 # MAIN AI PIPELINE
 # ============================================================================
 
-def get_ai_response(user_input, resume, jd, mode):
+def prepare_turn(user_input, resume, jd, mode):
+    """Returns a PreparedTurn, or an error message string."""
+    # Usually already finished in the background; otherwise wait for it here
+    ingested = start_ingestion(resume, jd).result()
+    if ingested.error:
+        return f"Error: {ingested.error}"
+    if not ingested.resume_text:
+        return "Error: Could not read resume PDF."
+
+    # Gap questions are plain set arithmetic: answer them without the LLM
+    if ingested.skill_gaps is not None and not is_interview_mode(mode) and is_gap_question(user_input):
+        return PreparedTurn(None, "", "", "Local skill matcher (no LLM call)", st.session_state.ingest_key,
+                            local_answer=ingested.skill_gaps.to_markdown())
+
+    if not is_interview_mode(mode):
+        cached = get_answer_cache().get((st.session_state.ingest_key, mode), user_input)
+        if cached is not None:
+            return PreparedTurn(None, "", "", "Answer cache hit (no LLM call)", st.session_state.ingest_key,
+                                local_answer=cached)
+
     gemini_key = st.secrets.get("GEMINI_API_KEY")
     if not gemini_key:
         return "Error: GEMINI_API_KEY is missing in .streamlit/secrets.toml"
 
-    resume_text = extract_text_from_pdf(resume)
-    if not resume_text:
-        return "Error: Could not read resume PDF."
+    # Earlier turns (the last message is the one being answered), kept under budget
+    try:
+        history = st.session_state.memory.render(st.session_state.messages[:-1])
+    except Exception as e:
+        print(f"Conversation Memory Warning: {e}")
+        record_error("memory", e)
+        history = ""
+
+    # Specific questions get only their relevant resume sections, in the turn; the
+    # prefix then leaves the resume out, so it is shared by all specific questions
+    resume_text, focus = ingested.resume_text, ""
+    if ingested.resume_index is not None:
+        selected = ingested.resume_index.select(user_input, mode, max_tokens=RESUME_FOCUS_BUDGET)
+        if selected != ingested.resume_index.text:
+            resume_text, focus = "", selected
+
+    return PreparedTurn(
+        gemini_key=gemini_key,
+        prefix=build_prefix(mode, ingested.compressed_jd, resume_text,
+                            skill_facts=ingested.skill_gaps.to_facts() if ingested.skill_gaps else ""),
+        turn=build_turn(mode, user_input, history=history, focus=focus),
+        status=ingested.status,
+        source_key=st.session_state.ingest_key
+    )
+
+def resolve_backends(gemini_key, client=None, context_cache=None):
+    """Shared client and context cache, unless a caller (e.g. a test) injects its own."""
+    if client is None:
+        client = get_registry().get(GEMINI, gemini_key)
+        context_cache = context_cache or get_registry().get(CONTEXT_CACHE, gemini_key)
+    return client, context_cache
+
+def release_context(source_key):
+    """Drop cached prompt prefixes once the resume or JD they were built from changes."""
+    gemini_key = st.secrets.get("GEMINI_API_KEY")
+    if source_key and gemini_key:
+        get_registry().get(CONTEXT_CACHE, gemini_key).invalidate(source_key)
 
-    compressed_jd, status_msg = compress_jd(jd)
+def get_ai_response(user_input, resume, jd, mode, client=None, context_cache=None):
+    turn = prepare_turn(user_input, resume, jd, mode)
+    if isinstance(turn, str):
+        return turn
+    if turn.local_answer:
+        return f"> *{turn.status}*\n\n" + turn.local_answer
 
     try:
-        client = genai.Client(api_key=gemini_key)
-        
-        # Branching Logic based on Selected Mode
-        if "Hiring Manager" in mode:
-            prompt = f"""
-            ROLE: You are a strict Hiring Manager at the company described in the JD.
-            CONTEXT:
-            JOB DESCRIPTION: {compressed_jd}
-            CANDIDATE RESUME: {resume_text}
-            
-            TASK: Conduct a text-based interview.
-            1. Do not provide help or coaching.
-            2. If the user input is a greeting, ask one challenging technical question based on their resume gaps.
-            3. If the user answers a question, rate their answer (1-5) briefly and ask a follow-up question.
-            
-            USER INPUT: "{user_input}"
-            """
-        else:
-            # Standard Career Coach Prompt
-            prompt = f"""
-            ROLE: Expert Technical Recruiter with 15+ years of experience.
-            CONTEXT:
-            JOB DESCRIPTION: {compressed_jd}
-            CANDIDATE RESUME: {resume_text}
-            USER QUERY: "{user_input}"
-
-            INSTRUCTIONS:
-            Analyze the User Query and decide the best response format:
-
-            SCENARIO A: If the user asks for a general Resume Review:
-            Provide a comprehensive analysis using this exact structure:
-            1. Executive Summary: A 2-sentence verdict on fit.
-            2. Strengths: 3 bullet points specific to the resume.
-            3. Critical Gaps: 3 missing keywords/skills required by the JD.
-            4. Action Plan: 1 specific, high-impact fix.
-
-            SCENARIO B: If the user asks a SPECIFIC question:
-            - Answer ONLY that question directly.
-            - Be concise and tactical.
-            """
-        
-        response = client.models.generate_content(
-            model="gemini-2.5-flash", 
-            contents=prompt
-        )
+        client, context_cache = resolve_backends(turn.gemini_key, client, context_cache)
+        contents, config = turn.request_args(context_cache)
+        with track("gemini", "gemini-2.5-flash"):
+            response = client.models.generate_content(
+                model="gemini-2.5-flash", 
+                contents=contents,
+                config=config
+            )
         
         if response.text:
-            return f"> *{status_msg}*\n\n" + response.text
+            scope = answer_scope(turn, mode)
+            if scope is not None:
+                get_answer_cache().put(scope, user_input, response.text)
+            return f"> *{turn.status}*\n\n" + response.text
         else:
             return "Gemini returned no text."
 
     except Exception as e:
         return f"Gemini Error: {e}"
 
+def stream_ai_response(user_input, resume, jd, mode, stats, client=None, context_cache=None):
+    """
+    Streaming variant of get_ai_response: yields answer text as it arrives.
+
+    The ScaleDown status and turn latencies are recorded on `stats` (TurnStats)
+    so the caller can render them next to the answer once streaming ends.
+    """
+    turn = prepare_turn(user_input, resume, jd, mode)
+    if isinstance(turn, str):
+        yield turn
+        return
+    stats.status = turn.status
+    if turn.local_answer:
+        stats.ttft_ms = stats.total_ms = (time.perf_counter() - stats.started_at) * 1000
+        yield turn.local_answer
+        return
+
+    try:
+        client, context_cache = resolve_backends(turn.gemini_key, client, context_cache)
+        contents, config = turn.request_args(context_cache)
+        pieces = []
+        with track("gemini_stream", "gemini-2.5-flash"):
+            chunks = client.models.generate_content_stream(
+                model="gemini-2.5-flash",
+                contents=contents,
+                config=config
+            )
+            for text in stream_text(chunks, stats):
+                pieces.append(text)
+                yield text
+        if not pieces:
+            yield "Gemini returned no text."
+        elif (scope := answer_scope(turn, mode)) is not None:
+            get_answer_cache().put(scope, user_input, "".join(pieces))
+
+    except Exception as e:
+        yield f"Gemini Error: {e}"
+
 # ============================================================================
 # APP ENTRY
 # ============================================================================
 
 def main():
     st.set_page_config(page_title="Job Application Assistant", layout="wide")
+    start_metrics_server()
     init_session_state()
     
     resume_file, jd_text, mode = render_sidebar()
@@ -208,10 +505,22 @@ def main():
             st.session_state.messages.append({"role": "assistant", "content": err})
         else:
             with st.chat_message("assistant"):
+                stats = TurnStats()
+                placeholder = st.empty()
+                answer = ""
+                pieces = stream_ai_response(prompt, resume_file, jd_text, mode, stats)
+                # Spinner only until the first token; afterwards the text itself shows progress
                 with st.spinner("Analyzing..."):
-                    resp = get_ai_response(prompt, resume_file, jd_text, mode)
-                    st.markdown(resp)
-                    st.session_state.messages.append({"role": "assistant", "content": resp})
+                    first = next(pieces, "")
+                answer += first
+                placeholder.markdown(answer + "▌")
+                for piece in pieces:
+                    answer += piece
+                    placeholder.markdown(answer + "▌")
+
+                resp = f"> *{stats.status_line()}*\n\n{answer}" if stats.status else answer
+                placeholder.markdown(resp)
+                st.session_state.messages.append({"role": "assistant", "content": resp})
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""
+Application-side components for the Job Application Assistant (app.py).
+
+The `scaledown` package stays a standalone compression library; everything
+that is specific to the chat app (Gemini clients, sessions, prompt layout)
+lives here.
+"""
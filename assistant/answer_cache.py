@@ -0,0 +1,210 @@
+"""
+Answer cache for repeated chat questions.
+
+Answers are scoped to one (resume, job description, mode) key. A lookup tries
+the normalised question first and then falls back to the most similar cached
+question of the same scope (character n-gram Jaccard, or cosine similarity
+when an embedding function is supplied). Similar questions that differ in a
+negation or a number are never treated as the same question. Entries expire after a TTL and the
+least recently used ones are evicted once the cache is full.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Hashable, Optional, Sequence, Tuple
+
+from assistant.common import cosine
+from scaledown.monitoring import record_cache
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+# Tokens that flip or change a question's meaning while barely moving its similarity
+_NEGATION_RE = re.compile(r"\b(not|no|never|none|nothing|nobody|neither|nor|without|cannot|"
+                          r"\w+n t|dont|doesnt|didnt|isnt|arent|cant|wont|shouldnt|wouldnt)\b")
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace."""
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", query.lower())).strip()
+
+
+def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    padded = f" {text} "
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+def meaning_guards(normalized: str) -> FrozenSet[str]:
+    """Negation marker and numbers of a normalised question."""
+    guards = set(_NUMBER_RE.findall(normalized))
+    if _NEGATION_RE.search(normalized):
+        guards.add("<not>")
+    return frozenset(guards)
+
+
+@dataclass
+class _Entry:
+    answer: str
+    ngrams: FrozenSet[str]
+    guards: FrozenSet[str]
+    vector: Optional[Sequence[float]]
+    expires_at: float
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU + TTL cache of chat answers with fuzzy question matching.
+
+    Parameters
+    ----------
+    max_entries : int, default=512
+        Entries kept across all scopes before the least recently used is evicted
+    ttl_seconds : float, default=3600
+        Lifetime of an answer
+    similarity_threshold : float, default=0.8
+        Minimum similarity for a non-exact question to count as a hit; it
+        must also have the same negation and numbers as the cached question
+    min_query_chars : int, default=12
+        Shorter questions ("why?", "and then?") depend on the conversation
+        and are neither cached nor served from the cache
+    embed_fn : Callable[[str], Sequence[float]], optional
+        Embeds a normalised question; when given, cosine similarity replaces
+        n-gram Jaccard similarity
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.8,
+        min_query_chars: int = 12,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.min_query_chars = min_query_chars
+        self.embed_fn = embed_fn
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, str], _Entry]" = OrderedDict()
+        # scope -> normalised questions, for the similarity scan
+        self._scopes: Dict[Hashable, set] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: Hashable, query: str) -> Optional[str]:
+        """Cached answer for ``query`` within ``scope``, or ``None``."""
+        normalized = normalize_query(query)
+        if len(normalized) < self.min_query_chars:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get((scope, normalized))
+            if entry is not None:
+                self._entries.move_to_end((scope, normalized))
+                self.exact_hits += 1
+                record_cache("answer", hit=True)
+                return entry.answer
+            candidates = list(self._scopes.get(scope, ()))
+
+        if not candidates:
+            with self._lock:
+                self.misses += 1
+            record_cache("answer", hit=False)
+            return None
+
+        # Similarity scan outside the lock: embedding calls may be slow
+        ngrams, vector = self._features(normalized)
+        guards = meaning_guards(normalized)
+        best_key, best_sim = None, 0.0
+        for other in candidates:
+            entry = self._entries.get((scope, other))
+            if entry is None or entry.guards != guards:
+                continue
+            if vector is not None and entry.vector is not None:
+                sim = cosine(vector, entry.vector)
+            else:
+                sim = len(ngrams & entry.ngrams) / len(ngrams | entry.ngrams)
+            if sim > best_sim:
+                best_key, best_sim = (scope, other), sim
+
+        with self._lock:
+            entry = self._entries.get(best_key) if best_key else None
+            if entry is not None and best_sim >= self.similarity_threshold:
+                self._entries.move_to_end(best_key)
+                self.similar_hits += 1
+                hit = True
+            else:
+                self.misses += 1
+                hit = False
+        record_cache("answer", hit=hit)
+        return entry.answer if hit else None
+
+    def put(self, scope: Hashable, query: str, answer: str) -> None:
+        normalized = normalize_query(query)
+        if len(normalized) < self.min_query_chars or not answer:
+            return
+        ngrams, vector = self._features(normalized)
+        with self._lock:
+            key = (scope, normalized)
+            self._entries[key] = _Entry(answer, ngrams, meaning_guards(normalized), vector,
+                                        time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._scopes.setdefault(scope, set()).add(normalized)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, scope: Hashable) -> None:
+        """Drop every answer of one scope."""
+        with self._lock:
+            for normalized in list(self._scopes.get(scope, ())):
+                self._remove((scope, normalized))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _features(self, normalized: str) -> Tuple[FrozenSet[str], Optional[Sequence[float]]]:
+        vector = None
+        if self.embed_fn is not None:
+            try:
+                vector = self.embed_fn(normalized)
+            except Exception:
+                vector = None
+        return char_ngrams(normalized), vector
+
+    def _expire(self, now: float) -> None:
+        # Entries share one TTL, so insertion order is close to expiry order;
+        # a full scan keeps this correct when LRU moves reorder them.
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._remove(key)
+
+    def _remove(self, key: Tuple[Hashable, str]) -> None:
+        self._entries.pop(key, None)
+        scope, normalized = key
+        questions = self._scopes.get(scope)
+        if questions is not None:
+            questions.discard(normalized)
+            if not questions:
+                del self._scopes[scope]
@@ -0,0 +1,344 @@
+"""
+Rank a directory of resume PDFs against one job description.
+
+Headless counterpart of the chat app for screening many resumes per posting.
+Resumes are extracted on a process pool and scored locally (weighted skill
+coverage plus lexical similarity to the JD). Optionally the best candidates
+are re-scored by Gemini in small batches under a concurrency limit. Every
+finished resume is appended to a JSONL checkpoint, so an interrupted run
+resumes where it stopped.
+
+Usage
+-----
+    python -m assistant.batch_rank --jd samples/Job_Description.txt --resumes resumes/ \\
+        --output ranking.csv [--llm --llm-top 20 --concurrency 4]
+
+API keys are read from the ``SCALEDOWN_API_KEY`` and ``GEMINI_API_KEY``
+environment variables. Without a ScaleDown key the JD is used uncompressed.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from assistant.common import JD_INSTRUCTION, process_pool, sparse_cosine, term_vector
+from assistant.skills import SkillMatcher
+
+JD_TOKEN_BUDGET = 1600
+LOCAL_WEIGHTS = {"coverage": 0.7, "similarity": 0.3}
+LLM_RESUME_CHARS = 4000
+
+_JSON_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+@dataclass
+class ResumeScore:
+    """One ranked resume; written as a row of the report and a checkpoint line."""
+    file: str
+    key: str
+    score: float = 0.0
+    coverage: float = 0.0
+    similarity: float = 0.0
+    matched: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    pages: int = 0
+    extract_ms: float = 0.0
+    llm_score: Optional[float] = None
+    llm_reason: str = ""
+    error: Optional[str] = None
+
+
+# ============================================================================
+# EXTRACTION (runs in worker processes)
+# ============================================================================
+
+def _extract_worker(path: str, max_pages: int) -> dict:
+    """Extract one resume; never raises so one bad PDF cannot abort the run."""
+    from assistant.pdf_extract import extract
+
+    start = time.perf_counter()
+    try:
+        # Files are already spread across processes: no nested page pool
+        report = extract(path, max_pages=max_pages, parallel_threshold=sys.maxsize)
+        return {"text": report.text, "pages": len(report.pages),
+                "elapsed_ms": (time.perf_counter() - start) * 1000, "error": None}
+    except Exception as e:
+        return {"text": "", "pages": 0, "elapsed_ms": (time.perf_counter() - start) * 1000,
+                "error": f"PDF Error: {e}"}
+
+
+# ============================================================================
+# LOCAL SCORING
+# ============================================================================
+
+class LocalScorer:
+    """Scores resume text against one JD without any network call."""
+
+    def __init__(self, jd_text: str, matcher: Optional[SkillMatcher] = None):
+        self.jd_text = jd_text
+        self.matcher = matcher or SkillMatcher()
+        self._jd_vector = term_vector(jd_text)
+        self._jd_weights = self.matcher.jd_weights(jd_text)
+
+    def score(self, result: ResumeScore, resume_text: str) -> ResumeScore:
+        resume_skills = self.matcher.extract(resume_text)
+        matched = {s: w for s, w in self._jd_weights.items() if s in resume_skills}
+        missing = {s: w for s, w in self._jd_weights.items() if s not in resume_skills}
+        total = sum(self._jd_weights.values())
+        # A JD naming no taxonomy skills says nothing about fit: neutral, not zero
+        result.coverage = sum(matched.values()) / total if total else 1.0
+        result.similarity = sparse_cosine(term_vector(resume_text), self._jd_vector)
+        result.matched = sorted(matched, key=lambda s: -matched[s])
+        result.missing = sorted(missing, key=lambda s: -missing[s])
+        result.score = (LOCAL_WEIGHTS["coverage"] * result.coverage
+                        + LOCAL_WEIGHTS["similarity"] * result.similarity)
+        return result
+
+
+# ============================================================================
+# JOB DESCRIPTION
+# ============================================================================
+
+def prepare_jd(jd_text: str, scaledown_key: Optional[str], budget: int = JD_TOKEN_BUDGET) -> str:
+    """Strip boilerplate, then compress once if the JD is over ``budget`` tokens."""
+    from scaledown.optimizer.boilerplate import BoilerplateOptimizer
+
+    try:
+        jd_text = BoilerplateOptimizer(target_model="gemini-2.5-flash").optimize(jd_text).content or jd_text
+    except Exception as e:
+        print(f"Boilerplate Removal Warning: {e}", file=sys.stderr)
+
+    if not scaledown_key:
+        return jd_text
+    try:
+        from scaledown.types.metrics import count_tokens
+        if count_tokens(jd_text, model="gemini-2.5-flash") <= budget:
+            return jd_text
+        from assistant.resources import get_registry, SCALEDOWN
+        result = get_registry().get(SCALEDOWN, scaledown_key).compress(
+            context=jd_text, prompt=JD_INSTRUCTION, target_model="gemini-2.5-flash", max_tokens=budget
+        )
+        return result.content or jd_text
+    except Exception as e:
+        print(f"Compression Warning: {e}", file=sys.stderr)
+        return jd_text
+
+
+# ============================================================================
+# LLM RE-SCORING
+# ============================================================================
+
+def _llm_prompt(jd_text: str, batch: List[ResumeScore], texts: Dict[str, str]) -> str:
+    candidates = "\n\n".join(
+        f"CANDIDATE {i}:\n{texts[r.key][:LLM_RESUME_CHARS]}" for i, r in enumerate(batch)
+    )
+    return (
+        "You are screening resumes for the job description below. Score each candidate "
+        "from 0 to 100 for fit and give a one-sentence reason. Reply with JSON only: "
+        '[{"candidate": <number>, "score": <0-100>, "reason": "<text>"}, ...]\n\n'
+        f"JOB DESCRIPTION:\n{jd_text}\n\n{candidates}"
+    )
+
+
+def _score_batch_with_llm(client, jd_text: str, batch: List[ResumeScore], texts: Dict[str, str]) -> None:
+    response = client.models.generate_content(model="gemini-2.5-flash", contents=_llm_prompt(jd_text, batch, texts))
+    match = _JSON_RE.search(response.text or "")
+    if not match:
+        raise ValueError("Gemini reply contained no JSON list")
+    for item in json.loads(match.group(0)):
+        index = int(item.get("candidate", -1))
+        if 0 <= index < len(batch):
+            batch[index].llm_score = float(item.get("score", 0))
+            batch[index].llm_reason = str(item.get("reason", ""))
+
+
+def rescore_with_llm(client, jd_text: str, results: List[ResumeScore], texts: Dict[str, str],
+                     batch_size: int = 5, concurrency: int = 4,
+                     on_batch=None) -> None:
+    """Score ``results`` with Gemini, ``batch_size`` resumes per call, ``concurrency`` calls at a time."""
+    batches = [results[i:i + batch_size] for i in range(0, len(results), batch_size)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(_score_batch_with_llm, client, jd_text, b, texts): b for b in batches}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Gemini Warning: {e}", file=sys.stderr)
+            if on_batch is not None:
+                on_batch(futures[future])
+
+
+def final_score(result: ResumeScore) -> float:
+    if result.llm_score is None:
+        return result.score
+    return 0.5 * result.score + 0.5 * result.llm_score / 100
+
+
+# ============================================================================
+# CHECKPOINT & REPORT
+# ============================================================================
+
+def file_key(path: str, jd_hash: str) -> str:
+    """Identifies one resume file version scored against one JD."""
+    stat = os.stat(path)
+    return hashlib.sha256(f"{jd_hash}\0{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+                          .encode("utf-8")).hexdigest()[:24]
+
+
+class Checkpoint:
+    """Append-only JSONL log of finished resumes; later lines override earlier ones."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Dict[str, ResumeScore] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = ResumeScore(**json.loads(line))
+                    except (ValueError, TypeError):
+                        continue  # torn last line from an interrupted run
+                    self.done[record.key] = record
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def record(self, result: ResumeScore) -> None:
+        self.done[result.key] = result
+        if self._file is not None:
+            self._file.write(json.dumps(asdict(result)) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def write_report(results: List[ResumeScore], path: str, fmt: Optional[str] = None) -> None:
+    fmt = fmt or ("json" if path.endswith(".json") else "csv")
+    rows = []
+    for rank, result in enumerate(sorted(results, key=final_score, reverse=True), start=1):
+        row = asdict(result)
+        row.pop("key")
+        row.update(rank=rank, final_score=round(final_score(result), 4),
+                   score=round(result.score, 4), coverage=round(result.coverage, 4),
+                   similarity=round(result.similarity, 4), extract_ms=round(result.extract_ms, 1))
+        rows.append(row)
+
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        return
+    columns = ["rank", "file", "final_score", "score", "coverage", "similarity", "llm_score",
+               "llm_reason", "matched", "missing", "pages", "extract_ms", "error"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            row["matched"] = "; ".join(row["matched"])
+            row["missing"] = "; ".join(row["missing"])
+            writer.writerow(row)
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def find_resumes(directory: str) -> List[str]:
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory)
+        for name in files if name.lower().endswith(".pdf")
+    )
+
+
+def rank(jd_text: str, paths: Iterable[str], checkpoint: Checkpoint, workers: Optional[int] = None,
+         max_pages: int = 10, scaledown_key: Optional[str] = None, gemini_client=None,
+         llm_top: int = 20, llm_batch: int = 5, concurrency: int = 4) -> List[ResumeScore]:
+    """Score every resume in ``paths``, skipping those already in ``checkpoint``."""
+    jd_hash = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    jd_text = prepare_jd(jd_text, scaledown_key)
+    scorer = LocalScorer(jd_text)
+
+    keys = {path: file_key(path, jd_hash) for path in paths}
+    results = {key: checkpoint.done[key] for key in keys.values() if key in checkpoint.done}
+    pending = [path for path, key in keys.items() if key not in results]
+    texts: Dict[str, str] = {}
+    print(f"{len(keys)} resumes, {len(results)} from checkpoint, {len(pending)} to process", file=sys.stderr)
+
+    if pending:
+        with process_pool(workers or os.cpu_count() or 1) as pool:
+            futures = {pool.submit(_extract_worker, path, max_pages): path for path in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                path = futures[future]
+                extracted = future.result()
+                result = ResumeScore(file=path, key=keys[path], pages=extracted["pages"],
+                                     extract_ms=extracted["elapsed_ms"], error=extracted["error"])
+                if result.error is None:
+                    scorer.score(result, extracted["text"])
+                    texts[result.key] = extracted["text"]
+                    checkpoint.record(result)  # failures are retried on the next run
+                results[result.key] = result
+                print(f"[{done}/{len(pending)}] {path}: {result.error or f'{result.score:.3f}'}",
+                      file=sys.stderr)
+
+    if gemini_client is not None:
+        shortlist = [r for r in sorted(results.values(), key=lambda r: r.score, reverse=True)[:llm_top]
+                     if r.error is None and r.llm_score is None]
+        # Checkpointed resumes need their text again for the prompt
+        for r in shortlist:
+            if r.key not in texts:
+                texts[r.key] = _extract_worker(r.file, max_pages)["text"]
+        rescore_with_llm(gemini_client, jd_text, shortlist, texts, batch_size=llm_batch,
+                         concurrency=concurrency,
+                         on_batch=lambda batch: [checkpoint.record(r) for r in batch if r.llm_score is not None])
+
+    return list(results.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank resume PDFs against one job description.")
+    parser.add_argument("--jd", required=True, help="Text file with the job description")
+    parser.add_argument("--resumes", required=True, help="Directory searched recursively for PDFs")
+    parser.add_argument("--output", default="ranking.csv", help="Report path (.csv or .json)")
+    parser.add_argument("--format", choices=["csv", "json"], help="Overrides the output extension")
+    parser.add_argument("--checkpoint", help="JSONL checkpoint (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--workers", type=int, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--llm", action="store_true", help="Re-score the top candidates with Gemini")
+    parser.add_argument("--llm-top", type=int, default=20)
+    parser.add_argument("--llm-batch", type=int, default=5, help="Resumes per Gemini call")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent Gemini calls")
+    args = parser.parse_args(argv)
+
+    with open(args.jd, encoding="utf-8") as f:
+        jd_text = f.read()
+
+    client = None
+    if args.llm:
+        gemini_key = os.environ.get("GEMINI_API_KEY")
+        if not gemini_key:
+            parser.error("--llm requires GEMINI_API_KEY")
+        from assistant.resources import get_registry, GEMINI
+        client = get_registry().get(GEMINI, gemini_key)
+
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint.jsonl")
+    try:
+        results = rank(jd_text, find_resumes(args.resumes), checkpoint, workers=args.workers,
+                       max_pages=args.max_pages, scaledown_key=os.environ.get("SCALEDOWN_API_KEY"),
+                       gemini_client=client, llm_top=args.llm_top, llm_batch=args.llm_batch,
+                       concurrency=args.concurrency)
+    finally:
+        checkpoint.close()
+
+    write_report(results, args.output, args.format)
+    print(f"Wrote {len(results)} ranked resumes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
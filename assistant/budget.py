@@ -0,0 +1,136 @@
+"""
+Token budget planning for the prompt context.
+
+Each component (resume, job description, ...) is measured with
+`count_tokens` and given a share of the target size by priority. Only the
+components that exceed their share are compressed; when everything fits, no
+compressor call is made at all.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from scaledown.types.metrics import count_tokens
+
+
+@dataclass
+class Allocation:
+    """Measured size and granted budget of one component."""
+    name: str
+    tokens: int
+    budget: int
+
+    @property
+    def needs_compression(self) -> bool:
+        return self.tokens > self.budget
+
+
+@dataclass
+class BudgetPlan:
+    target_tokens: int
+    allocations: Dict[str, Allocation] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(a.tokens for a in self.allocations.values())
+
+    @property
+    def fits(self) -> bool:
+        """True when no component needs compressing."""
+        return not any(a.needs_compression for a in self.allocations.values())
+
+
+class BudgetPlanner:
+    """
+    Splits a target prompt size across components by priority.
+
+    Allocation is water-filling: every component is offered a share of the
+    remaining budget proportional to its priority; components smaller than
+    their share keep their full size and the unused budget is redistributed
+    among the rest. A component whose share falls below its minimum gets the
+    minimum (or its full size, if smaller) before the rest is split. The
+    budgets never add up to more than ``target_tokens``.
+
+    Parameters
+    ----------
+    target_tokens : int
+        Token budget for all components together
+    priorities : Dict[str, float]
+        Relative weight per component name (missing names default to 1.0)
+    minimums : Dict[str, int], optional
+        Tokens guaranteed per component name, so a low-priority component is
+        never squeezed below a useful size
+    model : str
+        Model used for token counting
+    """
+
+    def __init__(self, target_tokens: int, priorities: Optional[Dict[str, float]] = None,
+                 model: str = "gemini-2.5-flash", minimums: Optional[Dict[str, int]] = None):
+        if target_tokens <= 0:
+            raise ValueError("target_tokens must be positive")
+        self.minimums = minimums or {}
+        if sum(self.minimums.values()) > target_tokens:
+            raise ValueError("minimums add up to more than target_tokens")
+        self.target_tokens = target_tokens
+        self.priorities = priorities or {}
+        self.model = model
+
+    def plan(self, components: Dict[str, str],
+             token_counts: Optional[Dict[str, int]] = None) -> BudgetPlan:
+        """Measure the components (unless counts are given) and allocate budgets."""
+        token_counts = dict(token_counts or {})
+        for name, text in components.items():
+            if token_counts.get(name) is None:
+                token_counts[name] = count_tokens(text, model=self.model)
+
+        budgets: Dict[str, int] = {}
+        remaining = self.target_tokens
+        pending = set(components)
+        while pending:
+            weight = sum(self.priorities.get(n, 1.0) for n in pending)
+            shares = {n: remaining * self.priorities.get(n, 1.0) / weight for n in pending}
+            # Minimums first: fixing them can only lower the shares of the rest
+            floors = {n: min(token_counts[n], self.minimums.get(n, 0)) for n in pending}
+            below = {n for n in pending if shares[n] < floors[n]}
+            if below:
+                for n in below:
+                    budgets[n] = floors[n]
+                    remaining -= floors[n]
+                pending -= below
+                continue
+            satisfied = {n for n in pending if token_counts[n] <= shares[n]}
+            if not satisfied:
+                for n in pending:
+                    budgets[n] = int(shares[n])
+                break
+            for n in satisfied:
+                budgets[n] = token_counts[n]
+                remaining -= token_counts[n]
+            pending -= satisfied
+
+        return BudgetPlan(
+            target_tokens=self.target_tokens,
+            allocations={n: Allocation(n, token_counts[n], budgets[n]) for n in components}
+        )
+
+    def fit(self, components: Dict[str, str],
+            compress: Callable[[str, str, int], str],
+            token_counts: Optional[Dict[str, int]] = None,
+            max_workers: int = 1) -> Tuple[Dict[str, str], BudgetPlan]:
+        """
+        Plan, then call ``compress(name, text, budget)`` only for components
+        over their budget, up to ``max_workers`` at a time. Returns the fitted
+        texts and the plan.
+        """
+        plan = self.plan(components, token_counts)
+        fitted = dict(components)
+        over = [a for a in plan.allocations.values() if a.needs_compression]
+        if max_workers > 1 and len(over) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(over))) as executor:
+                results = executor.map(lambda a: compress(a.name, components[a.name], a.budget), over)
+                fitted.update(zip((a.name for a in over), results))
+        else:
+            for allocation in over:
+                fitted[allocation.name] = compress(allocation.name, components[allocation.name],
+                                                   allocation.budget)
+        return fitted, plan
@@ -0,0 +1,72 @@
+"""
+Helpers shared by the chat app and the command-line tools (batch ranking,
+posting index): compression instructions, lexical term vectors and cosine
+similarity, and the process pool used for CPU-bound extraction.
+"""
+import atexit
+import math
+import multiprocessing
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+JD_INSTRUCTION = "Extract key requirements, skills, and responsibilities."
+RESUME_INSTRUCTION = "Keep skills, experience, achievements, and education."
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to "
+    "we will with you your who what which about into over using use used work working".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms without stopwords; keeps tokens like 'c++', 'c#' and 'node.js'."""
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def term_vector(text: str) -> Dict[str, float]:
+    """Sublinear term-frequency vector of ``text`` (single letters dropped)."""
+    counts = Counter(t for t in tokenize(text) if len(t) > 1)
+    return {term: 1 + math.log(count) for term, count in counts.items()}
+
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two dense vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def sparse_cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Cosine similarity of two term vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    New process pool. Uses forkserver (or spawn): the app starts work from
+    threads, and forking a threaded process is unsafe.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def shared_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Long-lived pool of ``workers`` processes, one per distinct worker count, shut down at exit."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = process_pool(workers)
+            atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+        return pool
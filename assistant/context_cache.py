@@ -0,0 +1,153 @@
+"""
+Context caches for the stable prompt prefix.
+
+A cache maps a prefix to a provider-side handle that later turns reference
+instead of resending the prefix. `GeminiContextCache` uses Gemini cached
+content in production; `InMemoryContextCache` hands out local handles for
+tests and stubbed runs.
+"""
+import hashlib
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from scaledown.monitoring import record_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    handle: Optional[str]
+    source_key: str
+    expires_at: float
+
+
+class ContextCache(ABC):
+    """
+    Base class handling TTL bookkeeping and invalidation.
+
+    Parameters
+    ----------
+    ttl_seconds : int, default=600
+        Lifetime of a cached prefix
+    refresh_margin : float, default=30.0
+        Seconds before expiry at which a handle is no longer handed out, so a
+        request never references content that expires mid-flight
+    """
+
+    def __init__(self, ttl_seconds: int = 600, refresh_margin: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = refresh_margin
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _create(self, prefix: str) -> str:
+        """Store the prefix with the provider and return its handle."""
+
+    @abstractmethod
+    def _delete(self, handle: str) -> None:
+        """Release a handle with the provider."""
+
+    def get(self, prefix: str, source_key: str) -> Optional[str]:
+        """
+        Handle for ``prefix``, creating it on a miss. ``None`` means the prefix
+        could not be cached and must be sent inline.
+
+        ``source_key`` identifies the inputs the prefix was built from, so all
+        prefixes of a resume/JD pair can be invalidated together.
+        """
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and now < entry.expires_at - self.refresh_margin:
+                if entry.handle:
+                    self.hits += 1
+                    record_cache("context", hit=True)
+                return entry.handle
+            self.misses += 1
+        record_cache("context", hit=False)
+
+        try:
+            handle = self._create(prefix)
+        except Exception as e:
+            # Remember the failure (e.g. prefix below the provider minimum) for one TTL
+            logger.info(f"Context caching unavailable, sending prefix inline: {e}")
+            handle = None
+
+        with self._lock:
+            stale = self._entries.get(digest)
+            self._entries[digest] = _CacheEntry(handle, source_key, now + self.ttl_seconds)
+        if stale is not None and stale.handle and stale.handle != handle:
+            self._safe_delete(stale.handle)
+        return handle
+
+    def invalidate(self, source_key: str) -> int:
+        """Drop every prefix built from ``source_key``. Returns how many were removed."""
+        with self._lock:
+            doomed = [d for d, e in self._entries.items() if e.source_key == source_key]
+            entries = [self._entries.pop(d) for d in doomed]
+        for entry in entries:
+            if entry.handle:
+                self._safe_delete(entry.handle)
+        return len(entries)
+
+    def close(self) -> None:
+        """Release every handle (used on registry shutdown)."""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if entry.handle:
+                self._safe_delete(entry.handle)
+
+    def generation_config(self, handle: str) -> Dict[str, Any]:
+        """Config for generate_content that references a cached prefix."""
+        return {"cached_content": handle}
+
+    def _safe_delete(self, handle: str) -> None:
+        try:
+            self._delete(handle)
+        except Exception as e:
+            logger.debug(f"Ignoring error while deleting cached content {handle}: {e}")
+
+
+class GeminiContextCache(ContextCache):
+    """Stores prefixes as Gemini cached content via ``client.caches``."""
+
+    def __init__(self, client, model: str = "gemini-2.5-flash", **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.model = model
+
+    def _create(self, prefix: str) -> str:
+        cached = self.client.caches.create(
+            model=self.model,
+            config={"contents": [prefix], "ttl": f"{self.ttl_seconds}s"}
+        )
+        return cached.name
+
+    def _delete(self, handle: str) -> None:
+        self.client.caches.delete(name=handle)
+
+
+class InMemoryContextCache(ContextCache):
+    """Local stand-in that keeps prefixes in memory under synthetic handles."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.contents: Dict[str, str] = {}
+
+    def _create(self, prefix: str) -> str:
+        handle = f"cachedContents/local-{hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:12]}"
+        self.contents[handle] = prefix
+        return handle
+
+    def _delete(self, handle: str) -> None:
+        self.contents.pop(handle, None)
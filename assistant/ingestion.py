@@ -0,0 +1,91 @@
+"""
+Background ingestion of the resume and job description.
+
+Work is started as soon as both inputs are present in the sidebar, so it
+overlaps with the time the user spends typing the first question.
+"""
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+
+@dataclass
+class IngestedContext:
+    """Everything the chat turn needs from the uploaded inputs."""
+    resume_text: Optional[str]
+    compressed_jd: str
+    status: str
+    resume_tokens: Optional[int] = None
+    jd_tokens: Optional[int] = None
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+    page_timings_ms: List[float] = field(default_factory=list)
+    # ResumeIndex over the uncompressed resume text, for query-targeted prompts
+    resume_index: Optional[Any] = None
+    # SkillGapReport from the local skill matcher
+    skill_gaps: Optional[Any] = None
+    # Ingestion steps that determined elapsed_ms
+    critical_path: List[str] = field(default_factory=list)
+
+
+def fingerprint(resume_bytes: bytes, jd_text: str) -> str:
+    """Key identifying one (resume, job description) pair."""
+    digest = hashlib.sha256(resume_bytes)
+    digest.update(b"\0")
+    digest.update(jd_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IngestionManager:
+    """
+    Runs ingestion jobs on a shared worker pool and keeps their futures by key.
+
+    Submitting the same key twice returns the existing future, so Streamlit
+    reruns do not restart work. Only the ``max_entries`` most recent jobs are
+    retained, which keeps memory flat as sessions come and go.
+    """
+
+    def __init__(self, max_workers: int = 4, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._jobs.move_to_end(key)
+                return future
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._jobs[key] = future
+            while len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)
+            return future
+
+    def get(self, key: Optional[str]) -> Optional[Future]:
+        if key is None:
+            return None
+        with self._lock:
+            return self._jobs.get(key)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_manager: Optional[IngestionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_ingestion_manager() -> IngestionManager:
+    """Process-wide ingestion manager shared by all sessions."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = IngestionManager()
+            atexit.register(_manager.shutdown)
+        return _manager
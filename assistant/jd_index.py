@@ -0,0 +1,352 @@
+"""
+Persistent index of job postings for matching one resume against many JDs.
+
+Postings are stored in SQLite: the compressed JD text (compressed once, when
+the posting is added), a BM25 inverted index over the cleaned JD text and,
+optionally, an embedding per posting. Adding and removing postings only
+touches that posting's rows. Queries are local and make no LLM or API call:
+BM25 selects the candidates, and embeddings (when configured) re-rank them.
+
+Usage
+-----
+    python -m assistant.jd_index add postings/ --db jd_index.sqlite
+    python -m assistant.jd_index query resume.pdf --db jd_index.sqlite -k 5
+"""
+import argparse
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from assistant.common import cosine, tokenize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL,
+    text TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    vector BLOB,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings_terms (
+    term TEXT NOT NULL,
+    posting_id TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, posting_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_terms_by_posting ON postings_terms (posting_id);
+"""
+
+
+@dataclass
+class PostingMatch:
+    id: str
+    title: str
+    score: float
+    text: str
+    bm25: float = 0.0
+    similarity: Optional[float] = None
+
+
+class JDIndex:
+    """
+    SQLite-backed BM25 (+ optional vector) index of job postings.
+
+    Parameters
+    ----------
+    path : str
+        Database file (``":memory:"`` for a throwaway index)
+    compressor : ScaleDownCompressor, optional
+        Compresses each posting once when it is added; the compressed text is
+        what ``query`` returns for the chat flow. Without one the cleaned text
+        is stored.
+    cleaner : BoilerplateOptimizer, optional
+        Removes template boilerplate before indexing and compression
+    embed_fn : Callable[[str], Sequence[float]], optional
+        Embeds postings and queries for re-ranking BM25 candidates
+    compress_above : int, default=400
+        Only postings longer than this many tokens are compressed
+    k1, b : float
+        BM25 parameters
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compressor=None,
+        cleaner=None,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        compress_above: int = 400,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.path = path
+        self.compressor = compressor
+        self.cleaner = cleaner
+        self.embed_fn = embed_fn
+        self.compress_above = compress_above
+        self.k1 = k1
+        self.b = b
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, posting_id: str, text: str, title: str = "") -> bool:
+        """Add or replace a posting. Returns False when it is already indexed unchanged."""
+        return self.add_many([(posting_id, text, title)]) > 0
+
+    def add_many(self, postings: Iterable[Tuple[str, str, str]], batch_size: int = 500) -> int:
+        """
+        Add ``(id, text, title)`` triples, committing once per ``batch_size``
+        postings. Returns how many were new or changed.
+        """
+        changed, batch = 0, []
+        for posting_id, text, title in postings:
+            content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            with self._lock:
+                row = self._conn.execute("SELECT content_hash FROM postings WHERE id = ?",
+                                         (posting_id,)).fetchone()
+            if row is not None and row[0] == content_hash:
+                continue
+            if any(posting[0] == posting_id for posting, _ in batch):
+                # Same id twice in one batch: write the earlier version first
+                changed += self._write(batch)
+                batch = []
+            # Cleaning, compression and embedding happen outside the lock
+            batch.append(self._prepare(posting_id, text, title, content_hash))
+            if len(batch) >= batch_size:
+                changed += self._write(batch)
+                batch = []
+        return changed + self._write(batch)
+
+    def remove(self, posting_id: str) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM postings_terms WHERE posting_id = ?", (posting_id,))
+            return self._conn.execute("DELETE FROM postings WHERE id = ?", (posting_id,)).rowcount > 0
+
+    def get(self, posting_id: str) -> Optional[PostingMatch]:
+        with self._lock:
+            row = self._conn.execute("SELECT id, title, text FROM postings WHERE id = ?", (posting_id,)).fetchone()
+        return PostingMatch(row[0], row[1], 0.0, row[2]) if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def query(self, resume_text: str, k: int = 10, max_query_terms: int = 64,
+              rerank_pool: int = 100, vector_weight: float = 0.5) -> List[PostingMatch]:
+        """
+        Top-``k`` postings for ``resume_text``.
+
+        Only the ``max_query_terms`` most discriminative resume terms (by
+        idf x query frequency) are looked up, which bounds query cost on long
+        resumes. With ``embed_fn`` set, the best ``rerank_pool`` BM25 hits are
+        re-ranked by a blend of normalised BM25 and cosine similarity.
+        """
+        query_tf = Counter(tokenize(resume_text))
+        if not query_tf:
+            return []
+
+        with self._lock:
+            count, avg_length = self._conn.execute("SELECT COUNT(*), AVG(length) FROM postings").fetchone()
+            if not count:
+                return []
+            df = dict(self._conn.execute(
+                f"SELECT term, COUNT(*) FROM postings_terms WHERE term IN ({_placeholders(len(query_tf))}) "
+                "GROUP BY term",
+                list(query_tf)
+            ).fetchall())
+            idf = {t: math.log(1 + (count - n + 0.5) / (n + 0.5)) for t, n in df.items()}
+            terms = sorted(idf, key=lambda t: -idf[t] * (1 + math.log(query_tf[t])))[:max_query_terms]
+            if not terms:
+                return []
+            rows = self._conn.execute(
+                "SELECT pt.term, pt.posting_id, pt.tf, p.length FROM postings_terms pt "
+                f"JOIN postings p ON p.id = pt.posting_id WHERE pt.term IN ({_placeholders(len(terms))})",
+                terms
+            ).fetchall()
+
+        scores: Dict[str, float] = {}
+        avg_length = avg_length or 1.0
+        for term, posting_id, tf, length in rows:
+            norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+            scores[posting_id] = scores.get(posting_id, 0.0) + idf[term] * tf * (self.k1 + 1) / norm
+
+        pool = rerank_pool if self.embed_fn is not None else k
+        ranked = sorted(scores.items(), key=lambda p: -p[1])[:max(pool, k)]
+        matches = self._load(ranked)
+        if self.embed_fn is not None and matches:
+            self._rerank(matches, resume_text, vector_weight)
+        return matches[:k]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _prepare(self, posting_id: str, text: str, title: str, content_hash: str):
+        cleaned = self._clean(text)
+        stored = self._compress(cleaned)
+        terms = Counter(tokenize(cleaned))
+        vector = None
+        if self.embed_fn is not None:
+            vector = array("f", self.embed_fn(stored)).tobytes()
+        return (posting_id, title, content_hash, stored, sum(terms.values()), vector, time.time()), terms
+
+    def _write(self, batch) -> int:
+        if not batch:
+            return 0
+        with self._lock, self._conn:
+            ids = [(posting[0],) for posting, _ in batch]
+            self._conn.executemany("DELETE FROM postings_terms WHERE posting_id = ?", ids)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO postings (id, title, content_hash, text, length, vector, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [posting for posting, _ in batch]
+            )
+            self._conn.executemany(
+                "INSERT INTO postings_terms (term, posting_id, tf) VALUES (?, ?, ?)",
+                [(term, posting[0], tf) for posting, terms in batch for term, tf in terms.items()]
+            )
+        return len(batch)
+
+    def _load(self, ranked: List[Tuple[str, float]]) -> List[PostingMatch]:
+        if not ranked:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, title, text FROM postings WHERE id IN ({_placeholders(len(ranked))})",
+                [posting_id for posting_id, _ in ranked]
+            ).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [PostingMatch(pid, by_id[pid][1], score, by_id[pid][2], bm25=score)
+                for pid, score in ranked if pid in by_id]
+
+    def _rerank(self, matches: List[PostingMatch], resume_text: str, vector_weight: float) -> None:
+        query_vector = list(self.embed_fn(resume_text))
+        with self._lock:
+            vectors = dict(self._conn.execute(
+                f"SELECT id, vector FROM postings WHERE id IN ({_placeholders(len(matches))})",
+                [m.id for m in matches]
+            ).fetchall())
+        top_bm25 = max(m.bm25 for m in matches) or 1.0
+        for match in matches:
+            blob = vectors.get(match.id)
+            if blob is None:
+                match.similarity = None
+                match.score = (1 - vector_weight) * match.bm25 / top_bm25
+                continue
+            vector = array("f")
+            vector.frombytes(blob)
+            match.similarity = cosine(query_vector, vector)
+            match.score = (1 - vector_weight) * match.bm25 / top_bm25 + vector_weight * match.similarity
+        matches.sort(key=lambda m: -m.score)
+
+    def _clean(self, text: str) -> str:
+        if self.cleaner is None:
+            return text
+        try:
+            return self.cleaner.optimize(text).content or text
+        except Exception as e:
+            print(f"Boilerplate Removal Warning: {e}", file=sys.stderr)
+            return text
+
+    def _compress(self, text: str) -> str:
+        if self.compressor is None or len(tokenize(text)) <= self.compress_above:
+            return text
+        try:
+            result = self.compressor.compress(
+                context=text, prompt="Extract key requirements, skills, and responsibilities.",
+                target_model="gemini-2.5-flash"
+            )
+            return result.content or text
+        except Exception as e:
+            print(f"Compression Warning: {e}", file=sys.stderr)
+            return text
+
+
+def _placeholders(n: int) -> str:
+    return ",".join("?" * n)
+
+
+def read_postings(directory: str) -> List[Tuple[str, str, str]]:
+    """``(id, text, title)`` for every .txt file; the first line is the title. Empty files are skipped."""
+    postings = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".txt"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            text = f.read()
+        if not text.strip():
+            print(f"Skipping empty posting: {name}", file=sys.stderr)
+            continue
+        postings.append((os.path.splitext(name)[0], text, text.strip().splitlines()[0][:120]))
+    return postings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query a local job-posting index.")
+    parser.add_argument("--db", default="jd_index.sqlite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Index .txt postings from a directory (file name = posting id)")
+    add.add_argument("directory")
+    remove = commands.add_parser("remove", help="Remove postings by id")
+    remove.add_argument("ids", nargs="+")
+    query = commands.add_parser("query", help="Top postings for a resume (.pdf or .txt)")
+    query.add_argument("resume")
+    query.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    compressor = None
+    if args.command == "add" and os.environ.get("SCALEDOWN_API_KEY"):
+        from assistant.resources import get_registry, SCALEDOWN
+        compressor = get_registry().get(SCALEDOWN, os.environ["SCALEDOWN_API_KEY"])
+    from scaledown.optimizer.boilerplate import BoilerplateOptimizer
+    index = JDIndex(args.db, compressor=compressor, cleaner=BoilerplateOptimizer(target_model="gemini-2.5-flash"))
+
+    try:
+        if args.command == "add":
+            changed = index.add_many(read_postings(args.directory))
+            print(f"{changed} postings added or updated; {len(index)} in index")
+        elif args.command == "remove":
+            removed = sum(index.remove(posting_id) for posting_id in args.ids)
+            print(f"{removed} postings removed; {len(index)} in index")
+        else:
+            if args.resume.lower().endswith(".pdf"):
+                from assistant.pdf_extract import extract
+                resume_text = extract(args.resume, max_pages=10).text
+            else:
+                with open(args.resume, encoding="utf-8") as f:
+                    resume_text = f.read()
+            start = time.perf_counter()
+            matches = index.query(resume_text, k=args.k)
+            elapsed = (time.perf_counter() - start) * 1000
+            for rank, match in enumerate(matches, start=1):
+                print(f"{rank:>3}. {match.score:7.3f}  {match.id}  {match.title}")
+            print(f"{len(matches)} matches from {len(index)} postings in {elapsed:.1f} ms")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
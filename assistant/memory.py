@@ -0,0 +1,134 @@
+"""
+Bounded conversation memory for multi-turn chat.
+
+Recent messages are kept verbatim; older ones are replaced by short summaries
+that are computed once per message and cached. The rendered history always
+fits a token budget, so per-turn prompt size stays roughly constant however
+long the conversation gets.
+"""
+import hashlib
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+from scaledown.types.metrics import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Status lines such as "> *ScaleDown: 40% saved · first token 300 ms*" are UI-only
+_STATUS_LINE_RE = re.compile(r"^> \*.*\*\s*$", re.MULTILINE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+Summarizer = Callable[[str], str]
+
+
+def local_summary(text: str, max_words: int = 40) -> str:
+    """Extractive summary: leading sentences up to ``max_words`` words."""
+    words: List[str] = []
+    for sentence in _SENTENCE_RE.split(" ".join(text.split())):
+        sentence_words = sentence.split()
+        if words and len(words) + len(sentence_words) > max_words:
+            break
+        words.extend(sentence_words)
+    if len(words) > max_words:
+        words = words[:max_words] + ["..."]
+    return " ".join(words)
+
+
+def scaledown_summarizer(compressor, max_tokens: int = 60) -> Summarizer:
+    """
+    Summariser backed by a ScaleDownCompressor, falling back to
+    :func:`local_summary` when the API call fails.
+    """
+    def summarize(text: str) -> str:
+        try:
+            return compressor.compress(
+                context=text,
+                prompt="Keep the facts, questions and ratings from this chat message.",
+                max_tokens=max_tokens
+            ).content
+        except Exception as e:
+            logger.warning(f"ScaleDown summary failed, using local summary: {e}")
+            return local_summary(text)
+    return summarize
+
+
+class ConversationMemory:
+    """
+    Renders chat history under a token budget.
+
+    Parameters
+    ----------
+    token_budget : int, default=1200
+        Maximum tokens of rendered history
+    recent_messages : int, default=4
+        Number of latest messages kept verbatim when the budget allows
+    summarizer : callable, optional
+        Text -> summary function for older messages (default: local_summary)
+    model : str
+        Model used for token counting
+    """
+
+    def __init__(self, token_budget: int = 1200, recent_messages: int = 4,
+                 summarizer: Optional[Summarizer] = None, model: str = "gemini-2.5-flash"):
+        self.token_budget = token_budget
+        self.recent_messages = recent_messages
+        self.summarizer = summarizer or local_summary
+        self.model = model
+        self._summaries: Dict[str, str] = {}
+        self._tokens: Dict[str, int] = {}
+
+    def render(self, messages: List[Dict[str, str]]) -> str:
+        """
+        History text for the prompt, oldest first, within ``token_budget``.
+
+        ``messages`` are ``{"role", "content"}`` dicts as kept in
+        ``st.session_state.messages``, excluding the message being answered.
+        """
+        cleaned = [(m["role"], _STATUS_LINE_RE.sub("", m["content"]).strip()) for m in messages]
+        cleaned = [(role, content) for role, content in cleaned if content]
+        if not cleaned:
+            return ""
+
+        split = max(len(cleaned) - self.recent_messages, 0)
+        older = [self._summary_line(role, content) for role, content in cleaned[:split]]
+        recent = [f"{role.upper()}: {content}" for role, content in cleaned[split:]]
+
+        # Over budget: drop the oldest summaries first, then summarise verbatim
+        # messages oldest-first, and only then drop those too
+        total = sum(self._count(line) for line in older + recent)
+        while older and total > self.token_budget:
+            total -= self._count(older.pop(0))
+        for idx, (role, content) in enumerate(cleaned[split:]):
+            if total <= self.token_budget:
+                break
+            summary = self._summary_line(role, content)
+            total += self._count(summary) - self._count(recent[idx])
+            recent[idx] = summary
+        while recent and total > self.token_budget:
+            total -= self._count(recent.pop(0))
+
+        self._prune({_digest(role, content) for role, content in cleaned})
+        return "\n".join(older + recent)
+
+    def _summary_line(self, role: str, content: str) -> str:
+        key = _digest(role, content)
+        if key not in self._summaries:
+            self._summaries[key] = self.summarizer(content)
+        return f"{role.upper()} (summary): {self._summaries[key]}"
+
+    def _count(self, text: str) -> int:
+        if text not in self._tokens:
+            self._tokens[text] = count_tokens(text, model=self.model)
+        return self._tokens[text]
+
+    def _prune(self, live_keys) -> None:
+        """Forget summaries of messages no longer in the conversation."""
+        for key in [k for k in self._summaries if k not in live_keys]:
+            del self._summaries[key]
+        if len(self._tokens) > 4 * max(len(live_keys), 1):
+            self._tokens.clear()
+
+
+def _digest(role: str, content: str) -> str:
+    return hashlib.sha256(f"{role}\0{content}".encode("utf-8")).hexdigest()
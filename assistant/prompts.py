@@ -0,0 +1,95 @@
+"""
+Prompt layout for the Gemini call.
+
+The prompt is split into a stable prefix (role, instructions, job description,
+resume) and a per-turn suffix. The prefix is byte-identical across turns for
+the same inputs and mode, so it can be served from a context cache and the
+model does not re-read it every turn.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+HIRING_MANAGER_INSTRUCTIONS = """ROLE: You are a strict Hiring Manager at the company described in the JD.
+
+TASK: Conduct a text-based interview.
+1. Do not provide help or coaching.
+2. If the user input is a greeting, ask one challenging technical question based on their resume gaps.
+3. If the user answers a question, rate their answer (1-5) briefly and ask a follow-up question."""
+
+CAREER_COACH_INSTRUCTIONS = """ROLE: Expert Technical Recruiter with 15+ years of experience.
+
+INSTRUCTIONS:
+Analyze the User Query and decide the best response format:
+
+SCENARIO A: If the user asks for a general Resume Review:
+Provide a comprehensive analysis using this exact structure:
+1. Executive Summary: A 2-sentence verdict on fit.
+2. Strengths: 3 bullet points specific to the resume.
+3. Critical Gaps: 3 missing keywords/skills required by the JD.
+4. Action Plan: 1 specific, high-impact fix.
+
+SCENARIO B: If the user asks a SPECIFIC question:
+- Answer ONLY that question directly.
+- Be concise and tactical."""
+
+
+def is_interview_mode(mode: str) -> bool:
+    return "Hiring Manager" in mode
+
+
+def build_prefix(mode: str, compressed_jd: str, resume_text: str = "", skill_facts: str = "") -> str:
+    """
+    Stable part of the prompt: identical for every turn with the same inputs
+    and mode. Without ``resume_text`` the resume is left out and each turn
+    carries the sections relevant to its question instead.
+    """
+    instructions = HIRING_MANAGER_INSTRUCTIONS if is_interview_mode(mode) else CAREER_COACH_INSTRUCTIONS
+    resume = resume_text.strip() or "Only the sections relevant to each question are given with the question."
+    prefix = (
+        f"{instructions}\n\n"
+        "CONTEXT:\n"
+        f"JOB DESCRIPTION: {compressed_jd.strip()}\n\n"
+        f"CANDIDATE RESUME: {resume}\n"
+    )
+    if skill_facts:
+        prefix += f"\nSKILL MATCH (precomputed, treat as facts):\n{skill_facts.strip()}\n"
+    return prefix
+
+
+def build_turn(mode: str, user_input: str, history: str = "", focus: str = "") -> str:
+    """
+    Per-turn part of the prompt, always placed after the prefix. ``focus``
+    holds the resume sections relevant to this question, sent instead of the
+    full resume; being query-specific, it belongs here and never in the prefix.
+    """
+    label = "USER INPUT" if is_interview_mode(mode) else "USER QUERY"
+    parts = []
+    if history:
+        parts.append(f"CONVERSATION SO FAR:\n{history}\n")
+    if focus:
+        parts.append(f"CANDIDATE RESUME (SECTIONS RELEVANT TO THIS QUESTION):\n{focus.strip()}\n")
+    parts.append(f'{label}: "{user_input}"\n')
+    return "\n".join(parts)
+
+
+@dataclass
+class PreparedTurn:
+    """Everything needed to send one chat turn to Gemini."""
+    gemini_key: str
+    prefix: str
+    turn: str
+    status: str
+    source_key: str
+    # Set when the turn was answered locally and needs no LLM call
+    local_answer: Optional[str] = None
+
+    def request_args(self, context_cache=None) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        ``(contents, config)`` for generate_content. With a cache the prefix is
+        referenced by handle; without one (or if caching failed) it is inlined.
+        """
+        if context_cache is not None:
+            handle = context_cache.get(self.prefix, source_key=self.source_key)
+            if handle:
+                return self.turn, context_cache.generation_config(handle)
+        return self.prefix + "\n" + self.turn, None
@@ -0,0 +1,297 @@
+"""
+Process-wide pool of long-lived clients and models shared across Streamlit
+reruns and sessions.
+
+Streamlit re-executes app.py on every interaction, but imported modules stay
+loaded, so the registry below outlives individual reruns and sessions. It is
+the one sharing mechanism of the app: API clients, local optimizer models,
+caches, the posting index and the metrics endpoint are all obtained here.
+"""
+import atexit
+import hashlib
+import logging
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# API clients, keyed by API key
+GEMINI = "gemini"
+SCALEDOWN = "scaledown"
+CONTEXT_CACHE = "context_cache"
+# Local models and process-wide state; keyed by "" unless noted
+JD_CLEANER = "jd_cleaner"
+SKILL_MATCHER = "skill_matcher"
+SEMANTIC_OPTIMIZER = "semantic_optimizer"  # keyed by embedding model name
+ANSWER_CACHE = "answer_cache"
+JD_INDEX = "jd_index"  # keyed by database path
+METRICS_SERVER = "metrics_server"  # keyed by port
+
+# Seconds a health probe may take before the resource counts as unhealthy
+HEALTH_TIMEOUT = 5.0
+
+
+@dataclass
+class _Entry:
+    resource: Any
+    created_at: float
+    checked_at: float
+
+
+class ResourceRegistry:
+    """
+    Thread-safe registry of shared resources keyed by (kind, key).
+
+    The key is an API key or another identifier (model name, path); only a
+    hash of it is kept. Factories and health checks run outside the registry
+    lock, so a slow client build only blocks callers waiting for that same
+    resource; concurrent callers for it share the one build.
+
+    Parameters
+    ----------
+    health_interval : float, default=300.0
+        Seconds between health checks of a cached resource on ``get``
+    """
+
+    def __init__(self, health_interval: float = 300.0):
+        self.health_interval = health_interval
+        self._factories: Dict[str, Callable[[str], Any]] = {}
+        self._health_checks: Dict[str, Callable[[Any], bool]] = {}
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._building: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def register(self, kind: str, factory: Callable[[str], Any],
+                 health_check: Optional[Callable[[Any], bool]] = None) -> None:
+        """Register how to build (and optionally health-check) a resource kind."""
+        with self._lock:
+            self._factories[kind] = factory
+            if health_check is not None:
+                self._health_checks[kind] = health_check
+            else:
+                self._health_checks.pop(kind, None)
+
+    def get(self, kind: str, key: str = "") -> Any:
+        """Return the shared resource for ``kind`` and ``key``, creating it on first use."""
+        slot = (kind, _fingerprint(key))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ResourceRegistry has been shut down")
+            if kind not in self._factories:
+                raise KeyError(f"No factory registered for resource kind '{kind}'")
+            entry = self._entries.get(slot)
+            now = time.monotonic()
+            check = entry is not None and now - entry.checked_at >= self.health_interval
+            if check:
+                # Other callers keep using the resource while this one checks it
+                entry.checked_at = now
+
+        if entry is not None:
+            if not check or self._is_healthy(kind, entry.resource):
+                return entry.resource
+            logger.warning(f"Resource '{kind}' failed its health check; rebuilding.")
+            self._discard(slot, entry)
+        return self._build(kind, key, slot)
+
+    def health_check(self) -> Dict[str, bool]:
+        """Check every cached resource now and evict the unhealthy ones."""
+        with self._lock:
+            entries = list(self._entries.items())
+        report = {}
+        for slot, entry in entries:
+            kind = slot[0]
+            healthy = self._is_healthy(kind, entry.resource)
+            report[f"{kind}:{slot[1]}"] = healthy
+            entry.checked_at = time.monotonic()
+            if not healthy:
+                self._discard(slot, entry)
+        return report
+
+    def evict(self, kind: str, key: str = "") -> None:
+        """Drop (and close) one resource, e.g. after an authentication failure."""
+        with self._lock:
+            entry = self._entries.pop((kind, _fingerprint(key)), None)
+        if entry is not None:
+            self._close(entry.resource)
+
+    def _build(self, kind: str, key: str, slot: Tuple[str, str]) -> Any:
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None:
+                return entry.resource
+            future = self._building.get(slot)
+            owner = future is None
+            if owner:
+                future = self._building[slot] = Future()
+                factory = self._factories[kind]
+        if not owner:
+            return future.result()
+
+        try:
+            resource = factory(key)
+        except BaseException as e:
+            with self._lock:
+                self._building.pop(slot, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._building.pop(slot, None)
+            closed = self._closed
+            if not closed:
+                now = time.monotonic()
+                self._entries[slot] = _Entry(resource, now, now)
+        if closed:
+            self._close(resource)
+            error = RuntimeError("ResourceRegistry has been shut down")
+            future.set_exception(error)
+            raise error
+        future.set_result(resource)
+        return resource
+
+    def _discard(self, slot: Tuple[str, str], entry: _Entry) -> None:
+        """Remove ``entry`` unless another caller already replaced it, then close it."""
+        with self._lock:
+            if self._entries.get(slot) is entry:
+                del self._entries[slot]
+        self._close(entry.resource)
+
+    def shutdown(self) -> None:
+        """Close every resource. Further ``get`` calls raise."""
+        with self._lock:
+            self._closed = True
+            entries, self._entries = self._entries, {}
+        for entry in entries.values():
+            self._close(entry.resource)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_healthy(self, kind: str, resource: Any) -> bool:
+        check = self._health_checks.get(kind)
+        if check is None:
+            return True
+        try:
+            return bool(check(resource))
+        except Exception as e:
+            logger.warning(f"Health check for '{kind}' raised: {e}")
+            return False
+
+    @staticmethod
+    def _close(resource: Any) -> None:
+        if isinstance(resource, socketserver.BaseServer):
+            resource.shutdown()
+            resource.server_close()
+            return
+        close = getattr(resource, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Ignoring error while closing {resource!r}: {e}")
+
+
+def _fingerprint(key: str) -> str:
+    """Stable key for an API key that does not keep the secret itself in the registry."""
+    return hashlib.sha256((key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def _gemini_client(api_key: str):
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+
+def _gemini_healthy(client) -> bool:
+    """Listing one model needs a working connection and a valid key."""
+    next(iter(client.models.list(config={"page_size": 1})), None)
+    return True
+
+
+def _scaledown_compressor(api_key: str):
+    from scaledown.compressor import ScaleDownCompressor
+
+    return ScaleDownCompressor(api_key=api_key)
+
+
+def _context_cache(api_key: str):
+    from assistant.context_cache import GeminiContextCache
+
+    return GeminiContextCache(get_registry().get(GEMINI, api_key))
+
+
+def _jd_cleaner(key: str):
+    from scaledown.optimizer.boilerplate import BoilerplateOptimizer
+
+    return BoilerplateOptimizer(target_model="gemini-2.5-flash")
+
+
+def _skill_matcher(key: str):
+    from assistant.skills import SkillMatcher
+
+    return SkillMatcher()
+
+
+def _semantic_optimizer(model_name: str):
+    from scaledown.optimizer.semantic_code import SemanticOptimizer
+
+    return SemanticOptimizer(model_name=model_name) if model_name else SemanticOptimizer()
+
+
+def _answer_cache(key: str):
+    from assistant.answer_cache import AnswerCache
+
+    return AnswerCache(max_entries=512, ttl_seconds=3600)
+
+
+def _jd_index(path: str):
+    """
+    The posting index at ``path``. Raises FileNotFoundError when no index has
+    been built there, so nothing is cached and the next call checks again.
+    """
+    import os
+    from assistant.jd_index import JDIndex
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return JDIndex(path)
+
+
+def _metrics_server(port: str):
+    """Metrics endpoint on ``port``, or None when it cannot be bound (kept, not retried)."""
+    from scaledown.monitoring import start_http_server
+
+    try:
+        return start_http_server(int(port))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Metrics server not started on port {port!r}: {e}")
+        return None
+
+
+_registry: Optional[ResourceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ResourceRegistry:
+    """Process-wide registry with the app's default resource kinds registered."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ResourceRegistry()
+            _registry.register(GEMINI, _gemini_client, health_check=_gemini_healthy)
+            _registry.register(SCALEDOWN, _scaledown_compressor,
+                               health_check=lambda c: c.ping(timeout=HEALTH_TIMEOUT))
+            _registry.register(CONTEXT_CACHE, _context_cache)
+            _registry.register(JD_CLEANER, _jd_cleaner)
+            _registry.register(SKILL_MATCHER, _skill_matcher)
+            _registry.register(SEMANTIC_OPTIMIZER, _semantic_optimizer)
+            _registry.register(ANSWER_CACHE, _answer_cache)
+            _registry.register(JD_INDEX, _jd_index)
+            _registry.register(METRICS_SERVER, _metrics_server)
+            atexit.register(_registry.shutdown)
+        return _registry
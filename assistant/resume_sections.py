@@ -0,0 +1,211 @@
+"""
+Section index over extracted resume text.
+
+The resume is split into sections (summary, experience entries, skills,
+education, projects, ...) with cached token counts, and a lightweight lexical
+scorer picks the sections relevant to a query. Full reviews and interview mode
+still get the whole document.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+HEADINGS: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "profile", "objective", "about me", "about"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "tools",
+               "technologies", "key skills"],
+    "education": ["education", "academic background", "qualifications"],
+    "projects": ["projects", "personal projects", "selected projects", "portfolio"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "awards": ["awards", "achievements", "honors", "honours"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies"],
+}
+_HEADING_LOOKUP = {h: kind for kind, names in HEADINGS.items() for h in names}
+
+# Date ranges such as "2019 - Present" or "Jan 2020 – Mar 2022" start a new experience entry
+_DATE = r"(\b[A-Za-z]{3,9}\.? )?(19|20)\d{2}"
+_DATE_RANGE_RE = re.compile(
+    rf"{_DATE}\s*(-|–|—|to)\s*({_DATE}|present|current|now)\b",
+    re.IGNORECASE
+)
+_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+
+# Query words that point at specific section kinds
+KIND_HINTS: Dict[str, List[str]] = {
+    "summary": ["summary", "pitch", "introduce", "yourself", "profile", "headline", "salary", "level", "seniority"],
+    "experience": ["experience", "role", "job", "worked", "company", "years", "salary", "seniority",
+                   "achievement", "impact", "led", "managed"],
+    "skills": ["skill", "skills", "tool", "tools", "stack", "technology", "keyword", "keywords", "gap", "gaps",
+               "missing", "ats", "proficient"],
+    "education": ["degree", "education", "university", "college", "gpa", "school", "graduate"],
+    "projects": ["project", "projects", "portfolio", "built", "side"],
+    "certifications": ["certification", "certified", "certificate", "course", "license"],
+    "awards": ["award", "awards", "achievement", "recognition"],
+}
+
+# Queries that need the whole resume
+_FULL_REVIEW_RE = re.compile(
+    r"\b(review|overall|full|whole|entire|analy[sz]e|analysis|feedback|fit|match|improve|rewrite|critique)\b",
+    re.IGNORECASE
+)
+
+_STOPWORDS = {"the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "with", "my", "i", "me",
+              "is", "are", "what", "how", "should", "do", "does", "can", "could", "would", "be", "at",
+              "this", "that", "it", "as", "by", "from", "about", "you", "your"}
+
+
+@dataclass
+class Section:
+    kind: str
+    title: str
+    text: str
+    position: int
+    _tokens: Optional[int] = field(default=None, repr=False)
+
+    def tokens(self, counter: Callable[[str], int]) -> int:
+        if self._tokens is None:
+            self._tokens = counter(self.text)
+        return self._tokens
+
+
+def _parse_heading(line: str) -> Optional[Tuple[str, str, str]]:
+    """
+    ``(kind, title, rest)`` when the line is a section heading, either on its
+    own ("Work Experience:") or as an upper-case lead-in ("SKILLS Python, SQL").
+    """
+    stripped = line.strip().strip(":").strip()
+    if not stripped:
+        return None
+    if len(stripped.split()) <= 4 and stripped.lower() in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[stripped.lower()], stripped, ""
+
+    words = line.split()
+    for n in (3, 2, 1):
+        lead = " ".join(words[:n]).rstrip(":")
+        if len(words) > n and lead.isupper() and lead.lower() in _HEADING_LOOKUP:
+            return _HEADING_LOOKUP[lead.lower()], lead, " ".join(words[n:])
+    return None
+
+
+def _terms(text: str) -> List[str]:
+    return [w.strip(".") for w in _WORD_RE.findall(text.lower()) if w.strip(".") not in _STOPWORDS]
+
+
+class ResumeIndex:
+    """
+    Resume split into sections, with relevance-based selection.
+
+    Parameters
+    ----------
+    text : str
+        Resume text as extracted from the PDF
+    token_counter : callable
+        Text -> token count, used (and cached) per section
+    """
+
+    def __init__(self, text: str, token_counter: Callable[[str], int]):
+        self.text = text
+        self.token_counter = token_counter
+        self.sections = self._split(text)
+
+    @staticmethod
+    def _split(text: str) -> List[Section]:
+        sections: List[Section] = []
+        kind, title, lines = "header", "", []
+
+        def flush():
+            body = "\n".join(lines).strip()
+            if not body:
+                return
+            if kind == "experience":
+                for entry in ResumeIndex._split_entries(body):
+                    sections.append(Section(kind, title, entry, len(sections)))
+            else:
+                sections.append(Section(kind, title, body, len(sections)))
+
+        for line in text.splitlines():
+            heading = _parse_heading(line)
+            if heading:
+                flush()
+                kind, title, rest = heading
+                lines = [rest] if rest else []
+            else:
+                lines.append(line)
+        flush()
+        return sections
+
+    @staticmethod
+    def _split_entries(body: str) -> List[str]:
+        """Split an experience section into one entry per date-range line."""
+        entries, current = [], []
+        for line in body.splitlines():
+            if _DATE_RANGE_RE.search(line) and current:
+                # A short title line right above the dates belongs to the new entry
+                prev = current[-1].strip()
+                title = (0 < len(prev.split()) <= 8
+                         and not prev.startswith(("•", "-", "*")) and not prev.endswith("."))
+                if title and len(current) == 1:
+                    # Title of the first entry: nothing before it to split off
+                    current.append(line)
+                    continue
+                carry = title and len(current) > 1
+                entries.append("\n".join(current[:-1] if carry else current))
+                current = current[-1:] if carry else []
+            current.append(line)
+        entries.append("\n".join(current))
+        return [e.strip() for e in entries if e.strip()]
+
+    def total_tokens(self) -> int:
+        return sum(s.tokens(self.token_counter) for s in self.sections)
+
+    def score(self, section: Section, query_terms: List[str]) -> float:
+        """Lexical overlap with the query plus a boost for matching section kinds."""
+        if not query_terms:
+            return 0.0
+        counts = Counter(_terms(section.text))
+        overlap = sum(1.0 for t in set(query_terms) if counts.get(t))
+        hints = KIND_HINTS.get(section.kind, [])
+        boost = sum(2.0 for t in query_terms if any(t.startswith(h) for h in hints))
+        return overlap + boost
+
+    def select(self, query: str, mode: str = "", max_tokens: Optional[int] = None,
+               include_header: bool = True) -> str:
+        """
+        Resume text relevant to ``query``.
+
+        Interview mode, full-review style queries and queries that match no
+        section return the whole resume. Otherwise the best-scoring sections
+        that fit in ``max_tokens`` are added; the header (name, contact) is
+        kept unless ``include_header`` is False, and counts against the
+        budget. Sections stay in document order.
+        """
+        if "Hiring Manager" in mode or _FULL_REVIEW_RE.search(query) or len(self.sections) < 2:
+            return self.text
+
+        query_terms = _terms(query)
+        scored = [(self.score(s, query_terms), s) for s in self.sections if s.kind != "header"]
+        relevant = [(score, s) for score, s in scored if score > 0]
+        if not relevant:
+            return self.text
+
+        chosen = [s for s in self.sections if s.kind == "header"] if include_header else []
+        used = sum(s.tokens(self.token_counter) for s in chosen)
+        for score, section in sorted(relevant, key=lambda p: (-p[0], p[1].position)):
+            tokens = section.tokens(self.token_counter)
+            if max_tokens is not None and used + tokens > max_tokens:
+                continue
+            chosen.append(section)
+            used += tokens
+
+        parts = []
+        last_title = None
+        for section in sorted(chosen, key=lambda s: s.position):
+            if section.title and section.title != last_title:
+                parts.append(section.title)
+                last_title = section.title
+            parts.append(section.text)
+        return "\n".join(parts)
@@ -0,0 +1,291 @@
+"""
+Local skill-gap matching between a resume and a job description.
+
+Skills and their synonyms are compiled into an Aho-Corasick automaton, so each
+document is scanned once in linear time regardless of taxonomy size. The
+resulting matched/missing sets answer gap-style questions without an LLM call
+and are passed to the LLM as precomputed facts otherwise.
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# canonical skill -> synonyms, matched case-insensitively on word boundaries.
+# Only the synonyms are matched, so ambiguous names ("Go", "R") can be left out.
+# Synonyms written with capitals are matched case-sensitively: names that are
+# also common words ("React", "Spark") only count when written as a name.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript"],
+    "TypeScript": ["typescript"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["Swift", "swiftui"],
+    "Scala": ["scala"],
+    "R": ["r programming", "rstudio"],
+    "SQL": ["sql", "postgresql", "postgres", "mysql", "t-sql", "pl/sql"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3", "sass", "scss", "tailwind"],
+    # Frameworks and platforms
+    "React": ["React", "react.js", "reactjs", "react native"],
+    "Angular": ["angular", "angularjs"],
+    "Vue": ["vue", "vue.js", "vuejs"],
+    "Node.js": ["node.js", "nodejs", "Node"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "spring framework"],
+    ".NET": [".net", "asp.net", "dotnet"],
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["rest api", "rest apis", "restful"],
+    # Data and ML
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning", "neural networks"],
+    "NLP": ["nlp", "natural language processing"],
+    "LLMs": ["llm", "llms", "large language models", "generative ai", "genai"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Spark": ["Spark", "pyspark", "apache spark"],
+    "Data Visualization": ["data visualization", "data visualisation", "dashboards", "tableau", "power bi"],
+    "Statistics": ["statistics", "statistical analysis", "a/b testing", "ab testing", "experimentation"],
+    "ETL": ["etl", "data pipelines", "airflow", "dbt"],
+    # Infrastructure
+    "AWS": ["aws", "amazon web services"],
+    "GCP": ["gcp", "google cloud"],
+    "Azure": ["azure"],
+    "Docker": ["docker", "containers"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform", "infrastructure as code"],
+    "CI/CD": ["ci/cd", "continuous integration", "continuous delivery", "jenkins", "github actions"],
+    "Linux": ["linux", "unix"],
+    "Git": ["git", "github", "gitlab"],
+    "Microservices": ["microservices", "microservice"],
+    "Kafka": ["kafka"],
+    "Redis": ["redis"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Security": ["security", "owasp", "penetration testing"],
+    "Blockchain": ["blockchain", "web3", "ethereum", "crypto", "cryptocurrency"],
+    # Design and product
+    "Figma": ["figma"],
+    "Sketch": ["Sketch", "sketch app"],
+    "Adobe Creative Suite": ["photoshop", "illustrator", "adobe xd", "indesign", "adobe creative suite"],
+    "InVision": ["invision"],
+    "Prototyping": ["prototyping", "prototypes", "prototype", "wireframes", "wireframing", "mockups"],
+    "User Research": ["user research", "usability testing", "user interviews", "personas", "journey mapping"],
+    "Design Systems": ["design system", "design systems", "component library"],
+    "UX Design": ["ux", "user experience", "ux design", "interaction design"],
+    "UI Design": ["ui", "user interface", "ui design", "visual design"],
+    "Mobile Design": ["mobile-first", "mobile design", "responsive design"],
+    "Accessibility": ["accessibility", "wcag", "a11y"],
+    "Product Management": ["product management", "roadmap", "product strategy"],
+    # Ways of working
+    "Agile": ["agile", "scrum", "kanban"],
+    "Leadership": ["leadership", "mentor", "mentoring", "mentored", "team lead", "led a team"],
+    "Communication": ["communication skills", "written communication", "verbal communication",
+                      "presentation skills", "stakeholder management"],
+    "Project Management": ["project management", "jira", "pmp"],
+    "FinTech": ["fintech", "financial services", "banking", "payments"],
+}
+
+_OPTIONAL_RE = re.compile(r"\b(nice to have|preferred|bonus|a plus|is a plus|huge plus|desirable|optional)\b",
+                          re.IGNORECASE)
+_OPTIONAL_HEADING_RE = re.compile(r"^\s*(nice to have|preferred|bonus|desirable)", re.IGNORECASE)
+_HEADING_RE = re.compile(r"^\s*[A-Z][A-Z /&-]{2,}:?\s*$")
+_CLAUSE_RE = re.compile(r"(?<=[.!?;])\s+")
+# Gap questions need a gap word about skills/the JD, or an explicit JD comparison;
+# advice questions ("how do I address my gaps") go to the LLM.
+_GAP_WORD_RE = re.compile(r"\b(gaps?|missing|lack(ing)?|don'?t have)\b", re.IGNORECASE)
+_GAP_TARGET_RE = re.compile(r"\b(skills?|jd|job( description)?|requirements?)\b", re.IGNORECASE)
+_JD_MATCH_RE = re.compile(r"\b(match(es|ing)?|compare[sd]?|coverage)\b.*\b(jd|job description)\b",
+                          re.IGNORECASE)
+_ADVICE_RE = re.compile(r"\bhow (do|can|should|would) i\b", re.IGNORECASE)
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: builds once, then scans text in one linear pass."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        """``patterns`` are ``(pattern, label)`` pairs; patterns are lower-cased."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for pattern, label in patterns:
+            self._add(pattern.lower(), label)
+        self._build()
+
+    def _add(self, pattern: str, label: str) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), label))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """Yield ``(start, end, label)`` for whole-word matches in ``text``."""
+        lowered = text.lower()
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, label in self._out[node]:
+                start = i - length + 1
+                if _is_boundary(lowered, start - 1) and _is_boundary(lowered, i + 1):
+                    yield start, i + 1, label
+
+
+def _is_boundary(text: str, idx: int) -> bool:
+    return idx < 0 or idx >= len(text) or not (text[idx].isalnum() or text[idx] in "+#")
+
+
+@dataclass
+class SkillGapReport:
+    """Skills required by the JD, split into matched and missing, with weights."""
+    matched: Dict[str, float] = field(default_factory=dict)
+    missing: Dict[str, float] = field(default_factory=dict)
+    resume_only: List[str] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        """Weighted share of JD skills found in the resume (1.0 when the JD names none)."""
+        total = sum(self.matched.values()) + sum(self.missing.values())
+        return sum(self.matched.values()) / total if total else 1.0
+
+    def top_missing(self, n: int = 3) -> List[str]:
+        return [s for s, _ in sorted(self.missing.items(), key=lambda p: (-p[1], p[0]))[:n]]
+
+    def to_facts(self) -> str:
+        """Compact summary for the LLM prompt."""
+        matched = ", ".join(sorted(self.matched, key=lambda s: -self.matched[s])) or "none"
+        missing = ", ".join(sorted(self.missing, key=lambda s: -self.missing[s])) or "none"
+        return (f"Matched JD skills: {matched}\n"
+                f"Missing JD skills (most important first): {missing}\n"
+                f"Weighted skill coverage: {self.coverage:.0%}")
+
+    def to_markdown(self) -> str:
+        """Direct answer for gap-style questions."""
+        lines = [f"**Skill coverage:** {self.coverage:.0%} of the skills named in the job description."]
+        if self.missing:
+            lines.append("\n**Critical gaps** (most important first):")
+            lines += [f"- {s}" + (" *(nice to have)*" if w < 1 else "") for s, w in
+                      sorted(self.missing.items(), key=lambda p: (-p[1], p[0]))]
+        else:
+            lines.append("\nNo gaps found: every skill named in the job description appears in your resume.")
+        if self.matched:
+            lines.append("\n**Already covered:** " + ", ".join(sorted(self.matched, key=lambda s: -self.matched[s])))
+        return "\n".join(lines)
+
+
+class SkillMatcher:
+    """
+    Extracts taxonomy skills from text and compares resume against JD.
+
+    Parameters
+    ----------
+    taxonomy : Dict[str, List[str]], optional
+        Canonical skill -> synonyms (defaults to ``SKILL_TAXONOMY``)
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, List[str]]] = None):
+        self.taxonomy = taxonomy or SKILL_TAXONOMY
+        patterns = []
+        self._case_sensitive: Dict[str, str] = {}
+        for canonical, synonyms in self.taxonomy.items():
+            for term in synonyms:
+                patterns.append((term, canonical))
+                if term != term.lower():
+                    self._case_sensitive[term.lower()] = term
+        self._automaton = AhoCorasick(patterns)
+
+    def extract(self, text: str) -> Dict[str, int]:
+        """Occurrence count per canonical skill."""
+        counts: Dict[str, int] = {}
+        for _, _, skill in self._longest_matches(text):
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def jd_weights(self, jd_text: str) -> Dict[str, float]:
+        """
+        Weight per JD skill: 1.0 for required skills (plus 0.25 per extra
+        mention, capped at 2.0) and 0.5 for skills only named as nice-to-have.
+        """
+        required: Dict[str, int] = {}
+        optional: Dict[str, int] = {}
+        in_optional_block = False
+        for line in jd_text.splitlines():
+            if _OPTIONAL_HEADING_RE.match(line):
+                in_optional_block = True
+            elif _HEADING_RE.match(line):
+                in_optional_block = False
+            for clause in _CLAUSE_RE.split(line):
+                target = optional if in_optional_block or _OPTIONAL_RE.search(clause) else required
+                for skill, count in self.extract(clause).items():
+                    target[skill] = target.get(skill, 0) + count
+
+        weights = {s: min(2.0, 1.0 + 0.25 * (c - 1)) for s, c in required.items()}
+        for skill in optional:
+            weights.setdefault(skill, 0.5)
+        return weights
+
+    def compare(self, resume_text: str, jd_text: str) -> SkillGapReport:
+        resume_skills = self.extract(resume_text)
+        weights = self.jd_weights(jd_text)
+        return SkillGapReport(
+            matched={s: w for s, w in weights.items() if s in resume_skills},
+            missing={s: w for s, w in weights.items() if s not in resume_skills},
+            resume_only=sorted(s for s in resume_skills if s not in weights)
+        )
+
+    def _longest_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """Drop matches contained in a longer match (e.g. 'spring' inside 'spring boot')."""
+        matches = sorted(
+            (m for m in self._automaton.find(text)
+             if self._case_sensitive.get(text[m[0]:m[1]].lower(), text[m[0]:m[1]]) == text[m[0]:m[1]]),
+            key=lambda m: (m[0], -(m[1] - m[0]))
+        )
+        kept, last_end = [], -1
+        for start, end, skill in matches:
+            if start >= last_end:
+                kept.append((start, end, skill))
+                last_end = end
+        return kept
+
+
+def is_gap_question(query: str) -> bool:
+    """True for questions the skill matcher can answer on its own."""
+    if _ADVICE_RE.search(query):
+        return False
+    if _GAP_WORD_RE.search(query) and _GAP_TARGET_RE.search(query):
+        return True
+    return bool(_JD_MATCH_RE.search(query))
@@ -0,0 +1,44 @@
+"""
+Helpers for streaming Gemini answers into the chat UI with latency metrics.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+
+@dataclass
+class TurnStats:
+    """Latency of one chat turn, measured from the moment the turn started."""
+    status: str = ""
+    started_at: float = field(default_factory=time.perf_counter)
+    ttft_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+
+    def status_line(self) -> str:
+        """ScaleDown status followed by time-to-first-token and total latency."""
+        parts = [self.status] if self.status else []
+        if self.ttft_ms is not None:
+            parts.append(f"first token {self.ttft_ms:.0f} ms")
+        if self.total_ms is not None:
+            parts.append(f"total {self.total_ms / 1000:.1f} s")
+        return " · ".join(parts)
+
+
+def stream_text(chunks: Iterable[Any], stats: TurnStats) -> Iterator[str]:
+    """
+    Yield the text of each streamed response chunk, recording timings on ``stats``.
+
+    Works with any iterable of objects exposing ``.text`` (the SDK's
+    ``generate_content_stream`` result or a local fake); chunks without text
+    are skipped and do not count as the first token.
+    """
+    try:
+        for chunk in chunks:
+            text = getattr(chunk, "text", None)
+            if not text:
+                continue
+            if stats.ttft_ms is None:
+                stats.ttft_ms = (time.perf_counter() - stats.started_at) * 1000
+            yield text
+    finally:
+        stats.total_ms = (time.perf_counter() - stats.started_at) * 1000
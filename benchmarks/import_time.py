@@ -0,0 +1,118 @@
+"""
+Cold-start import benchmark based on ``python -X importtime``.
+
+Runs each target import in a fresh interpreter, parses the importtime log into
+a per-module report and exits non-zero when the median cumulative time exceeds
+``--max-ms`` (or a forbidden heavy module gets imported), so it can guard
+start-up time for CLI and worker processes.
+
+Usage
+-----
+    python -m benchmarks.import_time scaledown --max-ms 50 --forbid requests tiktoken numpy
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse the stderr produced by ``-X importtime`` into records."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def subtree(records: List[ImportRecord], module: str) -> List[ImportRecord]:
+    """
+    Records imported because of ``module``.
+
+    importtime logs children before their parent, so the subtree is the run of
+    deeper-nested records directly preceding the module's own line.
+    """
+    for idx in range(len(records) - 1, -1, -1):
+        if records[idx].module == module:
+            root = records[idx]
+            start = idx
+            while start > 0 and records[start - 1].depth > root.depth:
+                start -= 1
+            return records[start:idx + 1]
+    return []
+
+
+def measure(statement: str) -> List[ImportRecord]:
+    """Execute ``statement`` in a fresh interpreter and return its import records."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{proc.stderr}")
+    return parse_importtime(proc.stderr)
+
+
+def report(target: str, runs: int, top: int, forbid: List[str]):
+    statement = f"import {target}"
+    totals = []
+    records: List[ImportRecord] = []
+    for _ in range(runs):
+        # Only count what the target pulls in, not interpreter start-up (site, .pth hooks)
+        records = subtree(measure(statement), target)
+        totals.append(records[-1].cumulative_us / 1000 if records else 0.0)
+
+    median_ms = statistics.median(totals)
+    print(f"{statement}: median {median_ms:.1f} ms over {runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f})")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for rec in sorted(records, key=lambda r: -r.cumulative_us)[:top]:
+        print(f"{rec.cumulative_us / 1000:>14.1f} {rec.self_us / 1000:>9.1f}  {'  ' * rec.depth}{rec.module}")
+
+    loaded = {r.module.split(".")[0] for r in records}
+    leaked = sorted(set(forbid) & loaded)
+    return median_ms, leaked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=["scaledown"],
+                        help="Modules to import (default: scaledown)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Modules to list per target")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Fail when the median cumulative import time exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=[],
+                        help="Top-level modules that must not be imported eagerly")
+    args = parser.parse_args()
+
+    failed = False
+    for target in args.targets:
+        median_ms, leaked = report(target, args.runs, args.top, args.forbid)
+        if args.max_ms is not None and median_ms > args.max_ms:
+            print(f"FAIL: import {target} took {median_ms:.1f} ms (limit {args.max_ms} ms)")
+            failed = True
+        if leaked:
+            print(f"FAIL: import {target} eagerly loaded {', '.join(leaked)}")
+            failed = True
+        print()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
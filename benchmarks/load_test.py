@@ -0,0 +1,357 @@
+"""
+Concurrent-session load test for app.py with local Gemini and ScaleDown stubs.
+
+Each simulated session runs in its own thread (as Streamlit runs one script
+thread per session) with its own ``st.session_state``. It ingests a resume and
+a job description, then sends chat turns through ``stream_ai_response``.
+Gemini is replaced by an in-process stub client and ScaleDown by
+``StubScaleDownServer``, both with configurable latency, and the stubs are
+installed through the resource registry. Nothing leaves the machine.
+
+For every concurrency level the tool reports turn latency percentiles,
+throughput, CPU use and traced memory growth per session. It also reports
+memory still held once the sessions are gone, which shows leaks in
+process-wide caches. Memory is traced in a second, untimed pass per level:
+tracemalloc slows every allocation and would distort the latencies. The
+saturation point is the first level whose throughput gain falls below
+``--saturation-gain``.
+
+By default the app's context budget is lowered below the size of the sample
+inputs, so every ingestion goes through ScaleDown compression.
+
+Usage
+-----
+    python -m benchmarks.load_test --sessions 1,5,10,25 --turns 5 --gemini-ms 300,1200
+"""
+import argparse
+import gc
+import io
+import os
+import random
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.stub_server import StubScaleDownServer
+
+QUESTIONS = [
+    "Can you review my resume against this job?",
+    "What are my biggest strengths for this role?",
+    "Which skills am I missing?",
+    "How should I rewrite my summary section?",
+    "Am I a good fit for this position?",
+    "What achievements should I quantify better?",
+    "How do I explain my career gap?",
+    "Which projects should I highlight in the interview?",
+]
+MODES = ["Career Coach (Analysis)", "Hiring Manager (Mock Interview)"]
+
+
+# ============================================================================
+# STUBS
+# ============================================================================
+
+@dataclass
+class _Chunk:
+    text: str
+
+
+class StubGeminiClient:
+    """
+    Stand-in for ``genai.Client`` exposing ``models.generate_content`` and
+    ``models.generate_content_stream``.
+
+    Parameters
+    ----------
+    latency_ms : Tuple[float, float]
+        Uniform range of total response time
+    ttft_fraction : float
+        Share of the response time spent before the first streamed chunk
+    chunks : int
+        Streamed chunks per answer
+    """
+
+    def __init__(self, latency_ms: Tuple[float, float] = (300.0, 1200.0), ttft_fraction: float = 0.4,
+                 chunks: int = 8, answer_words: int = 200):
+        self.latency_ms = latency_ms
+        self.ttft_fraction = ttft_fraction
+        self.chunks = chunks
+        self.answer_words = answer_words
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.models = self
+
+    def _answer(self, contents) -> List[str]:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        words = [f"word{(call + i) % 97}" for i in range(self.answer_words)]
+        size = max(1, len(words) // self.chunks)
+        return [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)]
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(random.uniform(*self.latency_ms) / 1000)
+        return _Chunk("".join(self._answer(contents)))
+
+    def generate_content_stream(self, model, contents, config=None):
+        total = random.uniform(*self.latency_ms) / 1000
+        pieces = self._answer(contents)
+        time.sleep(total * self.ttft_fraction)
+        per_chunk = total * (1 - self.ttft_fraction) / max(1, len(pieces) - 1)
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(per_chunk)
+            yield _Chunk(piece)
+
+    def close(self):
+        pass
+
+
+class _ThreadSessionState:
+    """Routes ``st.session_state`` to the calling thread's session dict."""
+
+    def __init__(self):
+        object.__setattr__(self, "_local", threading.local())
+
+    def bind(self, state: dict) -> None:
+        self._local.state = state
+
+    @property
+    def _state(self) -> dict:
+        return self._local.state
+
+    def __getattr__(self, name):
+        try:
+            return self._state[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self._state[name] = value
+
+    def __contains__(self, name):
+        return name in self._state
+
+    def __getitem__(self, name):
+        return self._state[name]
+
+    def __setitem__(self, name, value):
+        self._state[name] = value
+
+    def get(self, name, default=None):
+        return self._state.get(name, default)
+
+
+def install_stubs(gemini: StubGeminiClient, scaledown_url: str, context_budget: Optional[int] = None):
+    """Point the app at the stubs; returns the imported app module and the session router."""
+    os.environ["SCALEDOWN_API_URL"] = scaledown_url
+    import streamlit as st
+    import app
+    from assistant.context_cache import InMemoryContextCache
+    from assistant.resources import get_registry, GEMINI, CONTEXT_CACHE
+
+    if context_budget:
+        app.CONTEXT_TOKEN_BUDGET = context_budget
+    registry = get_registry()
+    registry.register(GEMINI, lambda key: gemini)
+    registry.register(CONTEXT_CACHE, lambda key: InMemoryContextCache())
+
+    router = _ThreadSessionState()
+    st.session_state = router
+    st.secrets = {"GEMINI_API_KEY": "stub-gemini", "SCALEDOWN_API_KEY": "stub-scaledown"}
+    return app, router
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+@dataclass
+class LevelReport:
+    sessions: int
+    turns: int = 0
+    errors: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+    ttft_ms: List[float] = field(default_factory=list)
+    ingest_ms: List[float] = field(default_factory=list)
+    peak_kib_per_session: float = 0.0
+    retained_kib: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.turns / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def cpu_percent(self) -> float:
+        return 100 * self.cpu_s / self.wall_s if self.wall_s else 0.0
+
+    @staticmethod
+    def percentile(values: List[float], p: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def run_session(app, router, session_id: int, resume_bytes: bytes, jd_text: str, turns: int,
+                mode: str, think_ms: float, report: LevelReport, lock: threading.Lock):
+    from assistant.streaming import TurnStats
+
+    state: Dict = {}
+    router.bind(state)
+    app.init_session_state()
+    state["resume_uploaded"] = True
+
+    start = time.perf_counter()
+    resume = io.BytesIO(resume_bytes)
+    app.start_ingestion(resume, jd_text).result()
+    ingest_ms = (time.perf_counter() - start) * 1000
+
+    latencies, ttfts, errors = [], [], 0
+    for turn in range(turns):
+        question = QUESTIONS[(session_id + turn) % len(QUESTIONS)]
+        state["messages"].append({"role": "user", "content": question})
+        stats = TurnStats()
+        answer = "".join(app.stream_ai_response(question, io.BytesIO(resume_bytes), jd_text, mode, stats))
+        latencies.append((time.perf_counter() - stats.started_at) * 1000)
+        if stats.ttft_ms is not None:
+            ttfts.append(stats.ttft_ms)
+        if answer.startswith(("Error", "Gemini Error")):
+            errors += 1
+        state["messages"].append({"role": "assistant", "content": answer})
+        if think_ms:
+            time.sleep(think_ms / 1000)
+
+    with lock:
+        report.turns += turns
+        report.errors += errors
+        report.latencies_ms.extend(latencies)
+        report.ttft_ms.extend(ttfts)
+        report.ingest_ms.append(ingest_ms)
+
+
+def run_level(app, router, sessions: int, resume_bytes: bytes, jd_text: str, turns: int, mode: str,
+              think_ms: float, distinct_inputs: bool, trace_memory: bool = False) -> LevelReport:
+    """
+    Run ``sessions`` concurrent sessions. With ``trace_memory`` the memory
+    fields are filled in, but the timings are distorted by tracemalloc.
+    """
+    report = LevelReport(sessions)
+    lock = threading.Lock()
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+    threads = []
+    for i in range(sessions):
+        # Distinct JDs make every session ingest on its own, as separate users would
+        jd = f"{jd_text}\n\nPosting reference: {i}-{time.monotonic_ns()}" if distinct_inputs else jd_text
+        threads.append(threading.Thread(
+            target=run_session, name=f"session-{i}",
+            args=(app, router, i, resume_bytes, jd, turns, mode, think_ms, report, lock)
+        ))
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report.wall_s = time.perf_counter() - wall_start
+    report.cpu_s = time.process_time() - cpu_start
+    if not trace_memory:
+        return report
+
+    _, peak = tracemalloc.get_traced_memory()
+    threads.clear()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report.peak_kib_per_session = (peak - baseline) / 1024 / sessions
+    report.retained_kib = (retained - baseline) / 1024
+    return report
+
+
+def find_saturation(reports: List[LevelReport], min_gain: float) -> Optional[int]:
+    """First session count whose throughput is less than ``min_gain`` above the previous level."""
+    for previous, current in zip(reports, reports[1:]):
+        if previous.throughput and current.throughput < previous.throughput * (1 + min_gain):
+            return current.sessions
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10,25", help="Comma-separated concurrency levels")
+    parser.add_argument("--turns", type=int, default=5, help="Chat turns per session")
+    parser.add_argument("--mode", choices=["coach", "interview"], default="coach")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause between a session's turns")
+    parser.add_argument("--gemini-ms", default="300,1200", help="Uniform Gemini latency range")
+    parser.add_argument("--scaledown-ms", default="100,400", help="Uniform ScaleDown latency range")
+    parser.add_argument("--resume", default="samples/Ux-designer-resume-example.pdf")
+    parser.add_argument("--jd", default="samples/Job_Description.txt")
+    parser.add_argument("--shared-inputs", action="store_true",
+                        help="All sessions use the same resume/JD (shares ingestion and answer cache)")
+    parser.add_argument("--context-budget", type=int, default=400,
+                        help="Resume + JD token budget; the default is below the sample inputs so "
+                             "ingestion exercises ScaleDown (0 keeps the app's budget)")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the memory-tracing pass")
+    parser.add_argument("--saturation-gain", type=float, default=0.1)
+    args = parser.parse_args()
+
+    levels = [int(n) for n in args.sessions.split(",")]
+    gemini_range = tuple(float(v) for v in args.gemini_ms.split(","))
+    scaledown_range = tuple(float(v) for v in args.scaledown_ms.split(","))
+    with open(args.resume, "rb") as f:
+        resume_bytes = f.read()
+    with open(args.jd, encoding="utf-8") as f:
+        jd_text = f.read()
+    mode = MODES[0] if args.mode == "coach" else MODES[1]
+
+    gemini = StubGeminiClient(latency_ms=gemini_range)
+    with StubScaleDownServer(latency_ms=scaledown_range) as server:
+        app, router = install_stubs(gemini, server.url, args.context_budget)
+        # One throwaway session loads lazy imports and process-wide caches first
+        run_level(app, router, 1, resume_bytes, jd_text, 1, mode, 0.0, distinct_inputs=True)
+        reports = []
+        for sessions in levels:
+            report = run_level(app, router, sessions, resume_bytes, jd_text, args.turns, mode,
+                               args.think_ms, distinct_inputs=not args.shared_inputs)
+            if not args.skip_memory:
+                memory = run_level(app, router, sessions, resume_bytes, jd_text, args.turns, mode,
+                                   args.think_ms, distinct_inputs=not args.shared_inputs, trace_memory=True)
+                report.peak_kib_per_session = memory.peak_kib_per_session
+                report.retained_kib = memory.retained_kib
+            reports.append(report)
+        scaledown_calls = len(server.requests)
+        gemini_calls = gemini.calls
+
+    print(f"{'sessions':>8} {'turns':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'ttft p50':>8} {'ingest p95':>10} {'turns/s':>8} {'cpu %':>6} {'KiB/sess':>9} {'retained':>9}")
+    for r in reports:
+        print(f"{r.sessions:>8} {r.turns:>6} {r.errors:>4} {r.percentile(r.latencies_ms, 50):>8.0f} "
+              f"{r.percentile(r.latencies_ms, 95):>8.0f} {r.percentile(r.latencies_ms, 99):>8.0f} "
+              f"{r.percentile(r.ttft_ms, 50):>8.0f} {r.percentile(r.ingest_ms, 95):>10.0f} "
+              f"{r.throughput:>8.2f} {r.cpu_percent:>6.0f} {r.peak_kib_per_session:>9.0f} "
+              f"{r.retained_kib:>9.0f}")
+    print(f"Gemini stub calls: {gemini_calls}, ScaleDown stub calls: {scaledown_calls} "
+          f"(including warm-up{'' if args.skip_memory else ' and memory passes'})")
+    if not scaledown_calls:
+        print("ScaleDown was not exercised: the inputs fit the context budget. "
+              "Lower --context-budget to include compression.")
+
+    saturation = find_saturation(reports, args.saturation_gain)
+    if saturation is None:
+        print("No saturation within the tested levels.")
+    else:
+        print(f"Throughput stops scaling at about {saturation} concurrent sessions "
+              f"(< {args.saturation_gain:.0%} gain over the previous level).")
+
+
+if __name__ == "__main__":
+    main()
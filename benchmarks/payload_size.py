@@ -0,0 +1,62 @@
+"""
+Compare bytes on the wire and request latency for ScaleDownCompressor
+request-body encodings against the local stub server.
+
+Usage
+-----
+    python -m benchmarks.payload_size --context samples/Job_Description.txt --repeat 20
+"""
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.stub_server import StubScaleDownServer
+
+
+def run(context: str, repeat: int, encodings):
+    from scaledown.compressor import ScaleDownCompressor
+
+    rows = []
+    for encoding in encodings:
+        with StubScaleDownServer() as server:
+            os.environ["SCALEDOWN_API_URL"] = server.url
+            compressor = ScaleDownCompressor(
+                api_key="stub", content_encoding=encoding, encoding_threshold=0
+            )
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                compressor.compress(context=context, prompt="Extract key requirements.")
+                timings.append((time.perf_counter() - start) * 1000)
+            recorded = server.requests
+            rows.append({
+                "encoding": encoding or "identity",
+                "wire_bytes": statistics.mean(r.wire_bytes for r in recorded),
+                "decoded_bytes": statistics.mean(r.decoded_bytes for r in recorded),
+                "p50_ms": statistics.median(timings),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--context", default="samples/Job_Description.txt",
+                        help="File whose text is used as the compression context")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--multiply", type=int, default=1,
+                        help="Repeat the context N times to simulate larger inputs")
+    args = parser.parse_args()
+
+    with open(args.context, encoding="utf-8") as f:
+        context = "\n\n".join([f.read()] * args.multiply)
+
+    rows = run(context, args.repeat, [None, "gzip", "deflate"])
+    print(f"{'encoding':<10} {'wire bytes':>12} {'decoded bytes':>14} {'p50 ms':>8}")
+    for row in rows:
+        print(f"{row['encoding']:<10} {row['wire_bytes']:>12.0f} "
+              f"{row['decoded_bytes']:>14.0f} {row['p50_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
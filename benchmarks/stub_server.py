@@ -0,0 +1,110 @@
+"""
+Local stand-in for the ScaleDown ``/compress/raw`` endpoint.
+
+Records the size of every request body as received on the wire and after
+decoding, so client-side payload changes can be measured without the hosted API.
+"""
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class RecordedRequest:
+    wire_bytes: int
+    decoded_bytes: int
+    content_encoding: Optional[str]
+    payload: dict
+
+
+@dataclass
+class StubScaleDownServer:
+    """
+    Threaded HTTP server that answers like ``/compress/raw``.
+
+    Parameters
+    ----------
+    latency_ms : Tuple[float, float]
+        Uniform range of artificial server latency per request
+    keep_ratio : float
+        Fraction of the context words kept in the "compressed" answer
+    """
+    latency_ms: Tuple[float, float] = (0.0, 0.0)
+    keep_ratio: float = 0.5
+    requests: List[RecordedRequest] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubScaleDownServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                encoding = self.headers.get("Content-Encoding")
+                if encoding == "gzip":
+                    body = gzip.decompress(raw)
+                elif encoding == "deflate":
+                    body = zlib.decompress(raw)
+                else:
+                    body = raw
+                payload = json.loads(body)
+                with stub._lock:
+                    stub.requests.append(RecordedRequest(len(raw), len(body), encoding, payload))
+
+                delay = random.uniform(*stub.latency_ms)
+                time.sleep(delay / 1000)
+
+                words = payload.get("context", "").split()
+                kept = words[:max(1, int(len(words) * stub.keep_ratio))]
+                answer = json.dumps({
+                    "results": {
+                        "compressed_prompt": " ".join(kept),
+                        "original_prompt_tokens": len(words),
+                        "compressed_prompt_tokens": len(kept),
+                    },
+                    "latency_ms": delay,
+                    "model_used": payload.get("model"),
+                }).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    answer = gzip.compress(answer)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(answer)))
+                self.end_headers()
+                self.wfile.write(answer)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -1,42 +1,73 @@
 import os
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 # Configuration
 from scaledown.config import set_api_key, get_api_key
 
-# Core Components
-from scaledown.pipeline import Pipeline, make_pipeline
-# HasteOptimizer is optional, import from scaledown.optimizer if needed
-from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
-
-# Types & Exceptions
-from scaledown.types import (
-    CompressedPrompt,
-    OptimizedContext,
-    PipelineResult,
-    StepMetadata
-)
-
 from scaledown.exceptions import (
     ScaleDownError,
     AuthenticationError,
     APIError
 )
 
+# Core components and types are resolved on first attribute access so that
+# `import scaledown` does not pull in `requests` or the pipeline machinery.
+# HasteOptimizer is optional, import from scaledown.optimizer if needed
+_LAZY_ATTRS = {
+    "Pipeline": "scaledown.pipeline",
+    "make_pipeline": "scaledown.pipeline",
+    "GraphPipeline": "scaledown.graph",
+    "GraphStep": "scaledown.graph",
+    "StepRouter": "scaledown.routing",
+    "RoutingObjective": "scaledown.routing",
+    "ScaleDownCompressor": "scaledown.compressor.scaledown_compressor",
+    "CompressedPrompt": "scaledown.types",
+    "CompressedBatch": "scaledown.types",
+    "OptimizedContext": "scaledown.types",
+    "PipelineResult": "scaledown.types",
+    "StepMetadata": "scaledown.types",
+}
+
 # Initialize global state if env var exists
 _API_KEY: Optional[str] = os.environ.get("SCALEDOWN_API_KEY")
 
 __all__ = [
     "Pipeline",
     "make_pipeline",
+    "GraphPipeline",
+    "GraphStep",
+    "StepRouter",
+    "RoutingObjective",
     "ScaleDownCompressor",
     "set_api_key",
     "get_api_key",
     "PipelineResult",
     "StepMetadata",
     "CompressedPrompt",
+    "CompressedBatch",
     "OptimizedContext",
     "ScaleDownError",
     "AuthenticationError",
     "APIError"
 ]
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if TYPE_CHECKING:
+    from scaledown.pipeline import Pipeline, make_pipeline
+    from scaledown.graph import GraphPipeline, GraphStep
+    from scaledown.routing import StepRouter, RoutingObjective
+    from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
+    from scaledown.types import (
+        CompressedPrompt,
+        CompressedBatch,
+        OptimizedContext,
+        PipelineResult,
+        StepMetadata
+    )
@@ -1,3 +1,14 @@
-from .scaledown_compressor import ScaleDownCompressor
+from typing import TYPE_CHECKING
 
 __all__ = ["ScaleDownCompressor"]
+
+def __getattr__(name):
+    # Deferred so that importing the package does not load `requests`
+    if name == "ScaleDownCompressor":
+        from .scaledown_compressor import ScaleDownCompressor
+        return ScaleDownCompressor
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if TYPE_CHECKING:
+    from .scaledown_compressor import ScaleDownCompressor
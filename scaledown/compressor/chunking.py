@@ -0,0 +1,140 @@
+import re
+from typing import List, Optional, Tuple
+
+from ..types.metrics import count_tokens
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+# The capture group keeps the whitespace between sentences
+_SENTENCE_RE = re.compile(r"(?<=[.!?])(\s+)")
+
+
+def split_into_chunks(text: str, chunk_tokens: int, model: str = "gpt-4o") -> List[str]:
+    """
+    Split text into chunks of at most ``chunk_tokens`` tokens.
+
+    See ``split_with_separators``; this returns the chunk texts only.
+    """
+    return [chunk for chunk, _ in split_with_separators(text, chunk_tokens, model=model)]
+
+
+def split_with_separators(text: str, chunk_tokens: int, model: str = "gpt-4o") -> List[Tuple[str, str]]:
+    """
+    Split text into chunks of at most ``chunk_tokens`` tokens.
+
+    Paragraph boundaries are preferred. Paragraphs that are too large on their
+    own are split on sentence boundaries, and sentences that are still too large
+    are split on whitespace as a last resort.
+
+    Parameters
+    ----------
+    text : str
+        Text to split
+    chunk_tokens : int
+        Token budget per chunk
+    model : str
+        Model used for token counting
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        ``(chunk, separator)`` pairs in original order, where ``separator`` is
+        the text that followed the chunk (``"\n\n"`` at a paragraph break,
+        the original whitespace inside a split paragraph, ``""`` after the
+        last chunk), so
+        ``join_chunks`` restores the original layout
+    """
+    if chunk_tokens <= 0:
+        raise ValueError("chunk_tokens must be a positive integer")
+
+    pieces = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph, model=model)
+        if tokens <= chunk_tokens:
+            pieces.append((paragraph, tokens, "\n\n"))
+            continue
+        parts = _SENTENCE_RE.split(paragraph)
+        for sentence, gap in zip(parts[::2], parts[1::2] + [" "]):
+            for part in _split_oversized(sentence, chunk_tokens, model):
+                pieces.append((part, count_tokens(part, model=model), " "))
+            last_text, last_tokens, _ = pieces[-1]
+            pieces[-1] = (last_text, last_tokens, gap)
+        # Keep the paragraph break after the last sentence
+        last_text, last_tokens, _ = pieces[-1]
+        pieces[-1] = (last_text, last_tokens, "\n\n")
+
+    # Greedily pack pieces into chunks
+    chunks: List[Tuple[str, str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    separator: Optional[str] = None
+    for piece, tokens, sep in pieces:
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(("".join(current).strip(), separator))
+            current, current_tokens = [], 0
+        if current and separator:
+            current.append(separator)
+        current.append(piece)
+        current_tokens += tokens
+        separator = sep
+    if current:
+        chunks.append(("".join(current).strip(), ""))
+    return chunks
+
+
+def join_chunks(chunks: List[str], separators: List[str]) -> str:
+    """Rejoin (compressed) chunks with the separators from ``split_with_separators``."""
+    return "".join(chunk + sep for chunk, sep in zip(chunks[:-1], separators)) + (chunks[-1] if chunks else "")
+
+
+def _split_oversized(sentence: str, chunk_tokens: int, model: str) -> List[str]:
+    """Split a single sentence on whitespace when it exceeds the chunk budget."""
+    if count_tokens(sentence, model=model) <= chunk_tokens:
+        return [sentence]
+
+    parts, current = [], []
+    for word in sentence.split():
+        candidate = " ".join(current + [word])
+        if current and count_tokens(candidate, model=model) > chunk_tokens:
+            parts.append(" ".join(current))
+            current = [word]
+        else:
+            current.append(word)
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+
+def allocate_budget(chunk_sizes: List[int], max_tokens: Optional[int]) -> List[Optional[int]]:
+    """
+    Split an overall ``max_tokens`` budget across chunks proportionally to size.
+
+    The budgets always sum to exactly ``max_tokens``. Every chunk receives at
+    least one token when the budget allows it; when there are more chunks than
+    tokens, the smallest chunks receive 0. Returns ``None`` for every chunk
+    when no overall budget was given.
+    """
+    n = len(chunk_sizes)
+    if max_tokens is None:
+        return [None] * n
+    if n == 0:
+        return []
+
+    weights = chunk_sizes if sum(chunk_sizes) > 0 else [1] * n
+    total = sum(weights)
+    budgets = [(max_tokens * w) // total for w in weights]
+    # Largest remainders first (ties go to the larger chunk)
+    remainder = max_tokens - sum(budgets)
+    order = sorted(range(n), key=lambda i: (-((max_tokens * weights[i]) % total), -weights[i]))
+    for idx in order[:remainder]:
+        budgets[idx] += 1
+
+    if max_tokens >= n:
+        for idx in range(n):
+            if budgets[idx] == 0:
+                donor = max(range(n), key=lambda i: budgets[i])
+                budgets[donor] -= 1
+                budgets[idx] = 1
+    return budgets
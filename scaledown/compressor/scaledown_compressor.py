@@ -1,29 +1,83 @@
-import requests
-from typing import Union, List, Optional
+import gzip
+import json
+import threading
+import time
+import zlib
+from typing import Any, Dict, Union, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
 from .base import BaseCompressor
+from .chunking import split_with_separators, join_chunks, allocate_budget
 from ..exceptions import AuthenticationError, APIError
-from ..types import CompressedPrompt
+from ..types import CompressedPrompt, CompressedBatch
+from ..types.metrics import count_tokens
+from ..monitoring import track, record_tokens
 from .config import get_api_url
 
 class ScaleDownCompressor(BaseCompressor):
     """
     Standard ScaleDown compressor using the hosted model on API.
+
+    Set ``chunk_tokens`` to enable chunking mode: contexts larger than that many
+    tokens are split on paragraph/sentence boundaries, the chunks are compressed
+    concurrently (up to ``max_workers`` at a time) and reassembled in order.
+
+    Set ``content_encoding`` to ``'gzip'`` or ``'deflate'`` to compress request
+    bodies of at least ``encoding_threshold`` bytes before upload.
     """
     def __init__(self, target_model='gpt-4o', rate='auto', api_key=None, 
-                 temperature=None, preserve_keywords=False, preserve_words=None):
+                 temperature=None, preserve_keywords=False, preserve_words=None,
+                 chunk_tokens=None, max_workers=5, content_encoding=None,
+                 encoding_threshold=8192):
         super().__init__(rate=rate, api_key=api_key)
         self.api_url = get_api_url()
         self.target_model = target_model
         self.temperature = temperature
         self.preserve_keywords = preserve_keywords
         self.preserve_words = preserve_words or []
+        self.chunk_tokens = chunk_tokens
+        self.max_workers = max_workers
+        if content_encoding not in (None, "gzip", "deflate"):
+            raise ValueError(f"Unsupported content_encoding: {content_encoding!r}. Use 'gzip' or 'deflate'.")
+        self.content_encoding = content_encoding
+        self.encoding_threshold = encoding_threshold
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        """Shared HTTP session so repeated calls reuse pooled connections."""
+        import requests
+
+        with self._session_lock:
+            if self._session is None:
+                self._session = requests.Session()
+            return self._session
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        """Whether the API host answers (any HTTP status) over the pooled connection."""
+        import requests
+
+        try:
+            self._get_session().head(self.api_url, timeout=timeout)
+            return True
+        except requests.exceptions.RequestException:
+            return False
+
+    def close(self):
+        """Close pooled HTTP connections. The compressor stays usable afterwards."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     def compress(self, context: Union[str, List[str]], prompt: Union[str, List[str]], 
-                 max_tokens: int = None, **kwargs) -> Union[CompressedPrompt, List[CompressedPrompt]]:
+                 max_tokens: int = None, as_batch: bool = False,
+                 **kwargs) -> Union[CompressedPrompt, List[CompressedPrompt], CompressedBatch]:
         """
         Compress context using ScaleDown's hosted API.
+
+        List inputs return a list of ``CompressedPrompt``, or a columnar
+        ``CompressedBatch`` when ``as_batch=True``.
         """
         if isinstance(context, str) and isinstance(prompt, str):
             return self._compress_single(context, prompt, max_tokens=max_tokens, **kwargs)
@@ -31,53 +85,141 @@ class ScaleDownCompressor(BaseCompressor):
         elif isinstance(context, list) and isinstance(prompt, list):
             if len(context) != len(prompt):
                 raise ValueError("Context list and prompt list must have the same length.")
-            return self._compress_batch(context, prompt, max_tokens=max_tokens, **kwargs)
+            return self._compress_batch(context, prompt, as_batch=as_batch, max_tokens=max_tokens, **kwargs)
             
         elif isinstance(context, list) and isinstance(prompt, str):
             # Broadcast prompt to all contexts
-            return self._compress_batch(context, [prompt] * len(context), max_tokens=max_tokens, **kwargs)
+            return self._compress_batch(context, [prompt] * len(context), as_batch=as_batch,
+                                        max_tokens=max_tokens, **kwargs)
         
         else:
             raise ValueError("Invalid combination of context and prompt types.")
 
-    def _compress_batch(self, context_list, prompt_list, **kwargs):
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            results = list(executor.map(
-                lambda p: self._compress_single(p[0], p[1], **kwargs), 
+    def _compress_batch(self, context_list, prompt_list, as_batch=False, **kwargs):
+        if not as_batch:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(
+                    lambda p: self._compress_single(p[0], p[1], **kwargs),
+                    zip(context_list, prompt_list)
+                ))
+
+        # Results go straight into the batch columns, one CompressedPrompt fewer per item
+        batch = CompressedBatch()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for fields in executor.map(
+                lambda p: self._compress_fields(p[0], p[1], **kwargs),
                 zip(context_list, prompt_list)
-            ))
-        return results
+            ):
+                batch.add(*fields)
+        return batch
 
     def _compress_single(self, context, prompt, max_tokens=None, **kwargs) -> CompressedPrompt:
+        with track("scaledown_compressor", self.target_model):
+            if self._needs_chunking(context):
+                result = self._compress_chunked(context, prompt, max_tokens=max_tokens, **kwargs)
+            else:
+                result = self._request_compression(context, prompt, max_tokens=max_tokens, **kwargs)
+        record_tokens("scaledown_compressor", self.target_model, *result.tokens)
+        return result
+
+    def _compress_fields(self, context, prompt, max_tokens=None, **kwargs) -> Tuple[str, int, int, float, str]:
+        """
+        ``(content, original_tokens, compressed_tokens, latency, model)`` of one
+        compression, for ``CompressedBatch.add``. Chunked contexts go through
+        ``_compress_single``, which already aggregates their chunks.
+        """
+        if self._needs_chunking(context):
+            result = self._compress_single(context, prompt, max_tokens=max_tokens, **kwargs)
+            return (result.content, *result.tokens, result.latency, result.model)
+        with track("scaledown_compressor", self.target_model):
+            content, metrics = self._post_compression(context, prompt, max_tokens=max_tokens, **kwargs)
+        original, compressed = metrics["original_prompt_tokens"], metrics["compressed_prompt_tokens"]
+        record_tokens("scaledown_compressor", self.target_model, original, compressed)
+        return content, original, compressed, metrics["latency_ms"], metrics.get("model_used", "unknown")
+
+    def _needs_chunking(self, context) -> bool:
+        return bool(self.chunk_tokens) and count_tokens(context, model=self.target_model) > self.chunk_tokens
+
+    def _compress_chunked(self, context, prompt, max_tokens=None, **kwargs) -> CompressedPrompt:
+        """
+        Compress a long context as concurrent chunk requests.
+
+        The overall ``max_tokens`` budget is split across chunks in proportion
+        to their size; ``rate`` applies to every chunk unchanged. Chunks whose
+        share of a very small budget is 0 tokens are dropped rather than sent.
+        Compressed chunks are rejoined with the separators they had in the
+        source. The reported latency is the wall-clock time of the whole fan-out.
+        """
+        pairs = split_with_separators(context, self.chunk_tokens, model=self.target_model)
+        sizes = [count_tokens(chunk, model=self.target_model) for chunk, _ in pairs]
+        budgets = allocate_budget(sizes, max_tokens)
+        sent = [(chunk, sep, budget) for (chunk, sep), budget in zip(pairs, budgets) if budget != 0]
+        dropped_tokens = sum(size for size, budget in zip(sizes, budgets) if budget == 0)
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda p: self._request_compression(p[0], prompt, max_tokens=p[2], **kwargs),
+                sent
+            ))
+        latency_ms = (time.time() - start_time) * 1000
+
+        return CompressedPrompt(
+            content=join_chunks([r.content for r in results], [sep for _, sep, _ in sent]),
+            original_prompt="",
+            tokens=(
+                sum(r.tokens[0] for r in results) + dropped_tokens,
+                sum(r.tokens[1] for r in results)
+            ),
+            latency=latency_ms,
+            model=results[0].model if results else "unknown"
+        )
+
+    def _request_compression(self, context, prompt, max_tokens=None, **kwargs) -> CompressedPrompt:
+        content, metrics = self._post_compression(context, prompt, max_tokens=max_tokens, **kwargs)
+        return CompressedPrompt.from_api_response(content=content, raw_response=metrics)
+
+    def _post_compression(self, context, prompt, max_tokens=None, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """One API call; returns the compressed text and the metrics ``from_api_response`` reads."""
+        import requests
+
         if not self.api_key:
             raise AuthenticationError("API key not found. Use scaledown.set_api_key() or pass api_key to constructor.")
 
         headers = {
             'x-api-key': self.api_key,
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
         }
 
         #Payload structure that matches documentation (nested 'scaledown' object)
+        options = {
+            "rate": self.rate,
+            "temperature": self.temperature,
+            "preserve_keywords": self.preserve_keywords,
+            "preserve_words": self.preserve_words,
+            "max_tokens": max_tokens,
+            **kwargs
+        }
         payload = {
             "context": context,
             "prompt": prompt,
             "model": self.target_model,
-            "scaledown": {
-                "rate": self.rate,
-                "temperature": self.temperature,
-                "preserve_keywords": self.preserve_keywords,
-                "preserve_words": self.preserve_words,
-                "max_tokens": max_tokens,
-                **kwargs
-            }
+            # Unset options are left to server defaults instead of sent as null
+            "scaledown": {k: v for k, v in options.items() if v is not None}
         }
 
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        if self.content_encoding and len(body) >= self.encoding_threshold:
+            body = _encode_body(body, self.content_encoding)
+            headers['Content-Encoding'] = self.content_encoding
+
         try:
             full_url=f"{self.api_url}/compress/raw"
-            response = requests.post(
+            response = self._get_session().post(
                  full_url,
                  headers=headers,
-                 json=payload
+                 data=body
             )
             response.raise_for_status()
             data = response.json()
@@ -88,19 +230,25 @@ class ScaleDownCompressor(BaseCompressor):
             # 1. Get content from 'results'
             content = results.get("compressed_prompt", "")
             
-            # 2. Map API keys to our internal Metrics names
+            # 2. Map only the API keys CompressedPrompt.from_api_response reads
             prepared_metrics = {
                 "original_prompt_tokens": data.get("total_original_tokens", results.get("original_prompt_tokens", 0)),
                 "compressed_prompt_tokens": data.get("total_compressed_tokens", results.get("compressed_prompt_tokens", 0)),
                 "latency_ms": data.get("latency_ms", 0),
-                "model_used": data.get("model_used"),
-                "timestamp": data.get("request_metadata", {}).get("timestamp")
             }
+            if data.get("model_used"):
+                prepared_metrics["model_used"] = data["model_used"]
             
-            return CompressedPrompt.from_api_response(
-                content=content, 
-                raw_response=prepared_metrics 
-            )
+            return content, prepared_metrics
 
         except requests.exceptions.RequestException as e:
             raise APIError(f"Connection failed: {str(e)}")
+
+
+def _encode_body(body: bytes, encoding: str) -> bytes:
+    """Encode a request body for the given Content-Encoding."""
+    if encoding == "gzip":
+        return gzip.compress(body)
+    if encoding == "deflate":
+        return zlib.compress(body)
+    raise ValueError(f"Unsupported content_encoding: {encoding!r}. Use 'gzip' or 'deflate'.")
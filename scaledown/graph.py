@@ -0,0 +1,237 @@
+import time
+from concurrent.futures import Executor, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from scaledown.compressor.base import BaseCompressor
+from scaledown.exceptions import PipelineError
+from scaledown.optimizer.base import BaseOptimizer
+from scaledown.pipeline import run_step
+from scaledown.types import PipelineResult, StepMetadata
+from scaledown.types.metrics import count_tokens
+from scaledown.monitoring import track
+
+
+@dataclass
+class GraphStep:
+    """
+    One node of a ``GraphPipeline``.
+
+    Parameters
+    ----------
+    name : str
+        Unique step name; other steps refer to its output by this name
+    component : BaseOptimizer, BaseCompressor or callable
+        Optimizers and compressors take exactly one input. Callables receive
+        one positional argument per input (merge steps take several) and may
+        return any value.
+    inputs : Sequence[str]
+        Names of run inputs or of other steps, in argument order
+    params : Dict[str, Any]
+        Keyword arguments for this step only, merged over the run kwargs
+    """
+    name: str
+    component: Union[BaseOptimizer, BaseCompressor, Callable[..., Any]]
+    inputs: Sequence[str] = ("input",)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+class GraphPipeline:
+    """
+    Pipeline whose steps form a directed acyclic graph.
+
+    Each step declares its inputs; steps whose inputs are ready run
+    concurrently on an executor, so end-to-end latency is that of the longest
+    branch rather than the sum of all steps. The result's ``history`` lists
+    steps in completion order and ``critical_path`` the chain of steps that
+    determined the total latency.
+
+    Example
+    -------
+    >>> from scaledown.graph import GraphPipeline, GraphStep
+    >>> pipe = GraphPipeline([
+    ...     GraphStep("resume", ScaleDownCompressor(), inputs=["resume"]),
+    ...     GraphStep("jd", ScaleDownCompressor(), inputs=["jd"]),
+    ...     GraphStep("prompt", lambda r, j: f"{j}\\n\\n{r}", inputs=["resume", "jd"]),
+    ... ])
+    >>> result = pipe.run({"resume": resume_text, "jd": jd_text}, prompt="Keep skills")
+
+    Parameters
+    ----------
+    steps : List[GraphStep]
+        Steps in any order
+    output : str, optional
+        Step whose value is the final content; defaults to the only sink
+    max_workers : int, default=4
+        Threads of the default executor
+    token_counter : Callable[[str], int], optional
+        Counts tokens of custom step inputs/outputs (defaults to ``count_tokens``)
+    """
+
+    def __init__(self, steps: List[GraphStep], output: Optional[str] = None, max_workers: int = 4,
+                 token_counter: Optional[Callable[[str], int]] = None):
+        self.steps = {step.name: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError("GraphPipeline step names must be unique")
+        self.max_workers = max_workers
+        self.token_counter = token_counter or count_tokens
+        self.output = output or self._single_sink()
+        self._order = self._validate_steps()
+
+    def _single_sink(self) -> str:
+        if not self.steps:
+            raise ValueError("Pipeline must have at least one step")
+        consumed = {name for step in self.steps.values() for name in step.inputs}
+        sinks = [name for name in self.steps if name not in consumed]
+        if len(sinks) != 1:
+            raise ValueError(f"GraphPipeline needs exactly one output step, found {sinks}; pass output=")
+        return sinks[0]
+
+    def _validate_steps(self) -> List[str]:
+        """Check the graph and return the steps in topological order."""
+        if self.output not in self.steps:
+            raise ValueError(f"Output step '{self.output}' not found in pipeline")
+        for step in self.steps.values():
+            if isinstance(step.component, (BaseOptimizer, BaseCompressor)) and len(step.inputs) != 1:
+                raise ValueError(f"Step '{step.name}' wraps an optimizer/compressor and must have one input")
+            if step.name in step.inputs:
+                raise ValueError(f"Step '{step.name}' cannot consume its own output")
+
+        order, state = [], {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "active":
+                raise ValueError(f"GraphPipeline has a cycle: {' -> '.join(path + [name])}")
+            state[name] = "active"
+            for dep in self.steps[name].inputs:
+                if dep in self.steps:
+                    visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        visit(self.output, [])
+        unused = set(self.steps) - set(order)
+        if unused:
+            raise ValueError(f"Steps {sorted(unused)} do not feed the output step '{self.output}'")
+
+        # Same rule as Pipeline, along every edge: optimizers never consume compressed text
+        for name in order:
+            step = self.steps[name]
+            if isinstance(step.component, BaseOptimizer):
+                for dep in step.inputs:
+                    if dep in self.steps and isinstance(self.steps[dep].component, BaseCompressor):
+                        raise ValueError(
+                            f"Optimizer '{name}' cannot come after a compressor. "
+                            "Pipeline order must be: optimizers -> compressors"
+                        )
+        return order
+
+    @property
+    def sources(self) -> List[str]:
+        """Run inputs the graph expects."""
+        return sorted({dep for step in self.steps.values() for dep in step.inputs if dep not in self.steps})
+
+    def run(self, inputs: Union[str, Dict[str, Any]], executor: Optional[Executor] = None,
+            **kwargs) -> PipelineResult:
+        """
+        Execute the graph.
+
+        ``inputs`` maps source names to values (a plain string is the single
+        source ``"input"``). ``kwargs`` are passed to every step, as in
+        ``Pipeline.run``. Pass ``executor`` to run on an existing thread pool
+        instead of a private one. Process pools are not supported: steps are
+        submitted as bound methods holding arbitrary callables (often lambdas),
+        which cannot be pickled.
+        """
+        if isinstance(executor, ProcessPoolExecutor):
+            raise ValueError("GraphPipeline steps run in threads; pass a thread-based executor")
+        values: Dict[str, Any] = {"input": inputs} if isinstance(inputs, str) else dict(inputs)
+        missing = [name for name in self.sources if name not in values]
+        if missing:
+            raise ValueError(f"Missing pipeline inputs: {missing}")
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scaledown-graph")
+        start = time.perf_counter()
+        timings: Dict[str, tuple] = {}
+        history: List[StepMetadata] = []
+        pending = {}
+        remaining = list(self._order)
+        try:
+            while remaining or pending:
+                for name in [n for n in remaining if all(d in values for d in self.steps[n].inputs)]:
+                    remaining.remove(name)
+                    args = [values[d] for d in self.steps[name].inputs]
+                    pending[executor.submit(self._execute, self.steps[name], args, start, kwargs)] = name
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        value, metadata, began, ended = future.result()
+                    except Exception as e:
+                        error = PipelineError(f"Step '{name}' failed: {e}")
+                        error.step = name
+                        raise error from e
+                    values[name] = value
+                    timings[name] = (began, ended)
+                    history.append(metadata)
+        finally:
+            for future in pending:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        critical_path = self._critical_path(timings)
+        source_tokens = sum(self.token_counter(values[s]) for s in self.sources if isinstance(values[s], str))
+        return PipelineResult(
+            final_content=values[self.output],
+            original_content="\n\n".join(values[s] for s in self.sources if isinstance(values[s], str)),
+            history=history,
+            critical_path=critical_path,
+            wall_time_ms=(time.perf_counter() - start) * 1000,
+            source_tokens=source_tokens
+        )
+
+    def _execute(self, step: GraphStep, args: List[Any], start: float, kwargs: Dict[str, Any]):
+        began = (time.perf_counter() - start) * 1000
+        params = {**kwargs, **step.params}
+        if isinstance(step.component, (BaseOptimizer, BaseCompressor)):
+            value, metadata = run_step(step.name, step.component, args[0], **params)
+        else:
+            with track(f"pipeline.{step.name}"):
+                value = step.component(*args, **params)
+            metadata = StepMetadata(
+                step_name=step.name,
+                input_tokens=sum(self.token_counter(a) for a in args if isinstance(a, str)),
+                output_tokens=self.token_counter(value) if isinstance(value, str) else 0,
+                latency_ms=0.0,
+                details={"type": "custom", "component": getattr(step.component, "__name__",
+                                                                 step.component.__class__.__name__)}
+            )
+        ended = (time.perf_counter() - start) * 1000
+        if not metadata.latency_ms:
+            metadata.latency_ms = ended - began
+        metadata.details.update(inputs=list(step.inputs), start_ms=began, end_ms=ended)
+        return value, metadata, began, ended
+
+    def _critical_path(self, timings: Dict[str, tuple]) -> List[str]:
+        """Walk back from the output through the input step that finished last."""
+        path, name = [], self.output
+        while name is not None:
+            path.append(name)
+            deps = [d for d in self.steps[name].inputs if d in self.steps]
+            name = max(deps, key=lambda d: timings[d][1]) if deps else None
+        return path[::-1]
+
+    def get_step(self, name: str) -> Union[BaseOptimizer, BaseCompressor, Callable[..., Any]]:
+        """Get a step's component by name."""
+        if name not in self.steps:
+            raise KeyError(f"Step '{name}' not found in pipeline")
+        return self.steps[name].component
+
+    def __repr__(self) -> str:
+        edges = [f"{dep}->{name}" for name in self._order for dep in self.steps[name].inputs]
+        return f"GraphPipeline(steps={self._order}, edges={edges})"
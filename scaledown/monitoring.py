@@ -0,0 +1,369 @@
+"""
+Process-wide runtime metrics with Prometheus text and JSON export.
+
+Counters and histograms are written to per-thread cells, so the hot path is an
+unsynchronised list update by the owning thread; cells are only summed when a
+snapshot is taken. Cells of finished threads are folded into a retired total,
+which keeps memory bounded under thread-per-request servers such as Streamlit.
+
+Example
+-------
+>>> from scaledown.monitoring import track, record_tokens, get_metrics_registry
+>>> with track("scaledown_compressor", model="gpt-4o"):
+...     result = compressor.compress(context, prompt)
+>>> record_tokens("scaledown_compressor", "gpt-4o", *result.tokens)
+>>> print(get_metrics_registry().to_prometheus())
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Milliseconds: local steps take ~1 ms, API calls hundreds of ms to seconds
+DEFAULT_LATENCY_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+RATIO_BUCKETS = (1, 1.25, 1.5, 2, 3, 4, 6, 8, 12, 16)
+
+_COMPACT_AFTER = 64
+
+
+class _Cells:
+    """Per-thread accumulators of ``size`` floats, summed on read."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+
+    def cell(self) -> List[float]:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = [0.0] * self.size
+            with self._lock:
+                if len(self._live) >= _COMPACT_AFTER:
+                    self._compact()
+                self._live.append((threading.current_thread(), cell))
+            self._local.cell = cell
+        return cell
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            totals = list(self._retired)
+            for _, cell in self._live:
+                for i, value in enumerate(cell):
+                    totals[i] += value
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self._retired = [0.0] * self.size
+            for _, cell in self._live:
+                cell[:] = [0.0] * self.size
+
+    def _compact(self) -> None:
+        alive = []
+        for thread, cell in self._live:
+            if thread.is_alive():
+                alive.append((thread, cell))
+            else:
+                for i, value in enumerate(cell):
+                    self._retired[i] += value
+        self._live = alive
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "_cells")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # One slot per bucket, one for +Inf, then sum and count
+        self._cells = _Cells(len(self.bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect_left(self.bounds, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        totals = self._cells.totals()
+        cumulative, buckets = 0.0, {}
+        for bound, count in zip(list(self.bounds) + ["+Inf"], totals[:-2]):
+            cumulative += count
+            buckets[str(bound)] = int(cumulative)
+        return {"buckets": buckets, "sum": totals[-2], "count": int(totals[-1])}
+
+
+class _GaugeChild:
+    """Gauges change rarely (in-flight calls, sizes), so a lock is cheap enough."""
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Metric:
+    """A named metric family; ``labels(...)`` returns the series for one label set."""
+
+    def __init__(self, kind: str, name: str, help: str, labelnames: Sequence[str],
+                 buckets: Optional[Sequence[float]] = None):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if buckets else DEFAULT_LATENCY_BUCKETS
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **kwargs: str):
+        key = tuple(str(v) for v in values) if values else tuple(str(kwargs.get(n, "")) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _new_child(self):
+        if self.kind == "counter":
+            return _CounterChild()
+        if self.kind == "histogram":
+            return _HistogramChild(self.buckets)
+        return _GaugeChild()
+
+    def series(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), child) for key, child in items]
+
+
+class MetricsRegistry:
+    """Get-or-create store of metric families with snapshot exporters."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Metric:
+        return self._get("counter", name, help, labelnames)
+
+    def histogram(self, name: str, help: str = "", labelnames: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Metric:
+        return self._get("histogram", name, help, labelnames, buckets)
+
+    def gauge(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Metric:
+        return self._get("gauge", name, help, labelnames)
+
+    def _get(self, kind, name, help, labelnames, buckets=None) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = Metric(kind, name, help, labelnames, buckets)
+                    self._metrics[name] = metric
+        if metric.kind != kind:
+            raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}")
+        return metric
+
+    def reset(self) -> None:
+        """Zero every series (tests and benchmarks)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            for _, child in metric.series():
+                if isinstance(child, _GaugeChild):
+                    child.set(0.0)
+                else:
+                    child._cells.reset()
+
+    def to_json(self) -> Dict[str, Any]:
+        """Snapshot as plain data, suitable for ``json.dumps``."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        snapshot = {}
+        for metric in metrics:
+            series = []
+            for labels, child in metric.series():
+                if metric.kind == "histogram":
+                    series.append({"labels": labels, **child.snapshot()})
+                else:
+                    series.append({"labels": labels, "value": child.value})
+            snapshot[metric.name] = {"type": metric.kind, "help": metric.help, "series": series}
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Snapshot in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, data in self.to_json().items():
+            lines.append(f"# HELP {name} {_escape_help(data['help'])}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            for series in data["series"]:
+                labels = series["labels"]
+                if data["type"] == "histogram":
+                    for bound, count in series["buckets"].items():
+                        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(series['value'])}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{k}="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+               for k, v in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """The process-wide registry used by scaledown components and the app."""
+    return _registry
+
+
+# ============================================================================
+# STANDARD METRICS
+# ============================================================================
+
+def _calls(registry: MetricsRegistry) -> Metric:
+    return registry.counter("scaledown_calls_total", "Calls per component, model and outcome",
+                            ["component", "model", "status"])
+
+
+def _latency(registry: MetricsRegistry) -> Metric:
+    return registry.histogram("scaledown_call_latency_ms", "Wall-clock call latency in milliseconds",
+                              ["component", "model"])
+
+
+def _errors(registry: MetricsRegistry) -> Metric:
+    return registry.counter("scaledown_errors_total", "Errors per component and exception type",
+                            ["component", "error"])
+
+
+def _inflight(registry: MetricsRegistry) -> Metric:
+    return registry.gauge("scaledown_inflight_calls", "Calls currently running per component", ["component"])
+
+
+@contextmanager
+def track(component: str, model: str = "", registry: Optional[MetricsRegistry] = None) -> Iterator[None]:
+    """Count a call, its outcome, its wall latency and in-flight concurrency."""
+    registry = registry or _registry
+    inflight = _inflight(registry).labels(component)
+    inflight.inc()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception as e:
+        status = "error"
+        _errors(registry).labels(component, type(e).__name__).inc()
+        raise
+    finally:
+        inflight.dec()
+        _latency(registry).labels(component, model).observe((time.perf_counter() - start) * 1000)
+        _calls(registry).labels(component, model, status).inc()
+
+
+def record_tokens(component: str, model: str, tokens_in: int, tokens_out: int,
+                  registry: Optional[MetricsRegistry] = None) -> None:
+    """Token throughput and compression ratio of one call."""
+    registry = registry or _registry
+    tokens = registry.counter("scaledown_tokens_total", "Tokens processed per component, model and direction",
+                              ["component", "model", "direction"])
+    tokens.labels(component, model, "in").inc(tokens_in)
+    tokens.labels(component, model, "out").inc(tokens_out)
+    if tokens_in and tokens_out:
+        registry.histogram("scaledown_compression_ratio", "Input/output token ratio per call",
+                           ["component", "model"], buckets=RATIO_BUCKETS
+                           ).labels(component, model).observe(tokens_in / tokens_out)
+
+
+def record_error(component: str, error: BaseException, registry: Optional[MetricsRegistry] = None) -> None:
+    """Count an error that was handled (logged and recovered from) by the caller."""
+    _errors(registry or _registry).labels(component, type(error).__name__).inc()
+
+
+def record_cache(cache: str, hit: bool, registry: Optional[MetricsRegistry] = None) -> None:
+    (registry or _registry).counter("scaledown_cache_lookups_total", "Cache lookups per cache and result",
+                                    ["cache", "result"]).labels(cache, "hit" if hit else "miss").inc()
+
+
+def start_http_server(port: int, addr: str = "0.0.0.0", registry: Optional[MetricsRegistry] = None):
+    """
+    Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` from a daemon
+    thread. Returns the server; call ``shutdown()`` to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or _registry
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, content_type = json.dumps(registry.to_json()).encode("utf-8"), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, content_type = registry.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, name="scaledown-metrics", daemon=True).start()
+    return server
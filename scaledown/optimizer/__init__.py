@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 from .base import BaseOptimizer
 
 # Define what to expose
-__all__ = ["BaseOptimizer", "HasteOptimizer", "SemanticOptimizer"]
+__all__ = ["BaseOptimizer", "HasteOptimizer", "SemanticOptimizer", "BoilerplateOptimizer"]
 
 def __getattr__(name):
     if name == "HasteOptimizer":
@@ -24,8 +24,13 @@ def __getattr__(name):
                 "SemanticOptimizer requires 'semantic'. Install with `pip install scaledown[semantic]`"
             ) from e
             
+    if name == "BoilerplateOptimizer":
+        from .boilerplate import BoilerplateOptimizer
+        return BoilerplateOptimizer
+
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if TYPE_CHECKING:
     from .haste import HasteOptimizer
     from .semantic_code import SemanticOptimizer
+    from .boilerplate import BoilerplateOptimizer
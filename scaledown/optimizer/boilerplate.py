@@ -0,0 +1,289 @@
+"""
+Local boilerplate and near-duplicate removal for job descriptions and similar
+free-text documents. Runs before compression so that repeated bullets and
+template paragraphs are never sent to the API.
+"""
+import re
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .base import BaseOptimizer
+from ..types import OptimizedContext, OptimizerMetrics
+from ..types.metrics import count_tokens
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+_BULLET_RE = re.compile(r"^\s*([-*•·▪●◦]|\d+[.)])\s+")
+
+# Frequent template paragraphs in job postings
+DEFAULT_TEMPLATES = [
+    "We are an equal opportunity employer and value diversity at our company. We do not discriminate "
+    "on the basis of race, religion, color, national origin, gender, sexual orientation, age, marital "
+    "status, veteran status, or disability status.",
+    "All qualified applicants will receive consideration for employment without regard to race, color, "
+    "religion, sex, sexual orientation, gender identity, national origin, disability, or protected "
+    "veteran status.",
+    "We are committed to providing reasonable accommodations to qualified individuals with disabilities "
+    "in the application process. If you need assistance or an accommodation, please contact us.",
+    "We offer a competitive salary, comprehensive health, dental and vision insurance, a 401(k) plan "
+    "with company match, generous paid time off, and paid parental leave.",
+    "Benefits include medical, dental, and vision coverage, flexible working hours, remote work options, "
+    "professional development budget, wellness programs, and team events.",
+    "This job description is not intended to be an exhaustive list of all duties, responsibilities, or "
+    "qualifications associated with the job. Duties may change at any time with or without notice.",
+    "Applicants must be authorized to work in the country without sponsorship. Employment is contingent "
+    "upon successful completion of a background check.",
+    "Join our team and help us build the future. We are a fast-growing company with a passion for "
+    "innovation and a culture of collaboration, inclusion, and continuous learning.",
+    "To apply, please submit your resume and cover letter. Only shortlisted candidates will be contacted.",
+]
+
+
+class _MinHasher:
+    """MinHash signatures over word shingles with a fixed, seeded permutation family."""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Deterministic LCG so signatures are stable across processes and runs
+        state = seed
+        self._perms: List[Tuple[int, int]] = []
+        for _ in range(num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = state % _MERSENNE_PRIME or 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            self._perms.append((a, state % _MERSENNE_PRIME))
+
+    def shingles(self, text: str) -> Set[int]:
+        words = _WORD_RE.findall(text.lower())
+        n = self.shingle_size if len(words) >= self.shingle_size else 1
+        return {zlib.crc32(" ".join(words[i:i + n]).encode("utf-8"))
+                for i in range(len(words) - n + 1)}
+
+    def signature(self, shingles: Set[int]) -> Tuple[int, ...]:
+        if not shingles:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+            for a, b in self._perms
+        )
+
+
+class _LSHIndex:
+    """Banded LSH index over MinHash signatures."""
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self.signatures: List[Tuple[int, ...]] = []
+
+    def add(self, signature: Tuple[int, ...]) -> int:
+        idx = len(self.signatures)
+        self.signatures.append(signature)
+        for band in range(self.bands):
+            self._buckets[band][signature[band * self.rows:(band + 1) * self.rows]].append(idx)
+        return idx
+
+    def best_match(self, signature: Tuple[int, ...]) -> Tuple[Optional[int], float]:
+        """Most similar indexed signature among LSH candidates, with its estimated Jaccard."""
+        candidates: Set[int] = set()
+        for band in range(self.bands):
+            candidates.update(self._buckets[band].get(signature[band * self.rows:(band + 1) * self.rows], ()))
+        best, best_sim = None, 0.0
+        for idx in candidates:
+            other = self.signatures[idx]
+            sim = sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+            if sim > best_sim:
+                best, best_sim = idx, sim
+        return best, best_sim
+
+
+class BoilerplateOptimizer(BaseOptimizer):
+    """
+    Removes near-duplicate sentences/bullets and template boilerplate paragraphs.
+
+    Text is split into paragraphs, and paragraphs into units (bullet lines or
+    sentences). Paragraphs and units whose MinHash similarity to a known
+    template exceeds ``boilerplate_threshold`` are dropped, as are units that
+    near-duplicate an earlier unit of the same document. No network calls are
+    made.
+
+    Parameters
+    ----------
+    shingle_size : int, default=3
+        Words per shingle
+    num_perm : int, default=32
+        MinHash permutations (signature length)
+    bands : int, default=16
+        LSH bands; ``num_perm`` must be divisible by it
+    duplicate_threshold : float, default=0.7
+        Estimated Jaccard similarity above which a unit is a near-duplicate
+    boilerplate_threshold : float, default=0.5
+        Estimated Jaccard similarity above which text matches a template
+    templates : List[str], optional
+        Boilerplate corpus (defaults to common job-posting templates)
+    min_words : int, default=4
+        Units shorter than this are never dropped (headings, short labels); a
+        paragraph is only dropped for being short once units were removed from it
+    """
+
+    def __init__(
+        self,
+        shingle_size: int = 3,
+        num_perm: int = 32,
+        bands: int = 16,
+        duplicate_threshold: float = 0.7,
+        boilerplate_threshold: float = 0.5,
+        templates: Optional[Sequence[str]] = None,
+        min_words: int = 4,
+        target_model: str = "gpt-4o",
+        **kwargs
+    ):
+        super().__init__(target_model=target_model, **kwargs)
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.duplicate_threshold = duplicate_threshold
+        self.boilerplate_threshold = boilerplate_threshold
+        self.min_words = min_words
+        self.bands = bands
+        self._hasher = _MinHasher(num_perm, shingle_size)
+        self._templates = _LSHIndex(bands, num_perm // bands)
+        self.templates: List[str] = []
+        self.add_templates(DEFAULT_TEMPLATES if templates is None else templates)
+
+    def add_templates(self, templates: Iterable[str]) -> None:
+        """Add boilerplate paragraphs (and their sentences) to the template corpus."""
+        for template in templates:
+            self.templates.append(template)
+            for text in [template] + _SENTENCE_RE.split(template):
+                self._templates.add(self._signature(text))
+
+    def fit(self, documents: Sequence[str], min_df: int = 3) -> "BoilerplateOptimizer":
+        """
+        Learn templates from a corpus: paragraphs that near-duplicate each other
+        in at least ``min_df`` different documents are added to the corpus.
+        """
+        index = _LSHIndex(self.bands, self._hasher.num_perm // self.bands)
+        cluster_docs: Dict[int, Set[int]] = {}
+        representatives: Dict[int, str] = {}
+        for doc_id, document in enumerate(documents):
+            for paragraph in _paragraphs(document):
+                if len(paragraph.split()) < self.min_words:
+                    continue
+                signature = self._signature(paragraph)
+                match, sim = index.best_match(signature)
+                if match is not None and sim >= self.duplicate_threshold:
+                    cluster_docs[match].add(doc_id)
+                else:
+                    idx = index.add(signature)
+                    cluster_docs[idx] = {doc_id}
+                    representatives[idx] = paragraph
+
+        self.add_templates(
+            representatives[idx] for idx, docs in cluster_docs.items() if len(docs) >= min_df
+        )
+        return self
+
+    def optimize(
+        self,
+        context: Union[str, List[str]],
+        query: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Union[OptimizedContext, List[OptimizedContext]]:
+        """
+        Strip boilerplate and near-duplicates from ``context``.
+
+        ``query`` and ``max_tokens`` are accepted for pipeline compatibility
+        and ignored: this optimizer only removes redundant text.
+        """
+        if isinstance(context, list):
+            return [self.optimize(c, query=query, max_tokens=max_tokens, **kwargs) for c in context]
+
+        start_time = time.time()
+        seen = _LSHIndex(self.bands, self._hasher.num_perm // self.bands)
+        kept_paragraphs = []
+        kept_units = 0
+
+        for paragraph in _paragraphs(context):
+            if self._is_boilerplate(paragraph):
+                continue
+            kept_lines = []
+            removed = 0
+            for units in _line_units(paragraph):
+                kept = []
+                for unit in units:
+                    if len(unit.split()) < self.min_words:
+                        kept.append(unit)
+                        continue
+                    signature = self._signature(unit)
+                    if (self._matches(self._templates, signature, self.boilerplate_threshold)
+                            or self._matches(seen, signature, self.duplicate_threshold)):
+                        removed += 1
+                        continue
+                    seen.add(signature)
+                    kept.append(unit)
+                    kept_units += 1
+                if kept:
+                    kept_lines.append(" ".join(kept))
+            # A paragraph that lost units and kept only short lines is a dangling
+            # heading ("Benefits:"); short lines of untouched paragraphs stay
+            if not kept_lines:
+                continue
+            if removed and not any(len(line.split()) >= self.min_words for line in kept_lines):
+                continue
+            kept_paragraphs.append("\n".join(kept_lines))
+
+        content = "\n\n".join(kept_paragraphs)
+        original_tokens = count_tokens(context, model=self.target_model)
+        optimized_tokens = count_tokens(content, model=self.target_model)
+
+        return OptimizedContext(
+            content=content,
+            metrics=OptimizerMetrics(
+                original_tokens=original_tokens,
+                optimized_tokens=optimized_tokens,
+                chunks_retrieved=kept_units,
+                compression_ratio=original_tokens / max(optimized_tokens, 1),
+                latency_ms=(time.time() - start_time) * 1000,
+                retrieval_mode="boilerplate_minhash",
+                ast_fidelity=1.0
+            )
+        )
+
+    def _signature(self, text: str) -> Tuple[int, ...]:
+        return self._hasher.signature(self._hasher.shingles(text))
+
+    def _is_boilerplate(self, paragraph: str) -> bool:
+        if len(paragraph.split()) < self.min_words:
+            return False
+        return self._matches(self._templates, self._signature(paragraph), self.boilerplate_threshold)
+
+    @staticmethod
+    def _matches(index: _LSHIndex, signature: Tuple[int, ...], threshold: float) -> bool:
+        _, sim = index.best_match(signature)
+        return sim >= threshold
+
+
+def _paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in _PARAGRAPH_RE.split(text) if p.strip()]
+
+
+def _line_units(paragraph: str) -> List[List[str]]:
+    """Units per line: bullet lines stay whole, other lines are split into sentences."""
+    lines = []
+    for line in paragraph.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _BULLET_RE.match(line):
+            lines.append([line])
+        else:
+            lines.append([s for s in _SENTENCE_RE.split(line) if s])
+    return lines
@@ -2,7 +2,15 @@
 HASTE optimizer integration for scaledown.
 Uses the local HasteContext library for code context retrieval.
 """
-from typing import Union, List, Optional, Dict, Any
+from typing import Union, List, Optional, Dict, Any, Iterable, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import atexit
+import hashlib
+import multiprocessing
+import multiprocessing.util
+import re
+import threading
 import time
 import os
 import tempfile
@@ -18,6 +26,165 @@ from ..exceptions import OptimizerError
 from ..types import OptimizedContext, OptimizerMetrics
 from ..types.metrics import count_tokens
 
+_TERM_RE = re.compile(r"[A-Za-z][a-z0-9]*|[0-9]+")
+
+
+@dataclass
+class HasteSelection:
+    """Context selected from one file for one query."""
+    source: str
+    query: str
+    content: str = ""
+    original_tokens: int = 0
+    optimized_tokens: int = 0
+    chunks_retrieved: int = 0
+    latency_ms: float = 0.0
+    score: float = 0.0
+    included: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class HasteQueryResult:
+    """
+    Merged selections of one query across all files.
+
+    ``latency_ms`` is the time from the start of the batch until the last
+    selection of this query finished.
+    """
+    query: str
+    budget: int
+    selections: List[HasteSelection] = field(default_factory=list)
+    latency_ms: float = 0.0
+
+    @property
+    def included(self) -> List[HasteSelection]:
+        return [s for s in self.selections if s.included]
+
+    @property
+    def content(self) -> str:
+        return "\n\n".join(f"# {s.source}\n{s.content}" for s in self.included)
+
+    @property
+    def original_tokens(self) -> int:
+        return sum(s.original_tokens for s in self.selections)
+
+    @property
+    def optimized_tokens(self) -> int:
+        return sum(s.optimized_tokens for s in self.included)
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        return {s.source: s.error for s in self.selections if s.error}
+
+
+def _terms(text: str) -> set:
+    """Lower-cased identifier parts (snake_case and camelCase are split)."""
+    return {t.lower() for t in _TERM_RE.findall(text)}
+
+
+# Per-worker cache of (path, text, tokens), keyed by path and mtime, or by
+# content hash for code strings (each written once to a temp file that lives
+# as long as its cache entry)
+_FILE_CACHE: Dict[Tuple, Tuple[str, str, int]] = {}
+_FILE_CACHE_SIZE = 256
+_cleanup_registered = False
+
+
+def _unlink(path: str) -> None:
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def _remove_temp_files() -> None:
+    for key, (path, _, _) in list(_FILE_CACHE.items()):
+        if key[0] == "code":
+            _unlink(path)
+
+
+def _load_source(source: str, is_path: bool, target_model: str) -> Tuple[str, str, int]:
+    if is_path:
+        st = os.stat(source)
+        key = ("path", source, st.st_mtime_ns, st.st_size)
+    else:
+        key = ("code", hashlib.sha1(source.encode("utf-8")).hexdigest())
+    cached = _FILE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    if is_path:
+        with open(source, 'r', encoding='utf-8') as f:
+            text = f.read()
+        path = source
+    else:
+        global _cleanup_registered
+        text = source
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
+            f.write(text)
+            path = f.name
+        if not _cleanup_registered:
+            # Pool workers skip atexit; multiprocessing finalizers still run on exit
+            multiprocessing.util.Finalize(None, _remove_temp_files, exitpriority=10)
+            _cleanup_registered = True
+
+    if len(_FILE_CACHE) >= _FILE_CACHE_SIZE:
+        evicted = next(iter(_FILE_CACHE))
+        evicted_path, _, _ = _FILE_CACHE.pop(evicted)
+        if evicted[0] == "code":
+            _unlink(evicted_path)
+    _FILE_CACHE[key] = entry = (path, text, count_tokens(text, model=target_model))
+    return entry
+
+
+def _select_worker(source: str, is_path: bool, label: str, queries: List[str],
+                   params: Dict[str, Any], target_model: str) -> List[HasteSelection]:
+    """Worker entry point: run each query against one file."""
+    try:
+        path, _, original_tokens = _load_source(source, is_path, target_model)
+    except Exception as e:
+        return [HasteSelection(label, q, error=f"{type(e).__name__}: {e}") for q in queries]
+
+    out = []
+    for query in queries:
+        start = time.perf_counter()
+        try:
+            result = select_from_file(path=path, query=query, **params)
+        except Exception as e:
+            out.append(HasteSelection(label, query, original_tokens=original_tokens,
+                                      error=f"{type(e).__name__}: {e}"))
+            continue
+        content = result.get('code', '')
+        query_terms = _terms(query)
+        out.append(HasteSelection(
+            source=label,
+            query=query,
+            content=content,
+            original_tokens=original_tokens,
+            optimized_tokens=count_tokens(content, model=target_model),
+            chunks_retrieved=len(result.get('nodes', [])),
+            latency_ms=(time.perf_counter() - start) * 1000,
+            # Share of the query's terms found in the selection
+            score=len(query_terms & _terms(content)) / len(query_terms) if query_terms else 0.0,
+        ))
+    return out
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """One long-lived pool per worker count."""
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # Workers outlive a batch so their file caches stay warm
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                         mp_context=multiprocessing.get_context(method))
+            atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+        return pool
+
 
 class HasteOptimizer(BaseOptimizer):
     """
@@ -75,6 +242,102 @@ class HasteOptimizer(BaseOptimizer):
         self.hard_cap = hard_cap
         self.soft_cap = soft_cap
     
+    def _select_params(self, max_tokens: Optional[int]) -> Dict[str, Any]:
+        return dict(
+            top_k=self.top_k,
+            prefilter=self.prefilter,
+            bfs_depth=self.bfs_depth,
+            max_add=self.max_add,
+            semantic=self.semantic,
+            sem_model=self.sem_model,
+            hard_cap=max_tokens or self.hard_cap,
+            soft_cap=self.soft_cap,
+        )
+
+    def optimize_batch(
+        self,
+        files: Iterable[str],
+        queries: Union[str, Iterable[str]],
+        max_tokens: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, HasteQueryResult]:
+        """
+        Run every query against every file on a process pool.
+
+        Each file goes to one worker together with its queries (split into
+        chunks when there are fewer files than workers), so it is read and
+        token-counted once per worker and stays cached for later batches.
+        The selections of each query are then merged under one token budget:
+        best query-term coverage first, smaller selections first on ties,
+        and a selection is only included while it still fits together with
+        its ``# <source>`` header.
+
+        Parameters
+        ----------
+        files : Iterable[str]
+            File paths, or code strings (anything that is not an existing file)
+        queries : str or Iterable[str]
+            Queries to run against every file
+        max_tokens : int, optional
+            Global token budget per query (uses hard_cap if not specified)
+        max_workers : int, optional
+            Worker processes (defaults to the CPU count); 1 runs in-process
+
+        Returns
+        -------
+        Dict[str, HasteQueryResult]
+            Merged result per query, in query order
+        """
+        start = time.perf_counter()
+        files = list(files)
+        queries = [queries] if isinstance(queries, str) else list(dict.fromkeys(queries))
+        if not queries or not all(queries):
+            raise ValueError("Query is required for HASTE optimization")
+
+        budget = max_tokens or self.hard_cap
+        params = self._select_params(budget)
+        results = {q: HasteQueryResult(query=q, budget=budget) for q in queries}
+        workers = max_workers or os.cpu_count() or 1
+
+        per_task = max(1, -(-len(queries) * len(files) // workers))
+        tasks, order, headers = [], {}, {}
+        for i, source in enumerate(files):
+            is_path = os.path.isfile(source)
+            label = source if is_path else f"<context {i}>"
+            order[label] = i
+            # The "# <source>" header (and separator) of a merged selection counts against the budget
+            headers[label] = count_tokens(f"# {label}\n\n", model=self.target_model)
+            file_params = {**params, "hard_cap": max(budget - headers[label], 1)}
+            for first in range(0, len(queries), per_task):
+                tasks.append((source, is_path, label, queries[first:first + per_task],
+                              file_params, self.target_model))
+
+        def collect(selections: List[HasteSelection]):
+            for selection in selections:
+                result = results[selection.query]
+                result.selections.append(selection)
+                result.latency_ms = (time.perf_counter() - start) * 1000
+
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                collect(_select_worker(*task))
+        else:
+            pool = _get_pool(workers)
+            for future in as_completed([pool.submit(_select_worker, *task) for task in tasks]):
+                collect(future.result())
+
+        for result in results.values():
+            result.selections.sort(key=lambda s: order[s.source])
+            used = 0
+            for selection in sorted(result.selections, key=lambda s: (-s.score, s.optimized_tokens)):
+                if selection.error or not selection.content:
+                    continue
+                cost = selection.optimized_tokens + headers[selection.source]
+                if used + cost <= budget:
+                    selection.included = True
+                    used += cost
+        return results
+
     def optimize(
         self,
         context: Union[str, List[str]],
@@ -82,18 +345,21 @@ class HasteOptimizer(BaseOptimizer):
         max_tokens: Optional[int] = None,
         file_path: Optional[str] = None,
         **kwargs
-    ) -> Union[OptimizedContext, List[OptimizedContext]]:
+    ) -> OptimizedContext:
         """
         Optimize code context using local HASTE library.
         
         Parameters
         ----------
         context : str or List[str]
-            Source code content (currently expects file path in file_path param)
+            Source code content (currently expects file path in file_path param),
+            or a list of file paths / code strings searched in parallel with
+            ``optimize_batch`` and merged into one context
         query : str
             Query to guide context retrieval (e.g., "find training loop")
         max_tokens : int, optional
-            Maximum token budget (uses hard_cap if not specified)
+            Maximum token budget (uses hard_cap if not specified); shared by
+            all elements when context is a list
         file_path : str, optional
             Path to Python file to analyze (required for HASTE)
         **kwargs : dict
@@ -102,7 +368,8 @@ class HasteOptimizer(BaseOptimizer):
         Returns
         -------
         OptimizedContext
-            Optimized context with relevant code and metrics
+            Optimized context with relevant code and metrics; for a list, the
+            selections that fit the budget, each under a ``# <source>`` header
         """
         start_time = time.time()
         if query is None:
@@ -115,6 +382,9 @@ class HasteOptimizer(BaseOptimizer):
         if not query:
             raise ValueError("Query is required for HASTE optimization")
 
+        if isinstance(context, list):
+            return self._optimize_many(context, query, max_tokens, kwargs.get("max_workers"))
+
         # 3. Handle string input without file_path by creating a temp file
         temp_path = None
         if not file_path:
@@ -141,14 +411,7 @@ class HasteOptimizer(BaseOptimizer):
             result = select_from_file(
                 path=file_path,
                 query=query,
-                top_k=self.top_k,
-                prefilter=self.prefilter,
-                bfs_depth=self.bfs_depth,
-                max_add=self.max_add,
-                semantic=self.semantic,
-                sem_model=self.sem_model,
-                hard_cap=max_tokens or self.hard_cap,
-                soft_cap=self.soft_cap,
+                **self._select_params(max_tokens)
             )
             
             latency_ms = int((time.time() - start_time) * 1000)
@@ -186,6 +449,28 @@ class HasteOptimizer(BaseOptimizer):
         finally:
             if temp_path and os.path.exists(temp_path):
                 os.unlink(temp_path)
+
+    def _optimize_many(self, contexts: List[str], query: str, max_tokens: Optional[int],
+                       max_workers: Optional[int]) -> OptimizedContext:
+        """Merged selection across ``contexts``; per-file results are in ``optimize_batch``."""
+        result = self.optimize_batch(contexts, query, max_tokens=max_tokens, max_workers=max_workers)[query]
+        if result.errors:
+            source, error = next(iter(result.errors.items()))
+            raise OptimizerError(f"HASTE optimization failed for {source}: {error}")
+
+        content = result.content
+        optimized_tokens = count_tokens(content, model=self.target_model)
+        return OptimizedContext(
+            content=content,
+            metrics=OptimizerMetrics(
+                original_tokens=result.original_tokens,
+                optimized_tokens=optimized_tokens,
+                chunks_retrieved=sum(s.chunks_retrieved for s in result.included),
+                compression_ratio=result.original_tokens / max(optimized_tokens, 1),
+                latency_ms=result.latency_ms,
+                retrieval_mode='hybrid' if self.semantic else 'bm25',
+                ast_fidelity=1.0
+            )
+        )
 # Alias for backward compatibility
 HasteContext = HasteOptimizer
-    
\ No newline at end of file
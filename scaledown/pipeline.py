@@ -1,9 +1,12 @@
+import time
 from typing import List, Tuple, Union, Optional
 from scaledown.optimizer.base import BaseOptimizer
 from scaledown.compressor.base import BaseCompressor
 from scaledown.types import OptimizedContext, CompressedPrompt
 from scaledown.types import PipelineResult, StepMetadata
 from scaledown.types.metrics import count_tokens
+from scaledown.monitoring import track
+from scaledown.routing import RoutingObjective, StepRouter
 
 class Pipeline:
     """
@@ -21,9 +24,14 @@ class Pipeline:
     ... ])
     >>> 
     >>> result = pipe.run(context=code, query="Add type hints", prompt="Explain changes")
+
+    Routing mode skips steps whose observed cost is not worth it:
+
+    >>> pipe = Pipeline(steps, objective=RoutingObjective(min_savings_per_ms=2.0))
     """
     
-    def __init__(self, steps: List[Tuple[str, Union[BaseOptimizer, BaseCompressor]]]):
+    def __init__(self, steps: List[Tuple[str, Union[BaseOptimizer, BaseCompressor]]],
+                 router: Optional[StepRouter] = None, objective: Optional[RoutingObjective] = None):
         """
         Initialize pipeline with ordered steps.
         
@@ -31,8 +39,16 @@ class Pipeline:
         ----------
         steps : List[Tuple[str, Union[BaseOptimizer, BaseCompressor]]]
             List of (name, transformer) tuples
+        router : StepRouter, optional
+            Step statistics used in routing mode (created when only
+            ``objective`` is given)
+        objective : RoutingObjective, optional
+            Default routing objective; routing is off when neither a router
+            nor an objective is set
         """
         self.steps = steps
+        self.objective = objective
+        self.router = router if router is not None or objective is None else StepRouter()
         self._validate_steps()
     
     def _validate_steps(self):
@@ -50,53 +66,53 @@ class Pipeline:
                     f"Optimizer '{name}' cannot come after a compressor. "
                     "Pipeline order must be: optimizers -> compressors"
                 )
-    def run(self, context: str, **kwargs) -> PipelineResult:
+    def run(self, context: str, objective: Optional[RoutingObjective] = None, **kwargs) -> PipelineResult:
+        """
+        Run every step in order. In routing mode (a router is set) each step
+        is first checked against ``objective`` (or the pipeline default) and
+        skipped steps are recorded with ``details["skipped"] = True``.
+
+        The router learns from wall-clock step time (``details["wall_ms"]``)
+        and from locally counted input/output tokens, the same counts it
+        decides on, so a step's statistics land in the bucket that is later
+        looked up.
+        """
         current_context = context
         original_context = context
         history: List[StepMetadata] = []
+        objective = objective or self.objective
+        routing = self.router is not None and objective is not None
+        elapsed_ms = 0.0
+        tokens = count_tokens(current_context) if self.router is not None else 0
 
         for name, component in self.steps:
-            step_type = "custom"
-            inp, out, lat = 0, 0, 0.0
-            
-            # OPTIMIZER
-            if isinstance(component, BaseOptimizer):
-                step_type = "optimization"
-                result = component.optimize(
-                    context=current_context,
-                    **kwargs
-                )
-                inp = getattr(result.metrics, 'original_tokens', 0)
-                out = getattr(result.metrics, 'optimized_tokens', 0)
-                lat = getattr(result.metrics, 'latency_ms', 0.0)
-                current_context = result.content
-            
-            # COMPRESSOR
-            elif isinstance(component, BaseCompressor):
-                step_type = "compression"
-                result = component.compress(
-                    context=current_context,
-                    **kwargs
-                )
-                inp = result.tokens[0]
-                out = result.tokens[1]
-                lat = result.latency
-                current_context = result.content
-            
-            # UNKNOWN
-            else:
-                output = component(current_context, **kwargs)
-                inp = count_tokens(current_context)
-                out = count_tokens(output)
-                current_context = output
-            
-            history.append(StepMetadata(
-                step_name=name,
-                input_tokens=inp,
-                output_tokens=out,
-                latency_ms=lat,
-                details={"type": step_type, "component": component.__class__.__name__}
-            ))
+            if routing:
+                run, reason, estimate = self.router.decide(name, tokens, elapsed_ms, objective)
+                if not run:
+                    history.append(StepMetadata(
+                        step_name=name,
+                        input_tokens=tokens,
+                        output_tokens=tokens,
+                        latency_ms=0.0,
+                        details={
+                            "type": _step_type(component),
+                            "component": component.__class__.__name__,
+                            "skipped": True,
+                            "reason": reason,
+                            "expected_latency_ms": estimate.latency_ms,
+                            "expected_ratio": estimate.ratio,
+                            "samples": estimate.samples,
+                        }
+                    ))
+                    continue
+
+            current_context, metadata = run_step(name, component, current_context, **kwargs)
+            history.append(metadata)
+            elapsed_ms += metadata.details["wall_ms"]
+            if self.router is not None:
+                output_tokens = count_tokens(current_context)
+                self.router.observe(name, tokens, output_tokens, metadata.details["wall_ms"])
+                tokens = output_tokens
 
         return PipelineResult(
             final_content=current_context,
@@ -116,6 +132,74 @@ class Pipeline:
         return f"Pipeline(steps={step_names})"
 
 
+def run_step(name: str, component, context: str, **kwargs) -> Tuple[str, StepMetadata]:
+    """
+    Run one optimizer, compressor or plain callable; returns its output and metadata.
+
+    ``latency_ms`` is the latency the component reports (the ScaleDown server
+    excludes the network round trip), or the measured time for plain
+    callables. The wall-clock time of the call is ``details["wall_ms"]``.
+    """
+    with track(f"pipeline.{name}"):
+        start = time.perf_counter()
+        output, metadata = _run_step(name, component, context, **kwargs)
+        metadata.details["wall_ms"] = (time.perf_counter() - start) * 1000
+        return output, metadata
+
+
+def _run_step(name: str, component, context: str, **kwargs) -> Tuple[str, StepMetadata]:
+    step_type = "custom"
+    inp, out, lat = 0, 0, 0.0
+
+    # OPTIMIZER
+    if isinstance(component, BaseOptimizer):
+        step_type = "optimization"
+        result = component.optimize(
+            context=context,
+            **kwargs
+        )
+        inp = getattr(result.metrics, 'original_tokens', 0)
+        out = getattr(result.metrics, 'optimized_tokens', 0)
+        lat = getattr(result.metrics, 'latency_ms', 0.0)
+        output = result.content
+
+    # COMPRESSOR
+    elif isinstance(component, BaseCompressor):
+        step_type = "compression"
+        result = component.compress(
+            context=context,
+            **kwargs
+        )
+        inp = result.tokens[0]
+        out = result.tokens[1]
+        lat = result.latency
+        output = result.content
+
+    # UNKNOWN
+    else:
+        start = time.perf_counter()
+        output = component(context, **kwargs)
+        lat = (time.perf_counter() - start) * 1000
+        inp = count_tokens(context)
+        out = count_tokens(output)
+
+    return output, StepMetadata(
+        step_name=name,
+        input_tokens=inp,
+        output_tokens=out,
+        latency_ms=lat,
+        details={"type": step_type, "component": component.__class__.__name__}
+    )
+
+
+def _step_type(component) -> str:
+    if isinstance(component, BaseOptimizer):
+        return "optimization"
+    if isinstance(component, BaseCompressor):
+        return "compression"
+    return "custom"
+
+
 def make_pipeline(steps) -> Pipeline:
     """
     Helper function to create a pipeline.
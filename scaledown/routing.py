@@ -0,0 +1,123 @@
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+# Input-size buckets in tokens: step cost and benefit depend strongly on size
+DEFAULT_BUCKETS = (256, 1024, 4096, 16384)
+
+
+@dataclass
+class RoutingObjective:
+    """
+    When a step is worth running.
+
+    Parameters
+    ----------
+    max_latency_ms : float, optional
+        Pipeline latency budget; a step is skipped when its expected latency
+        would push the run past it
+    min_savings_per_ms : float, optional
+        Minimum expected tokens saved per millisecond of step latency
+    min_input_tokens : int, default=0
+        Inputs at or below this size skip every remaining step
+    """
+    max_latency_ms: Optional[float] = None
+    min_savings_per_ms: Optional[float] = None
+    min_input_tokens: int = 0
+
+
+@dataclass
+class StepEstimate:
+    """Running averages for one step in one input-size bucket."""
+    samples: int = 0
+    latency_ms: float = 0.0
+    ratio: float = 1.0
+
+    def expected_savings(self, input_tokens: int) -> float:
+        return input_tokens * (1 - 1 / self.ratio) if self.ratio > 0 else 0.0
+
+
+class StepRouter:
+    """
+    Keeps per-step latency and compression-ratio statistics, bucketed by
+    input token count, and decides whether a step should run.
+
+    Averages are exponentially weighted so they follow drift in API latency.
+    Steps without ``min_samples`` observations in the bucket always run, and
+    every ``explore_every``-th skip of a step runs anyway so its statistics
+    stay current.
+
+    Parameters
+    ----------
+    buckets : Sequence[int]
+        Upper token bounds of the input-size buckets
+    alpha : float, default=0.2
+        Weight of the newest observation in the running averages
+    min_samples : int, default=3
+        Observations needed before a step may be skipped
+    explore_every : int, default=20
+        Run a step that would be skipped once per this many skips (0 disables)
+    """
+
+    def __init__(self, buckets: Sequence[int] = DEFAULT_BUCKETS, alpha: float = 0.2,
+                 min_samples: int = 3, explore_every: int = 20):
+        self.buckets = tuple(buckets)
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self._stats: Dict[Tuple[str, int], StepEstimate] = {}
+        self._skips: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, input_tokens: int) -> int:
+        return bisect_right(self.buckets, input_tokens)
+
+    def observe(self, step: str, input_tokens: int, output_tokens: int, latency_ms: float) -> None:
+        ratio = input_tokens / output_tokens if output_tokens > 0 else 1.0
+        with self._lock:
+            stats = self._stats.setdefault((step, self.bucket(input_tokens)), StepEstimate())
+            if stats.samples == 0:
+                stats.latency_ms, stats.ratio = latency_ms, ratio
+            else:
+                stats.latency_ms += self.alpha * (latency_ms - stats.latency_ms)
+                stats.ratio += self.alpha * (ratio - stats.ratio)
+            stats.samples += 1
+
+    def estimate(self, step: str, input_tokens: int) -> StepEstimate:
+        with self._lock:
+            stats = self._stats.get((step, self.bucket(input_tokens)))
+            return StepEstimate(stats.samples, stats.latency_ms, stats.ratio) if stats else StepEstimate()
+
+    def decide(self, step: str, input_tokens: int, elapsed_ms: float,
+               objective: RoutingObjective) -> Tuple[bool, Optional[str], StepEstimate]:
+        """``(run, skip_reason, estimate)`` for ``step`` on an input of ``input_tokens``."""
+        estimate = self.estimate(step, input_tokens)
+        reason = None
+        if input_tokens <= objective.min_input_tokens:
+            reason = "input_below_min_tokens"
+        elif estimate.samples >= self.min_samples:
+            if (objective.max_latency_ms is not None
+                    and elapsed_ms + estimate.latency_ms > objective.max_latency_ms):
+                reason = "latency_budget"
+            elif (objective.min_savings_per_ms is not None
+                  and estimate.expected_savings(input_tokens) / max(estimate.latency_ms, 1e-3)
+                  < objective.min_savings_per_ms):
+                reason = "low_savings_per_ms"
+
+        if reason is None or reason == "input_below_min_tokens":
+            return reason is None, reason, estimate
+        with self._lock:
+            skips = self._skips.get(step, 0) + 1
+            self._skips[step] = skips
+        if self.explore_every and skips % self.explore_every == 0:
+            return True, None, estimate
+        return False, reason, estimate
+
+    def snapshot(self) -> Dict[str, Dict[int, StepEstimate]]:
+        """Current estimates per step and bucket index."""
+        with self._lock:
+            out: Dict[str, Dict[int, StepEstimate]] = {}
+            for (step, bucket), stats in self._stats.items():
+                out.setdefault(step, {})[bucket] = StepEstimate(stats.samples, stats.latency_ms, stats.ratio)
+            return out
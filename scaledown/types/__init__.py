@@ -1,6 +1,7 @@
 from .metrics import OptimizerMetrics, CompressorMetrics
 from .optimized_prompt import OptimizedContext
 from .compressed_prompt import CompressedPrompt
+from .compressed_batch import CompressedBatch
 from .pipeline_result import PipelineResult, StepMetadata
 
 __all__ = [
@@ -8,6 +9,7 @@ __all__ = [
     "CompressorMetrics",
     "OptimizedContext",
     "CompressedPrompt",
+    "CompressedBatch",
     "PipelineResult",
     "StepMetadata"
 ]
\ No newline at end of file
@@ -0,0 +1,135 @@
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+
+from .compressed_prompt import CompressedPrompt
+
+if TYPE_CHECKING:
+    import numpy
+
+
+def _numpy():
+    """Import NumPy on first use; returns None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class CompressedBatch:
+    """
+    Columnar container for the results of a batch compression.
+
+    Contents are kept in a list while token counts and latencies live in
+    ``array`` columns, so large batches avoid one dataclass per item. Ratio and
+    savings columns are computed in one pass (vectorised when NumPy is
+    installed). Indexing materialises a ``CompressedPrompt`` on demand.
+    """
+    __slots__ = ("contents", "original_tokens", "compressed_tokens", "latencies", "models")
+
+    def __init__(self):
+        self.contents: List[str] = []
+        self.original_tokens = array("q")
+        self.compressed_tokens = array("q")
+        self.latencies = array("d")
+        self.models: List[str] = []
+
+    @classmethod
+    def from_prompts(cls, prompts: Iterable[CompressedPrompt]) -> "CompressedBatch":
+        """Build a batch from existing ``CompressedPrompt`` results."""
+        batch = cls()
+        for prompt in prompts:
+            batch.append(prompt)
+        return batch
+
+    def append(self, prompt: CompressedPrompt) -> None:
+        self.add(prompt.content, prompt.tokens[0], prompt.tokens[1], prompt.latency, prompt.model)
+
+    def add(self, content: str, original_tokens: int, compressed_tokens: int,
+            latency: float, model: str) -> None:
+        """Append one result from its fields, without building a ``CompressedPrompt``."""
+        self.contents.append(content)
+        self.original_tokens.append(original_tokens)
+        self.compressed_tokens.append(compressed_tokens)
+        self.latencies.append(latency)
+        self.models.append(model)
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __getitem__(self, index: int) -> CompressedPrompt:
+        return CompressedPrompt(
+            content=self.contents[index],
+            original_prompt="",
+            tokens=(self.original_tokens[index], self.compressed_tokens[index]),
+            latency=self.latencies[index],
+            model=self.models[index]
+        )
+
+    def __iter__(self) -> Iterator[CompressedPrompt]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def compression_ratio(self) -> Union["numpy.ndarray", List[float]]:
+        """Per-item original/compressed token ratio (0.0 where nothing was kept)."""
+        np = _numpy()
+        if np is not None:
+            orig = np.frombuffer(self.original_tokens, dtype=np.int64).astype(np.float64)
+            comp = np.frombuffer(self.compressed_tokens, dtype=np.int64).astype(np.float64)
+            out = np.zeros_like(orig)
+            np.divide(orig, comp, out=out, where=comp != 0)
+            return out
+        return [o / c if c else 0.0 for o, c in zip(self.original_tokens, self.compressed_tokens)]
+
+    @property
+    def savings_percent(self) -> Union["numpy.ndarray", List[float]]:
+        """Per-item token savings in percent (0.0 where the original was empty)."""
+        np = _numpy()
+        if np is not None:
+            orig = np.frombuffer(self.original_tokens, dtype=np.int64).astype(np.float64)
+            comp = np.frombuffer(self.compressed_tokens, dtype=np.int64).astype(np.float64)
+            out = np.zeros_like(orig)
+            np.divide(comp, orig, out=out, where=orig != 0)
+            return np.where(orig != 0, (1 - out) * 100, 0.0)
+        return [(1 - c / o) * 100 if o else 0.0 for o, c in zip(self.original_tokens, self.compressed_tokens)]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Aggregate token and latency statistics for the whole batch."""
+        total_orig = sum(self.original_tokens)
+        total_comp = sum(self.compressed_tokens)
+        summary: Dict[str, Optional[float]] = {
+            "count": len(self),
+            "total_original_tokens": total_orig,
+            "total_compressed_tokens": total_comp,
+            "compression_ratio": total_orig / total_comp if total_comp else 0.0,
+            "savings_percent": (1 - total_comp / total_orig) * 100 if total_orig else 0.0,
+        }
+        if not len(self):
+            summary.update(latency_mean=None, latency_p50=None, latency_p95=None, latency_max=None)
+            return summary
+
+        np = _numpy()
+        if np is not None:
+            lat = np.frombuffer(self.latencies, dtype=np.float64)
+            p50, p95 = np.percentile(lat, [50, 95])
+            summary.update(latency_mean=float(lat.mean()), latency_p50=float(p50),
+                           latency_p95=float(p95), latency_max=float(lat.max()))
+        else:
+            lat = sorted(self.latencies)
+            summary.update(latency_mean=sum(lat) / len(lat),
+                           latency_p50=_percentile(lat, 50),
+                           latency_p95=_percentile(lat, 95),
+                           latency_max=lat[-1])
+        return summary
+
+    def __repr__(self) -> str:
+        return f"CompressedBatch(size={len(self)})"
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    pos = (len(sorted_values) - 1) * percent / 100
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Tuple, Dict, Any
 
-@dataclass
+@dataclass(slots=True)
 class CompressedPrompt:
     content: str
     original_prompt: str
@@ -1,11 +1,25 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 logger = logging.getLogger(__name__)
-try:
-    import tiktoken
 
-except ImportError:
-    tiktoken = None
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Load (once per model) the tiktoken encoding; tiktoken is imported on first use."""
+    try:
+        import tiktoken
+    except ImportError:
+        raise ImportError(
+            "tiktoken is required for accurate metrics. "
+            "Install it with: pip install tiktoken"
+        ) from None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fallback for non-OpenAI models to a standard encoding
+        logger.debug(f"Model '{model}' not found in tiktoken. Defaulting to cl100k_base.")
+        return tiktoken.get_encoding("cl100k_base")
 
 def count_tokens(text: str, model: str = "gpt-4o") -> int:
     """
@@ -16,23 +30,10 @@ def count_tokens(text: str, model: str = "gpt-4o") -> int:
     """
     if not text:
         return 0
-        
-    if tiktoken is None:
-        raise ImportError(
-            "tiktoken is required for accurate metrics. "
-            "Install it with: pip install tiktoken"
-        )
-            
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback for non-OpenAI models to a standard encoding
-        logger.debug(f"Model '{model}' not found in tiktoken. Defaulting to cl100k_base.")
-        encoding = tiktoken.get_encoding("cl100k_base")
-        
-    return len(encoding.encode(text))
 
-@dataclass
+    return len(_get_encoding(model).encode(text))
+
+@dataclass(slots=True)
 class OptimizerMetrics:
     original_tokens: int
     optimized_tokens: int
@@ -42,7 +43,7 @@ class OptimizerMetrics:
     retrieval_mode: str
     ast_fidelity: float
 
-@dataclass
+@dataclass(slots=True)
 class CompressorMetrics:
     original_tokens: int
     compressed_tokens: int
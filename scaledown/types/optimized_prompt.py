@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from .metrics import OptimizerMetrics
 
-@dataclass
+@dataclass(slots=True)
 class OptimizedContext:
     content: str
     metrics: OptimizerMetrics
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-@dataclass
+@dataclass(slots=True)
 class StepMetadata:
     """Captures metrics for a single step in the pipeline."""
     step_name: str
@@ -15,17 +15,30 @@ class StepMetadata:
         if self.output_tokens <= 0: return 1.0
         return self.input_tokens / self.output_tokens
 
-@dataclass
+@dataclass(slots=True)
 class PipelineResult:
     """Final output of the pipeline with full history."""
     final_content: str
     original_content: str
     history: List[StepMetadata] = field(default_factory=list)
+    # Graph pipelines: steps that determined end-to-end latency, in order
+    critical_path: List[str] = field(default_factory=list)
+    wall_time_ms: Optional[float] = None
+    # Graph pipelines: tokens across all text inputs (branches start in parallel)
+    source_tokens: Optional[int] = None
 
     @property
     def original_tokens(self) -> int:
+        if self.source_tokens is not None:
+            return self.source_tokens
         return self.history[0].input_tokens if self.history else 0
 
+    @property
+    def critical_path_ms(self) -> float:
+        """Sum of step latencies along the critical path."""
+        steps = {step.step_name: step for step in self.history}
+        return sum(steps[name].latency_ms for name in self.critical_path if name in steps)
+
     @property
     def final_tokens(self) -> int:
         return self.history[-1].output_tokens if self.history else 0
@@ -0,0 +1,17 @@
+import pytest
+
+import scaledown.types.metrics as metrics
+
+
+class _WordEncoding:
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    """Count whitespace-separated words as tokens.
+
+    Keeps token counts predictable and avoids downloading a tiktoken encoding.
+    """
+    monkeypatch.setattr(metrics, "_get_encoding", lambda model: _WordEncoding())
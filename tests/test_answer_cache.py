@@ -0,0 +1,54 @@
+import pytest
+
+from assistant.answer_cache import AnswerCache, meaning_guards, normalize_query
+
+SCOPE = ("resume", "jd", "Career Coach")
+
+
+@pytest.fixture
+def cache():
+    cache = AnswerCache()
+    cache.put(SCOPE, "Should I apply for this role?", "Yes, apply.")
+    return cache
+
+
+def test_exact_match_ignores_case_and_punctuation(cache):
+    assert cache.get(SCOPE, "should i apply for this role") == "Yes, apply."
+    assert cache.exact_hits == 1
+
+
+def test_similar_question_is_a_hit(cache):
+    assert cache.get(SCOPE, "Should I apply for this role now?") == "Yes, apply."
+    assert cache.similar_hits == 1
+
+
+@pytest.mark.parametrize("question", [
+    "Should I not apply for this role?",
+    "Shouldn't I apply for this role?",
+    "Should I never apply for this role?",
+])
+def test_negated_question_is_a_miss(cache, question):
+    assert cache.get(SCOPE, question) is None
+
+
+def test_question_with_other_number_is_a_miss():
+    cache = AnswerCache()
+    cache.put(SCOPE, "Write a 100 word summary of my resume", "Summary A")
+    assert cache.get(SCOPE, "Write a 200 word summary of my resume") is None
+    assert cache.get(SCOPE, "Write a 100 word summary of my resume please") == "Summary A"
+
+
+def test_negation_guard_applies_with_embeddings():
+    cache = AnswerCache(embed_fn=lambda text: [1.0, 0.0])
+    cache.put(SCOPE, "Should I apply for this role?", "Yes, apply.")
+    assert cache.get(SCOPE, "Should I not apply for this role?") is None
+    assert cache.get(SCOPE, "Is this job worth applying to?") == "Yes, apply."
+
+
+def test_scopes_are_separate(cache):
+    assert cache.get(("other", "jd", "Career Coach"), "Should I apply for this role?") is None
+
+
+def test_meaning_guards():
+    assert meaning_guards(normalize_query("Don't list 3 skills")) == {"<not>", "3"}
+    assert meaning_guards(normalize_query("List the skills")) == frozenset()
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+import app  # noqa: E402
+from assistant.context_cache import InMemoryContextCache  # noqa: E402
+from assistant.streaming import TurnStats  # noqa: E402
+from benchmarks.load_test import StubGeminiClient  # noqa: E402
+
+COACH = "Career Coach (Analysis)"
+
+
+class _SessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def inputs():
+    with open("samples/Ux-designer-resume-example.pdf", "rb") as f:
+        resume = f.read()
+    with open("samples/Job_Description.txt", encoding="utf-8") as f:
+        jd = f.read()
+    return resume, jd
+
+
+@pytest.fixture(autouse=True)
+def session(monkeypatch):
+    monkeypatch.setattr(st, "session_state", _SessionState())
+    monkeypatch.setattr(st, "secrets", {"GEMINI_API_KEY": "test-key"})
+    app.init_session_state()
+    app.get_answer_cache().clear()
+
+
+def _ask(question, inputs, client, cache):
+    resume, jd = inputs
+    st.session_state.messages.append({"role": "user", "content": question})
+    stats = TurnStats()
+    answer = "".join(app.stream_ai_response(question, io.BytesIO(resume), jd, COACH, stats,
+                                            client=client, context_cache=cache))
+    st.session_state.messages.append({"role": "assistant", "content": answer})
+    return answer, stats
+
+
+def test_stream_records_ttft_and_total(inputs):
+    client = StubGeminiClient(latency_ms=(300, 300), ttft_fraction=0.2, chunks=6)
+    cache = InMemoryContextCache()
+    answer, stats = _ask("How should I rewrite my summary section?", inputs, client, cache)
+
+    assert client.calls == 1
+    assert len(answer.split()) == client.answer_words
+    assert stats.ttft_ms < stats.total_ms
+    assert stats.total_ms - stats.ttft_ms >= 200
+    assert stats.status.startswith("ScaleDown")
+    assert "first token" in stats.status_line()
+    assert len(cache.contents) == 1
+
+
+def test_repeated_question_is_answered_without_gemini(inputs):
+    client = StubGeminiClient(latency_ms=(50, 50))
+    cache = InMemoryContextCache()
+    first, _ = _ask("Which projects should I highlight in the interview?", inputs, client, cache)
+    second, stats = _ask("Which projects should I highlight in the interview?", inputs, client, cache)
+
+    assert client.calls == 1
+    assert second == first
+    assert stats.status == "Answer cache hit (no LLM call)"
+    assert stats.ttft_ms == stats.total_ms
+
+
+def test_prefix_is_identical_across_questions(inputs):
+    resume, jd = inputs
+    turns = [app.prepare_turn(q, io.BytesIO(resume), jd, COACH) for q in (
+        "Which tools and skills should I list first?",
+        "Which degree should I mention?",
+        "What salary should I ask for?",
+    )]
+    assert len({t.prefix for t in turns}) == 1
+    assert all("CANDIDATE RESUME (SECTIONS RELEVANT" in t.turn for t in turns)
+
+    cache = InMemoryContextCache()
+    for turn in turns:
+        turn.request_args(cache)
+    assert (cache.misses, cache.hits) == (1, 2)
+
+
+def _tokens(turn):
+    return app.count_tokens(turn.prefix + "\n" + turn.turn)
+
+
+def test_specific_question_sends_fewer_tokens_than_full_review(inputs):
+    resume, jd = inputs
+    specific = app.prepare_turn("What salary should I ask for?", io.BytesIO(resume), jd, COACH)
+    review = app.prepare_turn("Can you review my resume?", io.BytesIO(resume), jd, COACH)
+
+    ingested = app.start_ingestion(io.BytesIO(resume), jd).result()
+    assert ingested.resume_text.strip() in review.prefix
+    assert "SECTIONS RELEVANT" not in review.turn
+    assert ingested.resume_text.strip() not in specific.prefix + specific.turn
+    assert _tokens(specific) < _tokens(review)
@@ -0,0 +1,112 @@
+import csv
+import json
+
+from assistant import batch_rank
+from assistant.batch_rank import Checkpoint, LocalScorer, ResumeScore, final_score, rank, write_report
+from tests.test_pdf_extract import _make_pdf
+
+JD = "Requirements: Python, SQL and Apache Spark. Nice to have: Kubernetes."
+
+
+def _resumes(directory, texts):
+    directory.mkdir()
+    for name, text in texts.items():
+        (directory / f"{name}.pdf").write_bytes(_make_pdf([text]))
+    return sorted(str(p) for p in directory.glob("*.pdf"))
+
+
+def test_local_scorer_coverage():
+    scorer = LocalScorer(JD)
+    result = scorer.score(ResumeScore("a.pdf", "a"), "Python and SQL developer")
+    assert result.matched == ["Python", "SQL"]
+    assert result.missing == ["Spark", "Kubernetes"]
+    assert 0.0 < result.coverage < 1.0
+
+
+def test_jd_without_skills_gives_neutral_coverage():
+    result = LocalScorer("Friendly team, great office, flexible hours.").score(
+        ResumeScore("a.pdf", "a"), "Python and SQL developer")
+    assert result.coverage == 1.0
+    assert result.score >= batch_rank.LOCAL_WEIGHTS["coverage"]
+
+
+def test_resume_from_checkpoint_and_retry_failures(tmp_path, monkeypatch):
+    paths = _resumes(tmp_path / "resumes", {"alice": "Python SQL Spark engineer", "bob": "Python developer"})
+    broken = tmp_path / "resumes" / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    paths.append(str(broken))
+
+    scored = []
+    original = LocalScorer.score
+    monkeypatch.setattr(LocalScorer, "score", lambda self, r, text: scored.append(r.file) or original(self, r, text))
+
+    checkpoint_path = str(tmp_path / "run.checkpoint.jsonl")
+    checkpoint = Checkpoint(checkpoint_path)
+    first = {r.file: r for r in rank(JD, paths, checkpoint, workers=2)}
+    checkpoint.close()
+    assert sorted(scored) == sorted(paths[:2])
+    assert first[str(broken)].error.startswith("PDF Error")
+
+    # A torn last line from an interrupted run is ignored
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        f.write('{"file": "half')
+    scored.clear()
+    checkpoint = Checkpoint(checkpoint_path)
+    assert len(checkpoint.done) == 2
+    second = {r.file: r for r in rank(JD, paths, checkpoint, workers=2)}
+    checkpoint.close()
+
+    assert scored == []  # only the failed file was processed again, and it failed again
+    assert second[str(broken)].error
+    for path in paths[:2]:
+        assert second[path].score == first[path].score
+
+
+def test_failed_row_is_retried_once_fixed(tmp_path):
+    paths = _resumes(tmp_path / "resumes", {"alice": "Python SQL engineer"})
+    late = tmp_path / "resumes" / "late.pdf"
+    late.write_bytes(b"")
+    paths.append(str(late))
+    checkpoint = Checkpoint(str(tmp_path / "cp.jsonl"))
+    assert rank(JD, paths, checkpoint, workers=1)[-1].error
+    checkpoint.close()
+
+    late.write_bytes(_make_pdf(["Spark and Kubernetes engineer"]))
+    checkpoint = Checkpoint(str(tmp_path / "cp.jsonl"))
+    results = {r.file: r for r in rank(JD, paths, checkpoint, workers=1)}
+    checkpoint.close()
+    assert results[str(late)].error is None
+    assert results[str(late)].matched == ["Spark", "Kubernetes"]
+
+
+def test_report_orders_by_final_score(tmp_path):
+    results = [
+        ResumeScore("low.pdf", "1", score=0.2),
+        ResumeScore("llm.pdf", "2", score=0.5, llm_score=90),
+        ResumeScore("high.pdf", "3", score=0.8, matched=["Python", "SQL"]),
+    ]
+    assert [round(final_score(r), 2) for r in results] == [0.2, 0.7, 0.8]
+
+    write_report(results, str(tmp_path / "ranking.csv"))
+    with open(tmp_path / "ranking.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["rank"], r["file"]) for r in rows] == [("1", "high.pdf"), ("2", "llm.pdf"), ("3", "low.pdf")]
+    assert rows[0]["matched"] == "Python; SQL"
+
+    write_report(results, str(tmp_path / "ranking.json"))
+    with open(tmp_path / "ranking.json", encoding="utf-8") as f:
+        assert [r["file"] for r in json.load(f)] == ["high.pdf", "llm.pdf", "low.pdf"]
+
+
+def test_cli_writes_ranking(tmp_path, monkeypatch):
+    monkeypatch.delenv("SCALEDOWN_API_KEY", raising=False)
+    _resumes(tmp_path / "resumes", {"alice": "Python SQL Spark engineer", "bob": "Figma designer"})
+    jd = tmp_path / "jd.txt"
+    jd.write_text(JD, encoding="utf-8")
+    output = tmp_path / "ranking.csv"
+
+    batch_rank.main(["--jd", str(jd), "--resumes", str(tmp_path / "resumes"), "--output", str(output),
+                     "--workers", "1"])
+    with open(output, encoding="utf-8") as f:
+        assert [r["file"].rsplit("/", 1)[-1] for r in csv.DictReader(f)] == ["alice.pdf", "bob.pdf"]
+    assert (tmp_path / "ranking.csv.checkpoint.jsonl").exists()
@@ -0,0 +1,49 @@
+from scaledown.optimizer.boilerplate import BoilerplateOptimizer
+
+SHORT_JD = (
+    "Senior Data Engineer\n\n"
+    "Requirements:\n- Python\n- SQL\n- Apache Spark\n- AWS\n\n"
+    "Location: Remote\n\n"
+    "Build and maintain scalable pipelines for our analytics platform."
+)
+
+
+def test_short_headings_and_bullets_are_kept():
+    result = BoilerplateOptimizer().optimize(SHORT_JD)
+    assert result.content == SHORT_JD
+
+
+def test_template_paragraph_is_removed():
+    jd = (
+        "Data Engineer\n\n"
+        "Build and maintain scalable pipelines for our analytics platform.\n\n"
+        "We are an equal opportunity employer and value diversity at our company. We do not "
+        "discriminate on the basis of race, religion, color, national origin, gender, sexual "
+        "orientation, age, marital status, veteran status, or disability status."
+    )
+    result = BoilerplateOptimizer().optimize(jd)
+    assert result.content == "Data Engineer\n\nBuild and maintain scalable pipelines for our analytics platform."
+    assert result.metrics.optimized_tokens < result.metrics.original_tokens
+
+
+def test_heading_left_without_its_bullets_is_dropped():
+    jd = (
+        "Responsibilities:\n- Design data models for reporting and analytics teams\n\n"
+        "Duties:\n- Design data models for reporting and analytics teams.\n\n"
+        "Location: Remote"
+    )
+    result = BoilerplateOptimizer().optimize(jd)
+    assert result.content == (
+        "Responsibilities:\n- Design data models for reporting and analytics teams\n\n"
+        "Location: Remote"
+    )
+
+
+def test_near_duplicate_bullets_are_removed():
+    jd = ("Requirements:\n"
+          "- 5+ years of experience with Python and SQL in production\n"
+          "- 5+ years of experience with Python and SQL in production.\n"
+          "- Strong communication skills with business stakeholders")
+    content = BoilerplateOptimizer().optimize(jd).content
+    assert content.count("Python") == 1
+    assert "Requirements:" in content and "communication" in content
@@ -0,0 +1,84 @@
+import itertools
+
+import pytest
+
+from assistant.budget import BudgetPlanner
+
+
+def _budgets(plan):
+    return {name: a.budget for name, a in plan.allocations.items()}
+
+
+def test_everything_fits_without_compressing():
+    calls = []
+    planner = BudgetPlanner(1000, {"resume": 0.6, "jd": 0.4})
+    fitted, plan = planner.fit({"resume": "r", "jd": "j"}, lambda *args: calls.append(args),
+                               token_counts={"resume": 300, "jd": 200})
+    assert plan.fits
+    assert calls == []
+    assert fitted == {"resume": "r", "jd": "j"}
+    assert _budgets(plan) == {"resume": 300, "jd": 200}
+
+
+def test_slack_from_small_parts_goes_to_large_parts():
+    planner = BudgetPlanner(1000, {"resume": 0.6, "jd": 0.4})
+    plan = planner.plan({"resume": "", "jd": ""}, token_counts={"resume": 100, "jd": 5000})
+    assert _budgets(plan) == {"resume": 100, "jd": 900}
+    assert [a.name for a in plan.allocations.values() if a.needs_compression] == ["jd"]
+
+
+def test_over_budget_parts_split_by_priority():
+    planner = BudgetPlanner(1000, {"resume": 0.6, "jd": 0.4})
+    plan = planner.plan({"resume": "", "jd": ""}, token_counts={"resume": 5000, "jd": 5000})
+    assert _budgets(plan) == {"resume": 600, "jd": 400}
+
+
+def test_only_parts_over_budget_are_compressed():
+    planner = BudgetPlanner(1000, {"resume": 0.6, "jd": 0.4})
+    calls = []
+
+    def compress(name, text, budget):
+        calls.append((name, budget))
+        return text[:budget]
+
+    fitted, _ = planner.fit({"resume": "r" * 100, "jd": "j" * 5000}, compress,
+                            token_counts={"resume": 100, "jd": 5000}, max_workers=2)
+    assert calls == [("jd", 900)]
+    assert fitted["jd"] == "j" * 900 and fitted["resume"] == "r" * 100
+
+
+def test_minimum_is_granted_before_the_split():
+    planner = BudgetPlanner(1000, {"resume": 0.9, "jd": 0.1}, minimums={"jd": 300})
+    plan = planner.plan({"resume": "", "jd": ""}, token_counts={"resume": 5000, "jd": 5000})
+    assert _budgets(plan) == {"resume": 700, "jd": 300}
+
+
+def test_minimum_never_exceeds_the_part_size():
+    planner = BudgetPlanner(1000, {"resume": 0.9, "jd": 0.1}, minimums={"jd": 300})
+    plan = planner.plan({"resume": "", "jd": ""}, token_counts={"resume": 5000, "jd": 50})
+    assert _budgets(plan) == {"resume": 950, "jd": 50}
+
+
+def test_minimums_over_target_are_rejected():
+    with pytest.raises(ValueError):
+        BudgetPlanner(100, minimums={"a": 60, "b": 60})
+
+
+def test_counts_tokens_when_not_given():
+    plan = BudgetPlanner(10).plan({"a": "one two three"})
+    assert plan.allocations["a"].tokens == 3 and plan.fits
+
+
+@pytest.mark.parametrize("target", [1, 7, 100, 999])
+def test_total_never_exceeds_target(target):
+    priorities = {"a": 0.5, "b": 0.3, "c": 0.2}
+    minimums = {"b": target // 4, "c": target // 5}
+    planner = BudgetPlanner(target, priorities, minimums=minimums)
+    for sizes in itertools.product([0, 1, 3, 50, 333, 5000], repeat=3):
+        counts = dict(zip("abc", sizes))
+        plan = planner.plan(dict.fromkeys("abc", ""), token_counts=counts)
+        budgets = _budgets(plan)
+        assert sum(budgets.values()) <= target
+        for name, size in counts.items():
+            assert budgets[name] <= size
+            assert budgets[name] >= min(size, minimums.get(name, 0))
@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.stub_server import StubScaleDownServer
+from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubScaleDownServer(keep_ratio=1.0) as stub:
+        monkeypatch.setenv("SCALEDOWN_API_URL", stub.url)
+        yield stub
+
+
+def test_chunks_are_rejoined_with_source_layout(server):
+    text = "alpha beta gamma. delta epsilon zeta.\neta theta iota.\n\nkappa lambda mu."
+    compressor = ScaleDownCompressor(api_key="test", chunk_tokens=4)
+    result = compressor.compress(text, prompt="")
+    assert len(server.requests) == 4
+    assert result.content == text
+    assert result.tokens == (12, 12)
+
+
+def test_zero_budget_chunks_are_not_sent(server):
+    text = "\n\n".join(f"w{i} x y z" for i in range(10))
+    compressor = ScaleDownCompressor(api_key="test", chunk_tokens=4)
+    result = compressor.compress(text, prompt="", max_tokens=5)
+    budgets = [r.payload["scaledown"]["max_tokens"] for r in server.requests]
+    assert len(budgets) == 5 and sum(budgets) == 5
+    assert result.tokens[0] == 40
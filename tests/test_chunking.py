@@ -0,0 +1,42 @@
+import pytest
+
+from scaledown.compressor.chunking import allocate_budget, join_chunks, split_with_separators
+
+
+@pytest.mark.parametrize("sizes,max_tokens", [
+    ([100] * 10, 5),
+    ([100] * 10, 10),
+    ([100] * 10, 13),
+    ([500, 10, 10], 7),
+    ([0, 0, 0], 4),
+    ([3, 1000, 7, 50], 1000),
+])
+def test_allocate_budget_never_exceeds_total(sizes, max_tokens):
+    budgets = allocate_budget(sizes, max_tokens)
+    assert len(budgets) == len(sizes)
+    assert sum(budgets) == max_tokens
+    assert min(budgets) >= (1 if max_tokens >= len(sizes) else 0)
+
+
+def test_allocate_budget_is_proportional():
+    assert allocate_budget([300, 100], 40) == [30, 10]
+
+
+def test_allocate_budget_without_limit():
+    assert allocate_budget([10, 20], None) == [None, None]
+    assert allocate_budget([], 10) == []
+
+
+def test_split_mid_paragraph_keeps_original_separators():
+    text = ("one two three. four five six.\nseven eight nine.\n\n"
+            "ten eleven twelve.")
+    pairs = split_with_separators(text, chunk_tokens=4)
+    chunks = [chunk for chunk, _ in pairs]
+    assert all(len(chunk.split()) <= 4 for chunk in chunks)
+    assert [sep for _, sep in pairs] == [" ", "\n", "\n\n", ""]
+    assert join_chunks(chunks, [sep for _, sep in pairs[:-1]]) == text
+
+
+def test_split_packs_small_paragraphs_together():
+    pairs = split_with_separators("a b\n\nc d\n\ne f g h i", chunk_tokens=4)
+    assert pairs == [("a b\n\nc d", "\n\n"), ("e f g h", " "), ("i", "")]
@@ -0,0 +1,26 @@
+import pytest
+
+from assistant.common import cosine, shared_process_pool, sparse_cosine, term_vector, tokenize
+
+
+def test_tokenize_keeps_tech_tokens_and_drops_stopwords():
+    assert tokenize("Experience with Node.js, C++ and C#.") == ["experience", "node.js", "c++", "c#"]
+
+
+def test_term_vector_is_sublinear():
+    vector = term_vector("python python python sql")
+    assert vector["sql"] == 1.0
+    assert 2.0 < vector["python"] < 3.0
+
+
+def test_cosines():
+    assert cosine([1.0, 0.0], [1.0, 0.0]) == pytest.approx(1.0)
+    assert cosine([0.0, 0.0], [1.0, 0.0]) == 0.0
+    assert sparse_cosine({"a": 1.0}, {"a": 1.0, "b": 1.0}) == pytest.approx(2 ** -0.5)
+    assert sparse_cosine({}, {"a": 1.0}) == 0.0
+
+
+def test_shared_pool_per_worker_count():
+    assert shared_process_pool(2) is shared_process_pool(2)
+    assert shared_process_pool(3) is not shared_process_pool(2)
+    assert shared_process_pool(3)._max_workers == 3
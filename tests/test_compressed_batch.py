@@ -0,0 +1,66 @@
+import pytest
+
+from benchmarks.stub_server import StubScaleDownServer
+from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
+from scaledown.types import CompressedBatch, CompressedPrompt
+from scaledown.types import compressed_batch
+
+
+def _prompts():
+    return [
+        CompressedPrompt("a b", "", (10, 2), 12.5, "gpt-4o"),
+        CompressedPrompt("", "", (4, 0), 3.0, "gpt-4o"),
+        CompressedPrompt("x", "", (0, 0), 1.0, "gpt-4o-mini"),
+    ]
+
+
+@pytest.fixture(params=["numpy", "pure-python"])
+def numpy_mode(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(compressed_batch, "_numpy", lambda: None)
+    return request.param
+
+
+def test_ratio_and_savings_columns(numpy_mode):
+    batch = CompressedBatch.from_prompts(_prompts())
+    assert [float(v) for v in batch.compression_ratio] == [5.0, 0.0, 0.0]
+    assert [float(v) for v in batch.savings_percent] == [80.0, 100.0, 0.0]
+    # Columns agree with the per-item properties
+    assert [float(v) for v in batch.compression_ratio] == [p.compression_ratio for p in _prompts()]
+    assert [float(v) for v in batch.savings_percent] == [p.savings_percent for p in _prompts()]
+
+
+def test_summary(numpy_mode):
+    summary = CompressedBatch.from_prompts(_prompts()).summary()
+    assert summary["count"] == 3
+    assert summary["total_original_tokens"] == 14
+    assert summary["compression_ratio"] == 7.0
+    assert summary["latency_max"] == 12.5
+    assert summary["latency_p50"] == 3.0
+    assert CompressedBatch().summary()["latency_mean"] is None
+
+
+def test_indexing_and_iteration_round_trip():
+    prompts = _prompts()
+    batch = CompressedBatch.from_prompts(prompts)
+    assert len(batch) == 3
+    assert batch[0] == prompts[0]
+    assert batch[-1] == prompts[-1]
+    assert list(batch) == prompts
+
+
+def test_compress_as_batch(monkeypatch):
+    with StubScaleDownServer() as stub:
+        monkeypatch.setenv("SCALEDOWN_API_URL", stub.url)
+        compressor = ScaleDownCompressor(api_key="test")
+        contexts = ["one two three four", "five six", "seven eight nine ten eleven twelve"]
+        batch = compressor.compress(contexts, prompt="p", as_batch=True)
+        listed = compressor.compress(contexts, prompt="p")
+
+    assert isinstance(batch, CompressedBatch)
+    assert list(batch.original_tokens) == [4, 2, 6]
+    assert [p.content for p in batch] == [p.content for p in listed]
+    assert [p.tokens for p in batch] == [p.tokens for p in listed]
+    assert batch.models == ["gpt-4o"] * 3
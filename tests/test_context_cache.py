@@ -0,0 +1,80 @@
+import pytest
+
+import assistant.context_cache as context_cache
+from assistant.context_cache import InMemoryContextCache
+from assistant.prompts import PreparedTurn
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(context_cache, "time", clock)
+    return clock
+
+
+def test_same_prefix_reuses_handle(clock):
+    cache = InMemoryContextCache(ttl_seconds=600, refresh_margin=30)
+    handle = cache.get("prefix", source_key="a")
+    assert handle and cache.contents[handle] == "prefix"
+    assert cache.get("prefix", source_key="a") == handle
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_handle_is_refreshed_before_expiry(clock):
+    cache = InMemoryContextCache(ttl_seconds=600, refresh_margin=30)
+    cache.get("prefix", source_key="a")
+    clock.now += 569
+    cache.get("prefix", source_key="a")
+    assert cache.misses == 1
+    # Inside the refresh margin the entry is recreated rather than handed out
+    clock.now += 2
+    assert cache.get("prefix", source_key="a")
+    assert cache.misses == 2
+    clock.now += 569
+    cache.get("prefix", source_key="a")
+    assert cache.misses == 2
+
+
+def test_invalidate_drops_only_that_source(clock):
+    cache = InMemoryContextCache()
+    a1 = cache.get("coach prefix", source_key="a")
+    a2 = cache.get("interview prefix", source_key="a")
+    b = cache.get("other prefix", source_key="b")
+    assert cache.invalidate("a") == 2
+    assert a1 not in cache.contents and a2 not in cache.contents
+    assert b in cache.contents
+    cache.get("coach prefix", source_key="a")
+    assert cache.misses == 4
+
+
+def test_failed_create_inlines_prefix_for_one_ttl(clock):
+    class Failing(InMemoryContextCache):
+        calls = 0
+
+        def _create(self, prefix):
+            Failing.calls += 1
+            raise ValueError("prefix below provider minimum")
+
+    cache = Failing(ttl_seconds=600)
+    turn = PreparedTurn("key", "PREFIX", "TURN", "", "a")
+    assert turn.request_args(cache) == ("PREFIX\nTURN", None)
+    assert turn.request_args(cache) == ("PREFIX\nTURN", None)
+    assert Failing.calls == 1
+    clock.now += 600
+    turn.request_args(cache)
+    assert Failing.calls == 2
+
+
+def test_cached_turn_sends_only_the_turn(clock):
+    cache = InMemoryContextCache()
+    contents, config = PreparedTurn("key", "PREFIX", "TURN", "", "a").request_args(cache)
+    assert contents == "TURN"
+    assert cache.contents[config["cached_content"]] == "PREFIX"
@@ -0,0 +1,111 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from scaledown.compressor.base import BaseCompressor
+from scaledown.exceptions import PipelineError
+from scaledown.graph import GraphPipeline, GraphStep
+from scaledown.optimizer.boilerplate import BoilerplateOptimizer
+from scaledown.types import CompressedPrompt
+
+
+class HalfCompressor(BaseCompressor):
+    """Keeps the first half of the words."""
+
+    def __init__(self):
+        super().__init__(rate="auto", api_key="test")
+
+    def compress(self, context, prompt=None, max_tokens=None, **kwargs):
+        words = context.split()
+        kept = words[:len(words) // 2]
+        return CompressedPrompt(content=" ".join(kept), original_prompt="", tokens=(len(words), len(kept)),
+                                latency=0.0, model="test")
+
+
+def _slow(seconds, tag):
+    def step(text, **kwargs):
+        time.sleep(seconds)
+        return f"{tag}:{text}"
+    step.__name__ = tag
+    return step
+
+
+def test_independent_branches_run_concurrently():
+    pipe = GraphPipeline([
+        GraphStep("a", _slow(0.2, "a"), inputs=["resume"]),
+        GraphStep("b", _slow(0.2, "b"), inputs=["jd"]),
+        GraphStep("merge", lambda a, b, **kw: f"{b} | {a}", inputs=["a", "b"]),
+    ])
+    start = time.perf_counter()
+    result = pipe.run({"resume": "r", "jd": "j"})
+    assert time.perf_counter() - start < 0.35
+    assert result.final_content == "b:j | a:r"
+    assert [m.step_name for m in result.history][-1] == "merge"
+
+
+def test_critical_path_follows_the_slowest_input():
+    pipe = GraphPipeline([
+        GraphStep("fast", _slow(0.0, "fast"), inputs=["resume"]),
+        GraphStep("slow", _slow(0.1, "slow"), inputs=["jd"]),
+        GraphStep("merge", lambda a, b, **kw: a + b, inputs=["fast", "slow"]),
+    ])
+    assert pipe.run({"resume": "r", "jd": "j"}).critical_path == ["slow", "merge"]
+
+
+def test_optimizer_and_compressor_steps():
+    text = "Senior Data Engineer\n\nBuild and maintain scalable pipelines for our analytics platform."
+    pipe = GraphPipeline([
+        GraphStep("clean", BoilerplateOptimizer(), inputs=["jd"]),
+        GraphStep("compress", HalfCompressor(), inputs=["clean"]),
+    ])
+    result = pipe.run({"jd": text}, prompt="Keep skills")
+    assert result.final_content == "Senior Data Engineer Build and maintain"
+    assert [m.step_name for m in result.history] == ["clean", "compress"]
+    assert result.history[1].input_tokens == 12 and result.history[1].output_tokens == 6
+
+
+def test_step_params_override_run_kwargs():
+    pipe = GraphPipeline([GraphStep("tag", lambda text, label: f"{label}:{text}", params={"label": "step"})])
+    assert pipe.run("x", label="run").final_content == "step:x"
+
+
+def test_shared_thread_executor():
+    pipe = GraphPipeline([GraphStep("upper", lambda text: text.upper())])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert pipe.run("abc", executor=executor).final_content == "ABC"
+
+
+def test_process_executor_is_rejected():
+    pipe = GraphPipeline([GraphStep("upper", lambda text: text.upper())])
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError, match="thread"):
+            pipe.run("abc", executor=executor)
+
+
+def test_failing_step_names_the_step():
+    def boom(text):
+        raise RuntimeError("nope")
+
+    pipe = GraphPipeline([GraphStep("boom", boom), GraphStep("after", lambda t: t, inputs=["boom"])])
+    with pytest.raises(PipelineError) as info:
+        pipe.run("abc")
+    assert info.value.step == "boom"
+
+
+def test_missing_input_is_reported():
+    pipe = GraphPipeline([GraphStep("merge", lambda a, b: a + b, inputs=["resume", "jd"])])
+    with pytest.raises(ValueError, match="jd"):
+        pipe.run({"resume": "r"})
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([GraphStep("a", str, inputs=["b"]), GraphStep("b", str, inputs=["a"])], "one output step"),
+    ([GraphStep("a", str, inputs=["input", "b"]), GraphStep("b", str, inputs=["a"]),
+      GraphStep("out", str, inputs=["a"])], "cycle"),
+    ([GraphStep("a", str), GraphStep("a", str)], "unique"),
+    ([GraphStep("c", HalfCompressor()), GraphStep("o", BoilerplateOptimizer(), inputs=["c"])], "after a compressor"),
+])
+def test_invalid_graphs(steps, message):
+    with pytest.raises(ValueError, match=message):
+        GraphPipeline(steps)
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from scaledown.optimizer import haste
+from scaledown.pipeline import Pipeline
+from scaledown.types import OptimizedContext
+
+
+def _fake_select(path, query, **params):
+    """First function of the file whose name contains a query word."""
+    with open(path, encoding="utf-8") as f:
+        code = f.read()
+    words = query.lower().split()
+    for block in code.split("\n\n"):
+        if any(word in block.lower() for word in words):
+            return {"code": block, "nodes": [block]}
+    return {"code": "", "nodes": []}
+
+
+@pytest.fixture
+def optimizer(monkeypatch):
+    monkeypatch.setattr(haste, "HASTE_AVAILABLE", True)
+    monkeypatch.setattr(haste, "select_from_file", _fake_select, raising=False)
+    return haste.HasteOptimizer(hard_cap=100)
+
+
+FILES = [
+    "def train_loop(model):\n    return model\n\ndef unrelated():\n    pass",
+    "def evaluate(model):\n    return 0\n\ndef train_step(batch):\n    return batch",
+]
+
+
+def test_list_input_returns_one_merged_context(optimizer):
+    result = optimizer.optimize(FILES, query="train", max_workers=1)
+    assert isinstance(result, OptimizedContext)
+    assert result.content == ("# <context 0>\ndef train_loop(model):\n    return model\n\n"
+                              "# <context 1>\ndef train_step(batch):\n    return batch")
+    assert result.metrics.chunks_retrieved == 2
+    assert result.metrics.original_tokens == sum(len(f.split()) for f in FILES)
+
+
+def test_source_headers_count_against_max_tokens(optimizer):
+    # Each selection is 4 tokens and each "# <context i>" header another 3:
+    # both selections alone (8) fit in 9 tokens, but not with their headers
+    result = optimizer.optimize(FILES, query="train", max_tokens=9, max_workers=1)
+    assert result.metrics.optimized_tokens <= 9
+    assert result.content == "# <context 0>\ndef train_loop(model):\n    return model"
+
+    batch = optimizer.optimize_batch(FILES, "train", max_tokens=14, max_workers=1)["train"]
+    assert len(batch.included) == 2
+    assert haste.count_tokens(batch.content) <= 14
+
+
+def test_list_input_works_in_a_pipeline(optimizer):
+    result = Pipeline([("haste", optimizer)]).run(FILES, query="train", max_workers=1)
+    assert "train_loop" in result.final_content and "train_step" in result.final_content
+    assert result.history[0].output_tokens > 0
+
+
+def test_pool_per_worker_count():
+    assert haste._get_pool(2) is haste._get_pool(2)
+    assert haste._get_pool(3) is not haste._get_pool(2)
+    assert haste._get_pool(3)._max_workers == 3
+
+
+def test_evicted_code_temp_files_are_removed(monkeypatch):
+    monkeypatch.setattr(haste, "_FILE_CACHE", {})
+    monkeypatch.setattr(haste, "_FILE_CACHE_SIZE", 2)
+    paths = [haste._load_source(f"x = {i}\n", False, "gpt-4o")[0] for i in range(3)]
+    assert not os.path.exists(paths[0])
+    assert all(os.path.exists(p) for p in paths[1:])
+    haste._remove_temp_files()
+    assert not any(os.path.exists(p) for p in paths)
+
+
+def test_evicting_a_path_entry_keeps_the_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(haste, "_FILE_CACHE", {})
+    monkeypatch.setattr(haste, "_FILE_CACHE_SIZE", 1)
+    source = tmp_path / "module.py"
+    source.write_text("x = 1\n", encoding="utf-8")
+    haste._load_source(str(source), True, "gpt-4o")
+    code_path = haste._load_source("y = 2\n", False, "gpt-4o")[0]
+    assert source.exists()
+    haste._remove_temp_files()
+    assert not os.path.exists(code_path)
@@ -0,0 +1,46 @@
+from benchmarks.import_time import ImportRecord, measure, parse_importtime, subtree
+
+STDERR = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1790 |       1910 | site
+import time:       251 |        251 |       _json
+import time:       640 |        891 |     json.scanner
+import time:       693 |       1584 |   json.decoder
+import time:       686 |        686 |   json.encoder
+import time:       424 |       2694 | json
+some unrelated warning
+import time:        80 |         80 | re
+"""
+
+
+def test_parse_importtime():
+    records = parse_importtime(STDERR)
+    assert [r.module for r in records] == ["_io", "site", "_json", "json.scanner", "json.decoder",
+                                           "json.encoder", "json", "re"]
+    assert records[6] == ImportRecord("json", self_us=424, cumulative_us=2694, depth=0)
+    assert [r.depth for r in records] == [1, 0, 3, 2, 1, 1, 0, 0]
+    # The cumulative column includes everything nested below a module
+    assert records[4].cumulative_us == records[4].self_us + records[3].cumulative_us
+
+
+def test_subtree_collects_nested_imports():
+    records = parse_importtime(STDERR)
+    tree = subtree(records, "json")
+    assert [r.module for r in tree] == ["_json", "json.scanner", "json.decoder", "json.encoder", "json"]
+    assert tree[-1].cumulative_us == sum(r.self_us for r in tree)
+
+    assert [r.module for r in subtree(records, "json.decoder")] == ["_json", "json.scanner", "json.decoder"]
+    assert [r.module for r in subtree(records, "re")] == ["re"]
+    assert subtree(records, "numpy") == []
+
+
+def test_subtree_uses_the_last_occurrence():
+    records = [ImportRecord("a", 1, 1, 0), ImportRecord("b", 2, 2, 1), ImportRecord("a", 3, 5, 0)]
+    assert subtree(records, "a") == records[1:]
+
+
+def test_measure_runs_a_fresh_interpreter():
+    tree = subtree(measure("import json"), "json")
+    assert tree and tree[-1].module == "json"
+    assert any(r.module == "json.decoder" for r in tree)
@@ -0,0 +1,35 @@
+from assistant.jd_index import JDIndex, main, read_postings
+
+
+def _write(directory, name, text):
+    (directory / name).write_text(text, encoding="utf-8")
+
+
+def test_read_postings_skips_empty_files(tmp_path):
+    _write(tmp_path, "data.txt", "Senior Data Engineer\n\nPython, SQL and Apache Spark pipelines.")
+    _write(tmp_path, "empty.txt", "")
+    _write(tmp_path, "blank.txt", " \n\n")
+    _write(tmp_path, "notes.md", "not a posting")
+    assert read_postings(str(tmp_path)) == [
+        ("data", "Senior Data Engineer\n\nPython, SQL and Apache Spark pipelines.", "Senior Data Engineer")
+    ]
+
+
+def test_main_add_with_empty_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("SCALEDOWN_API_KEY", raising=False)
+    postings = tmp_path / "postings"
+    postings.mkdir()
+    _write(postings, "data.txt", "Senior Data Engineer\n\nBuild Python and Apache Spark pipelines on AWS.")
+    _write(postings, "design.txt", "Product Designer\n\nPrototype flows in Figma and run user research.")
+    _write(postings, "empty.txt", "")
+    db = str(tmp_path / "index.sqlite")
+
+    main(["--db", db, "add", str(postings)])
+    assert "2 postings added or updated; 2 in index" in capsys.readouterr().out
+
+    index = JDIndex(db)
+    try:
+        matches = index.query("Data engineer with Python, Spark and AWS experience", k=1)
+    finally:
+        index.close()
+    assert [(m.id, m.title) for m in matches] == [("data", "Senior Data Engineer")]
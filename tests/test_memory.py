@@ -0,0 +1,87 @@
+from assistant.memory import ConversationMemory, local_summary, scaledown_summarizer
+from scaledown.types.metrics import count_tokens
+
+
+def _conversation(turns, words=30):
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Question {i}. " + " ".join(["detail"] * words)})
+        messages.append({"role": "assistant", "content": f"Answer {i}. " + " ".join(["advice"] * words)})
+    return messages
+
+
+class CountingSummarizer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return text.split(".")[0] + "."
+
+
+def test_local_summary_keeps_leading_sentences():
+    text = "First point here. Second point follows. " + "filler " * 50
+    assert local_summary(text, max_words=6) == "First point here. Second point follows."
+    assert local_summary("word " * 50, max_words=5) == "word word word word word ..."
+
+
+def test_history_fits_the_budget():
+    memory = ConversationMemory(token_budget=150, recent_messages=4)
+    for turns in (1, 3, 10, 40):
+        rendered = memory.render(_conversation(turns))
+        assert count_tokens(rendered) <= 150
+
+
+def test_older_turns_are_summarised_recent_stay_verbatim():
+    messages = _conversation(5)
+    memory = ConversationMemory(token_budget=1000, recent_messages=4, summarizer=CountingSummarizer())
+    lines = memory.render(messages).splitlines()
+
+    assert lines[:6] == ["USER (summary): Question 0.", "ASSISTANT (summary): Answer 0.",
+                         "USER (summary): Question 1.", "ASSISTANT (summary): Answer 1.",
+                         "USER (summary): Question 2.", "ASSISTANT (summary): Answer 2."]
+    assert lines[6:] == [f"{m['role'].upper()}: {m['content']}" for m in messages[-4:]]
+
+
+def test_tight_budget_drops_oldest_summaries_then_summarises_recent():
+    messages = _conversation(5)
+    memory = ConversationMemory(token_budget=50, recent_messages=4, summarizer=CountingSummarizer())
+    lines = memory.render(messages).splitlines()
+    # Older summaries are gone; three of the recent four are summarised, the newest stays verbatim
+    assert lines[:3] == ["USER (summary): Question 3.", "ASSISTANT (summary): Answer 3.",
+                         "USER (summary): Question 4."]
+    assert lines[3].startswith("ASSISTANT: Answer 4. advice")
+    assert len(lines) == 4
+    assert count_tokens("\n".join(lines)) <= 50
+
+
+def test_summaries_are_cached_across_turns():
+    summarizer = CountingSummarizer()
+    memory = ConversationMemory(token_budget=1000, recent_messages=2, summarizer=summarizer)
+    messages = _conversation(4)
+    memory.render(messages)
+    assert summarizer.calls == 6
+
+    memory.render(messages)
+    assert summarizer.calls == 6
+    # One more turn: only the two messages that left the verbatim window are new
+    memory.render(_conversation(5))
+    assert summarizer.calls == 8
+
+
+def test_status_lines_and_empty_messages_are_ignored():
+    memory = ConversationMemory()
+    rendered = memory.render([
+        {"role": "user", "content": "Hi there"},
+        {"role": "assistant", "content": "Hello!\n\n> *ScaleDown: 40% saved · first token 300 ms*"},
+        {"role": "assistant", "content": "> *Answer cache hit*"},
+    ])
+    assert rendered == "USER: Hi there\nASSISTANT: Hello!"
+
+
+def test_scaledown_summarizer_falls_back_to_local_summary():
+    class Failing:
+        def compress(self, **kwargs):
+            raise RuntimeError("offline")
+
+    assert scaledown_summarizer(Failing())("One. Two.") == local_summary("One. Two.")
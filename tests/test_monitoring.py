@@ -0,0 +1,133 @@
+import json
+import threading
+import urllib.request
+
+import pytest
+
+from scaledown import monitoring
+from scaledown.monitoring import MetricsRegistry, record_tokens, start_http_server, track
+
+
+def _run_threads(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_totals_include_live_and_exited_threads():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", labelnames=["component"]).labels("a")
+    latency = registry.histogram("latency_ms", buckets=(10, 100)).labels()
+
+    def work():
+        for _ in range(10):
+            calls.inc()
+            latency.observe(5)
+
+    # Sequential threads exceed the compaction threshold, so exited cells get retired
+    for _ in range(monitoring._COMPACT_AFTER + 20):
+        _run_threads(1, work)
+    _run_threads(8, work)
+    calls.inc(2)
+
+    runs = monitoring._COMPACT_AFTER + 28
+    assert calls.value == runs * 10 + 2
+    assert len(calls._cells._live) < runs
+    snapshot = latency.snapshot()
+    assert snapshot["count"] == runs * 10
+    assert snapshot["sum"] == runs * 50
+    assert snapshot["buckets"] == {"10": runs * 10, "100": runs * 10, "+Inf": runs * 10}
+
+
+def test_reset_zeroes_every_series():
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total").labels()
+    histogram = registry.histogram("h_ms", buckets=(1,)).labels()
+    gauge = registry.gauge("g").labels()
+    _run_threads(3, lambda: counter.inc())
+    counter.inc()
+    histogram.observe(3)
+    gauge.set(7)
+
+    registry.reset()
+    assert counter.value == 0
+    assert histogram.snapshot() == {"buckets": {"1": 0, "+Inf": 0}, "sum": 0.0, "count": 0}
+    assert gauge.value == 0
+    counter.inc()
+    assert counter.value == 1
+
+
+def test_kind_conflict_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("x")
+    with pytest.raises(ValueError, match="counter"):
+        registry.gauge("x")
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("calls_total", 'Calls "per" component\nand model', ["component"]
+                     ).labels('say "hi"\\\n').inc(3)
+    latency = registry.histogram("latency_ms", "Latency", ["model"], buckets=(1, 2.5)).labels("m")
+    for value in (0.5, 2, 2, 9):
+        latency.observe(value)
+    registry.gauge("inflight", "In flight").labels().set(1.5)
+
+    assert registry.to_prometheus() == (
+        '# HELP calls_total Calls "per" component\\nand model\n'
+        "# TYPE calls_total counter\n"
+        'calls_total{component="say \\"hi\\"\\\\\\n"} 3\n'
+        "# HELP inflight In flight\n"
+        "# TYPE inflight gauge\n"
+        "inflight 1.5\n"
+        "# HELP latency_ms Latency\n"
+        "# TYPE latency_ms histogram\n"
+        'latency_ms_bucket{model="m",le="1"} 1\n'
+        'latency_ms_bucket{model="m",le="2.5"} 3\n'
+        'latency_ms_bucket{model="m",le="+Inf"} 4\n'
+        'latency_ms_sum{model="m"} 13.5\n'
+        'latency_ms_count{model="m"} 4\n'
+    )
+
+
+def test_json_shape():
+    registry = MetricsRegistry()
+    with track("compressor", "gpt-4o", registry=registry):
+        pass
+    with pytest.raises(RuntimeError):
+        with track("compressor", "gpt-4o", registry=registry):
+            raise RuntimeError("boom")
+    record_tokens("compressor", "gpt-4o", 100, 25, registry=registry)
+
+    snapshot = json.loads(json.dumps(registry.to_json()))
+    assert list(snapshot) == sorted(snapshot)
+    calls = snapshot["scaledown_calls_total"]
+    assert calls["type"] == "counter"
+    assert sorted((s["labels"]["status"], s["value"]) for s in calls["series"]) == [("error", 1), ("ok", 1)]
+    assert snapshot["scaledown_errors_total"]["series"] == [
+        {"labels": {"component": "compressor", "error": "RuntimeError"}, "value": 1.0}
+    ]
+    assert snapshot["scaledown_inflight_calls"]["series"][0]["value"] == 0
+    latency = snapshot["scaledown_call_latency_ms"]["series"][0]
+    assert set(latency) == {"labels", "buckets", "sum", "count"}
+    assert latency["count"] == 2 and latency["buckets"]["+Inf"] == 2
+    ratio = snapshot["scaledown_compression_ratio"]["series"][0]
+    assert ratio["sum"] == 4.0 and ratio["buckets"]["4"] == 1 and ratio["buckets"]["3"] == 0
+
+
+def test_http_server_serves_both_formats():
+    registry = MetricsRegistry()
+    registry.counter("hits_total").labels().inc()
+    server = start_http_server(0, addr="127.0.0.1", registry=registry)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "hits_total 1\n" in response.read().decode("utf-8")
+        with urllib.request.urlopen(f"{base}/metrics.json") as response:
+            assert json.load(response)["hits_total"]["series"][0]["value"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,61 @@
+from assistant.pdf_extract import extract, iter_pages
+
+SAMPLE = "samples/Ux-designer-resume-example.pdf"
+
+
+def _make_pdf(pages):
+    """Minimal PDF with one page per entry; ``None`` makes a page with no text layer."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET" if text is not None else ""
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def test_serial_and_parallel_extraction_match():
+    serial = extract(SAMPLE)
+    parallel = extract(SAMPLE, parallel_threshold=1, batch_pages=1, workers=2)
+    assert serial.page_count == parallel.page_count == 2
+    assert [p.index for p in parallel.pages] == [0, 1]
+    assert parallel.text == serial.text
+    assert serial.text.strip()
+
+
+def test_parallel_pages_stream_in_order():
+    pdf = _make_pdf([f"Page {i}" for i in range(7)])
+    pages = list(iter_pages(pdf, parallel_threshold=1, batch_pages=2, workers=2))
+    assert [p.text for p in pages] == [f"Page {i}" for i in range(7)]
+
+
+def test_max_tokens_stops_after_the_first_page():
+    report = extract(SAMPLE, max_tokens=5)
+    assert len(report.pages) == 1
+    assert report.truncated
+
+
+def test_max_pages():
+    report = extract(_make_pdf(["One", "Two", "Three"]), max_pages=2)
+    assert [p.text for p in report.pages] == ["One", "Two"]
+    assert report.page_count == 3 and report.truncated
+
+
+def test_pages_without_text_layer_are_skipped():
+    report = extract(_make_pdf(["Intro", None, "Outro"]))
+    assert report.skipped_pages == [1]
+    assert report.text == "Intro\nOutro"
+    assert not report.truncated
@@ -0,0 +1,47 @@
+import pytest
+
+from benchmarks.stub_server import StubScaleDownServer
+from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubScaleDownServer() as stub:
+        monkeypatch.setenv("SCALEDOWN_API_URL", stub.url)
+        yield stub
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_large_bodies_are_encoded(server, encoding):
+    context = "resume line with several words\n" * 2000
+    compressor = ScaleDownCompressor(api_key="test", content_encoding=encoding, encoding_threshold=1024)
+    result = compressor.compress(context, prompt="summarize")
+
+    request = server.requests[-1]
+    assert request.content_encoding == encoding
+    assert request.wire_bytes < request.decoded_bytes / 5
+    assert request.payload["context"] == context
+    assert result.tokens == (10000, 5000)
+
+
+def test_small_bodies_are_sent_plain(server):
+    compressor = ScaleDownCompressor(api_key="test", content_encoding="gzip", encoding_threshold=1024)
+    compressor.compress("short context", prompt="summarize")
+    request = server.requests[-1]
+    assert request.content_encoding is None
+    assert request.wire_bytes == request.decoded_bytes
+
+
+def test_unset_options_are_omitted(server):
+    compressor = ScaleDownCompressor(api_key="test")
+    compressor.compress("some context here", prompt="p")
+    options = server.requests[-1].payload["scaledown"]
+    assert "temperature" not in options
+    assert "max_tokens" not in options
+    assert None not in options.values()
+    assert options["rate"] == "auto"
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        ScaleDownCompressor(api_key="test", content_encoding="br")
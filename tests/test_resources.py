@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from assistant.resources import ResourceRegistry
+from benchmarks.stub_server import StubScaleDownServer
+from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
+
+
+class _Closable:
+    def __init__(self, key):
+        self.key = key
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_resources_are_shared_per_key():
+    registry = ResourceRegistry()
+    registry.register("client", _Closable)
+    assert registry.get("client", "a") is registry.get("client", "a")
+    assert registry.get("client", "a") is not registry.get("client", "b")
+    assert len(registry) == 2
+
+
+def test_slow_factory_does_not_block_other_resources():
+    registry = ResourceRegistry()
+    release = threading.Event()
+    builds = []
+
+    def slow(key):
+        builds.append(key)
+        release.wait(5)
+        return _Closable(key)
+
+    registry.register("slow", slow)
+    registry.register("fast", _Closable)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("slow", "k"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+
+    start = time.perf_counter()
+    registry.get("fast", "k")
+    assert time.perf_counter() - start < 0.5
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert builds == ["k"]
+    assert len({id(r) for r in results}) == 1
+
+
+def test_failed_build_is_retried():
+    registry = ResourceRegistry()
+    calls = []
+
+    def flaky(key):
+        calls.append(key)
+        if len(calls) == 1:
+            raise ConnectionError("down")
+        return _Closable(key)
+
+    registry.register("flaky", flaky)
+    with pytest.raises(ConnectionError):
+        registry.get("flaky", "k")
+    assert registry.get("flaky", "k").key == "k"
+
+
+def test_unhealthy_resource_is_closed_and_rebuilt():
+    registry = ResourceRegistry(health_interval=0.0)
+    healthy = {"value": True}
+    registry.register("client", _Closable, health_check=lambda r: healthy["value"])
+    first = registry.get("client", "k")
+    assert registry.get("client", "k") is first
+
+    healthy["value"] = False
+    second = registry.get("client", "k")
+    assert second is not first and first.closed
+
+    assert list(registry.health_check().values()) == [False]
+    assert second.closed and len(registry) == 0
+
+
+def test_shutdown_closes_everything():
+    registry = ResourceRegistry()
+    registry.register("client", _Closable)
+    resource = registry.get("client", "k")
+    registry.shutdown()
+    assert resource.closed
+    with pytest.raises(RuntimeError):
+        registry.get("client", "k")
+
+
+def test_scaledown_ping(monkeypatch):
+    with StubScaleDownServer() as server:
+        monkeypatch.setenv("SCALEDOWN_API_URL", server.url)
+        assert ScaleDownCompressor(api_key="test").ping(timeout=2)
+    monkeypatch.setenv("SCALEDOWN_API_URL", server.url)
+    assert not ScaleDownCompressor(api_key="test").ping(timeout=2)
+
+
+def test_missing_jd_index_is_not_cached(tmp_path, monkeypatch):
+    from assistant import resources
+    from assistant.jd_index import JDIndex
+
+    monkeypatch.setattr(resources, "_registry", None)
+    registry = resources.get_registry()
+    path = str(tmp_path / "jd_index.sqlite")
+    with pytest.raises(FileNotFoundError):
+        registry.get(resources.JD_INDEX, path)
+    assert len(registry) == 0
+
+    JDIndex(path).close()
+    assert isinstance(registry.get(resources.JD_INDEX, path), JDIndex)
+    registry.shutdown()
@@ -0,0 +1,59 @@
+from assistant.resume_sections import ResumeIndex
+
+RESUME = """Jane Doe
+jane@example.com
+
+Summary
+Product designer focused on research-driven interfaces for fintech products.
+
+Work Experience
+Senior Designer, Acme Bank
+2020 - Present
+Led the redesign of the mobile banking app used by two million customers.
+Designer, Beta Studio
+2017 - 2020
+Built the design system and component library for client projects.
+
+Skills
+Figma, Sketch, user research, prototyping, usability testing, HTML, CSS
+
+Education
+BA Interaction Design, University of Arts, 2017
+"""
+
+
+def _words(text):
+    return len(text.split())
+
+
+def test_sections_are_split_with_experience_entries():
+    index = ResumeIndex(RESUME, token_counter=_words)
+    kinds = [s.kind for s in index.sections]
+    assert kinds == ["header", "summary", "experience", "experience", "skills", "education"]
+
+
+def test_full_review_and_interview_get_whole_resume():
+    index = ResumeIndex(RESUME, token_counter=_words)
+    assert index.select("Please review my resume") == RESUME
+    assert index.select("Which skills do I have?", mode="Hiring Manager (Mock Interview)") == RESUME
+
+
+def test_specific_question_gets_relevant_sections():
+    index = ResumeIndex(RESUME, token_counter=_words)
+    selected = index.select("Which degree and university should I mention?")
+    assert "BA Interaction Design" in selected
+    assert "Jane Doe" in selected
+    assert "Acme Bank" not in selected
+
+
+def test_budget_is_enforced_from_the_first_section():
+    text = RESUME.split("\n\n", 1)[1]  # no header section
+    index = ResumeIndex(text, token_counter=_words)
+    assert index.sections[0].kind != "header"
+    selected = index.select("Which skills, tools and degree should I list?", max_tokens=20)
+    assert _words(selected) - selected.count("Skills") - selected.count("Education") <= 20
+
+
+def test_nothing_fits_returns_no_sections():
+    index = ResumeIndex(RESUME, token_counter=_words)
+    assert index.select("Which skills and tools?", max_tokens=3, include_header=False) == ""
@@ -0,0 +1,75 @@
+import time
+
+from scaledown.compressor.base import BaseCompressor
+from scaledown.pipeline import Pipeline, run_step
+from scaledown.routing import RoutingObjective, StepRouter
+from scaledown.types import CompressedPrompt
+
+
+class SlowCompressor(BaseCompressor):
+    """Sleeps like a network call, reports server-side numbers like the API."""
+
+    def __init__(self, sleep_ms=30.0, reported_tokens=(100000, 10)):
+        super().__init__(rate="auto", api_key="test")
+        self.sleep_ms = sleep_ms
+        self.reported_tokens = reported_tokens
+
+    def compress(self, context, prompt=None, max_tokens=None, **kwargs):
+        time.sleep(self.sleep_ms / 1000)
+        words = context.split()
+        return CompressedPrompt(content=" ".join(words[:len(words) // 2]), original_prompt="",
+                                tokens=self.reported_tokens, latency=1.0, model="test")
+
+
+def test_run_step_keeps_reported_latency_and_measures_wall_clock():
+    _, metadata = run_step("compress", SlowCompressor(sleep_ms=30), "a b c d")
+    assert metadata.latency_ms == 1.0
+    assert metadata.details["wall_ms"] >= 30
+
+
+def test_custom_step_latency():
+    _, metadata = run_step("upper", lambda text: (time.sleep(0.02), text.upper())[1], "abc")
+    assert metadata.latency_ms >= 20
+    assert metadata.details["wall_ms"] >= metadata.latency_ms
+
+
+def test_router_learns_in_the_bucket_it_decides_on():
+    router = StepRouter(buckets=(50, 500), min_samples=1)
+    pipe = Pipeline([("compress", SlowCompressor(sleep_ms=30))], router=router)
+    context = "word " * 40
+    pipe.run(context)
+
+    # Server-reported tokens (100000) would put the sample in the last bucket
+    snapshot = router.snapshot()["compress"]
+    assert list(snapshot) == [router.bucket(40)]
+    assert snapshot[router.bucket(40)].latency_ms >= 30
+    assert snapshot[router.bucket(40)].ratio == 2.0
+    assert router.estimate("compress", 40).samples == 1
+
+
+def test_router_skips_step_over_latency_budget():
+    router = StepRouter(min_samples=2, explore_every=0)
+    pipe = Pipeline([("compress", SlowCompressor(sleep_ms=30))], router=router,
+                    objective=RoutingObjective(max_latency_ms=10))
+    context = "word " * 40
+    for _ in range(2):
+        assert not pipe.run(context).history[0].details.get("skipped")
+    result = pipe.run(context)
+    assert result.history[0].details["skipped"] is True
+    assert result.history[0].details["reason"] == "latency_budget"
+    assert result.final_content == context
+
+
+def test_small_inputs_skip_every_step():
+    pipe = Pipeline([("compress", SlowCompressor())], objective=RoutingObjective(min_input_tokens=100))
+    result = pipe.run("short input")
+    assert result.history[0].details["reason"] == "input_below_min_tokens"
+
+
+def test_explore_runs_a_skipped_step_periodically():
+    router = StepRouter(min_samples=1, explore_every=3)
+    for _ in range(2):
+        router.observe("step", 100, 50, latency_ms=100.0)
+    objective = RoutingObjective(max_latency_ms=10)
+    runs = [router.decide("step", 100, 0.0, objective)[0] for _ in range(6)]
+    assert runs == [False, False, True, False, False, True]
@@ -0,0 +1,47 @@
+import pytest
+
+from assistant.skills import SkillMatcher, is_gap_question
+
+
+@pytest.mark.parametrize("question", [
+    "Which skills from the JD am I missing?",
+    "What are my skill gaps for this job?",
+    "Am I lacking any of the job requirements?",
+    "How well does my resume match the JD?",
+])
+def test_gap_questions_are_answered_locally(question):
+    assert is_gap_question(question)
+
+
+@pytest.mark.parametrize("question", [
+    "What skills should I highlight in my cover letter?",
+    "How do I address my lack of management experience in the interview?",
+    "Is anything missing from my LinkedIn summary?",
+    "What keywords should my headline use?",
+    "How do I close my skill gaps before applying?",
+])
+def test_other_questions_go_to_the_llm(question):
+    assert not is_gap_question(question)
+
+
+def test_common_words_are_not_skills():
+    prose = ("I like to sketch ideas on paper, spark conversations and react calmly under "
+             "pressure. Every sprint ended with a swift review of each network node, and "
+             "clear communication kept everyone aligned.")
+    assert SkillMatcher().extract(prose) == {}
+
+
+def test_names_written_as_names_still_match():
+    skills = SkillMatcher().extract("Built dashboards in React and Node, pipelines in Spark, "
+                                    "apps in Swift, mockups in Sketch.")
+    assert {"React", "Node.js", "Spark", "Swift", "Sketch"} <= set(skills)
+
+
+def test_compare_splits_matched_and_missing():
+    report = SkillMatcher().compare(
+        "Python developer with SQL and Docker experience.",
+        "Requirements:\n- Python\n- SQL\n- Apache Spark\n\nNice to have:\n- Kubernetes"
+    )
+    assert set(report.matched) == {"Python", "SQL"}
+    assert report.missing == {"Spark": 1.0, "Kubernetes": 0.5}
+    assert report.resume_only == ["Docker"]
@@ -0,0 +1,51 @@
+import time
+from dataclasses import dataclass
+
+from assistant.streaming import TurnStats, stream_text
+from benchmarks.load_test import StubGeminiClient
+
+
+@dataclass
+class _Chunk:
+    text: str
+
+
+def _slow_chunks(delays_and_texts):
+    for delay, text in delays_and_texts:
+        time.sleep(delay)
+        yield _Chunk(text)
+
+
+def test_ttft_is_time_to_first_text_chunk():
+    stats = TurnStats()
+    chunks = _slow_chunks([(0.05, ""), (0.05, "Hello"), (0.1, " world")])
+    assert "".join(stream_text(chunks, stats)) == "Hello world"
+    assert 90 <= stats.ttft_ms < stats.total_ms
+    assert stats.total_ms >= 190
+
+
+def test_total_is_recorded_when_stream_is_abandoned():
+    stats = TurnStats()
+    stream = stream_text(_slow_chunks([(0.0, "a"), (0.2, "b")]), stats)
+    assert next(stream) == "a"
+    stream.close()
+    assert stats.total_ms is not None and stats.total_ms < 150
+
+
+def test_stream_without_text_has_no_ttft():
+    stats = TurnStats()
+    assert list(stream_text([_Chunk(""), _Chunk(None)], stats)) == []
+    assert stats.ttft_ms is None and stats.total_ms is not None
+
+
+def test_fake_streaming_client_ttft_before_total():
+    client = StubGeminiClient(latency_ms=(200, 200), ttft_fraction=0.25, chunks=4, answer_words=40)
+    stats = TurnStats(status="ScaleDown: not needed")
+    chunks = client.models.generate_content_stream(model="m", contents="hi")
+    answer = "".join(stream_text(chunks, stats))
+    assert len(answer.split()) == 40
+    assert 40 <= stats.ttft_ms <= 120
+    assert stats.total_ms >= 190
+    line = stats.status_line()
+    assert line.startswith("ScaleDown: not needed · first token ")
+    assert line.endswith(" s")